@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class AppCoreConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'app_core'
+
+    def ready(self):
+        from app_core import checks, signals  # noqa: F401
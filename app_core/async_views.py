@@ -0,0 +1,203 @@
+from functools import update_wrapper
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.http import Http404, HttpResponse
+from django.template.response import SimpleTemplateResponse
+from rest_framework import exceptions
+from rest_framework.response import Response
+
+
+class AsyncViewMixin:
+  """ Handlers async para las acciones en ``async_actions``
+
+  Con ``ASYNC_VIEWS`` activo, ``as_view()`` retorna una vista async: las
+  acciones de ``async_actions`` se atienden en el event loop con su handler
+  ``a<accion>`` (``alist``, ``aretrieve``, ``aget``...) y el resto pasan a
+  la vista sincrona de DRF en un hilo, como haria Django. Autenticacion,
+  permisos y throttles usan sus variantes ``a*`` si las tienen.
+
+  Sin el setting (WSGI) la vista es la de DRF sin cambios: bajo WSGI una
+  vista async necesita un event loop por peticion.
+  """
+
+  async_actions = ()
+
+  @classmethod
+  def as_view(cls, *args, **initkwargs):
+    view = super().as_view(*args, **initkwargs)
+    if not getattr(settings, "ASYNC_VIEWS", False):
+      return view
+
+    # ViewSet: metodo -> accion; APIView: la accion es el metodo
+    actions = dict(getattr(view, "actions", None) or {
+      method: method for method in cls.http_method_names if hasattr(cls, method)
+    })
+    if "get" in actions and "head" not in actions:
+      actions["head"] = actions["get"]
+    if not set(actions.values()) & set(cls.async_actions):
+      return view
+
+    sync_view = sync_to_async(view)
+
+    async def async_view(request, *args, **kwargs):
+      action = actions.get(request.method.lower())
+      if action not in cls.async_actions:
+        return _rendered(await sync_view(request, *args, **kwargs))
+
+      self = cls(**initkwargs)
+      if hasattr(view, "actions"):
+        self.action_map = actions
+      self.request = request
+      response = await self.adispatch(f"a{action}", request, *args, **kwargs)
+      return _rendered(response)
+
+    # csrf_exempt, cls, initkwargs y actions de la vista de DRF
+    update_wrapper(async_view, view)
+    return async_view
+
+  async def adispatch(self, handler, request, *args, **kwargs):
+    """ ``dispatch`` de DRF con ``handler`` async """
+
+    self.args = args
+    self.kwargs = kwargs
+    request = self.initialize_request(request, *args, **kwargs)
+    self.request = request
+    self.headers = self.default_response_headers
+
+    try:
+      await self.ainitial(request, *args, **kwargs)
+      response = await getattr(self, handler)(request, *args, **kwargs)
+    except Exception as exc:
+      response = self.handle_exception(exc)
+
+    self.response = self.finalize_response(request, response, *args, **kwargs)
+    return self.response
+
+  async def ainitial(self, request, *args, **kwargs):
+    """ ``initial`` de DRF con autenticacion y throttles async """
+
+    self.format_kwarg = self.get_format_suffix(**kwargs)
+
+    neg = self.perform_content_negotiation(request)
+    request.accepted_renderer, request.accepted_media_type = neg
+
+    version, scheme = self.determine_version(request, *args, **kwargs)
+    request.version, request.versioning_scheme = version, scheme
+
+    await self.aperform_authentication(request)
+    self.check_permissions(request)
+    await self.acheck_throttles(request)
+
+  async def aperform_authentication(self, request):
+    """ ``Request._authenticate`` con ``aauthenticate`` si existe """
+
+    for authenticator in request.authenticators:
+      authenticate = getattr(authenticator, "aauthenticate", None)
+      if authenticate is None:
+        authenticate = sync_to_async(authenticator.authenticate)
+
+      try:
+        user_auth_tuple = await authenticate(request)
+      except exceptions.APIException:
+        request._not_authenticated()
+        raise
+
+      if user_auth_tuple is not None:
+        request._authenticator = authenticator
+        request.user, request.auth = user_auth_tuple
+        return
+
+    request._not_authenticated()
+
+  async def acheck_throttles(self, request):
+    """ ``check_throttles`` con ``aallow_request`` si existe """
+
+    durations = []
+    for throttle in self.get_throttles():
+      allow = getattr(throttle, "aallow_request", None)
+      if allow is None:
+        allow = sync_to_async(throttle.allow_request)
+
+      if not await allow(request, self):
+        durations.append(throttle.wait())
+
+    if durations:
+      durations = [duration for duration in durations if duration is not None]
+      self.throttled(request, max(durations, default=None))
+
+
+class AsyncListModelMixin:
+  """ ``list`` async: la pagina se lee con el ORM async """
+
+  async def alist(self, request, *args, **kwargs):
+    queryset = self.filter_queryset(self.get_queryset())
+
+    page = await self.apaginate_queryset(queryset)
+    if page is not None:
+      serializer = self.get_serializer(page, many=True)
+      return self.get_paginated_response(await adata(serializer, page))
+
+    rows = [row async for row in queryset]
+    serializer = self.get_serializer(rows, many=True)
+    return Response(await adata(serializer, rows))
+
+  async def apaginate_queryset(self, queryset):
+    if self.paginator is None:
+      return None
+
+    return await self.paginator.apaginate_queryset(queryset, self.request, view=self)
+
+
+class AsyncRetrieveModelMixin:
+  """ ``retrieve`` async: el objeto se lee con ``afirst()`` """
+
+  async def aretrieve(self, request, *args, **kwargs):
+    queryset = self.filter_queryset(self.get_queryset())
+    lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+
+    # Mismos casos que get_object_or_404 de DRF
+    try:
+      instance = await queryset.filter(
+        **{self.lookup_field: self.kwargs[lookup_url_kwarg]}
+      ).afirst()
+    except (TypeError, ValueError, ValidationError):
+      instance = None
+
+    if instance is None:
+      raise Http404
+    self.check_object_permissions(request, instance)
+
+    serializer = self.get_serializer(instance)
+    return Response(await adata(serializer, [instance]))
+
+
+async def adata(serializer, rows):
+  """ ``serializer.data`` leyendo antes con el ORM async lo que consulte
+
+  Los serializadores con ``aload_relations(rows)`` cargan ahi sus queries;
+  el resto se serializan sin acceso a la base de datos.
+  """
+
+  child = getattr(serializer, "child", serializer)
+  if hasattr(child, "aload_relations"):
+    await child.aload_relations(rows)
+
+  return serializer.data
+
+
+def _rendered(response):
+  """ Renderizar aqui: Django renderizaria un ``Response`` en otro hilo """
+
+  if not isinstance(response, SimpleTemplateResponse):
+    return response
+
+  response.render()
+  rendered = HttpResponse(
+    response.content,
+    status=response.status_code,
+    headers=dict(response.items())
+  )
+  rendered.cookies = response.cookies
+  return rendered
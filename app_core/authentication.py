@@ -0,0 +1,96 @@
+import hashlib
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.translation import gettext_lazy as _
+
+from rest_framework import exceptions
+from rest_framework.authentication import TokenAuthentication
+
+
+TOKEN_KEY = "app_core:token:{digest}"
+
+
+def get_token_cache():
+  """ Cache para la resolucion token -> usuario """
+
+  return caches[getattr(settings, "TOKEN_AUTH_CACHE_ALIAS", "default")]
+
+
+def token_cache_key(key):
+  """ Clave de cache sin guardar el token en claro """
+
+  digest = hashlib.sha256(key.encode("utf-8")).hexdigest()
+  return TOKEN_KEY.format(digest=digest)
+
+
+def invalidate_token(key):
+  """ Olvidar la resolucion en cache de un token """
+
+  get_token_cache().delete(token_cache_key(key))
+
+
+class _HeaderKey(TokenAuthentication):
+  """ Solo extraer la clave de la cabecera, con los errores de DRF """
+
+  def authenticate_credentials(self, key):
+    return key
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+  """ TokenAuthentication que cachea el token con su usuario
+
+  Una peticion con el cache caliente no hace queries de autenticacion. Las
+  entradas expiran a los ``TOKEN_AUTH_CACHE_TIMEOUT`` segundos y se
+  invalidan por señales al borrar el token o guardar el usuario (cambio de
+  clave, desactivacion). El tamaño lo limita el backend del alias
+  ``TOKEN_AUTH_CACHE_ALIAS`` (p. ej. MAX_ENTRIES de locmem).
+  """
+
+  def authenticate_credentials(self, key):
+    cache = get_token_cache()
+    cache_key = token_cache_key(key)
+    token = cache.get(cache_key)
+
+    if token is None:
+      user, token = super().authenticate_credentials(key)
+      cache.set(
+        cache_key,
+        token,
+        getattr(settings, "TOKEN_AUTH_CACHE_TIMEOUT", 300)
+      )
+
+    return (token.user, token)
+
+  async def aauthenticate(self, request):
+    """ ``authenticate`` para vistas async: cache y ORM async """
+
+    header = _HeaderKey()
+    header.keyword = self.keyword
+    key = header.authenticate(request)
+    if key is None:
+      return None
+
+    return await self.aauthenticate_credentials(key)
+
+  async def aauthenticate_credentials(self, key):
+    cache = get_token_cache()
+    cache_key = token_cache_key(key)
+    token = await cache.aget(cache_key)
+
+    if token is None:
+      model = self.get_model()
+      try:
+        token = await model.objects.select_related("user").aget(key=key)
+      except model.DoesNotExist:
+        raise exceptions.AuthenticationFailed(_("Invalid token."))
+      if not token.user.is_active:
+        raise exceptions.AuthenticationFailed(_("User inactive or deleted."))
+
+      await cache.aset(
+        cache_key,
+        token,
+        getattr(settings, "TOKEN_AUTH_CACHE_TIMEOUT", 300)
+      )
+
+    return (token.user, token)
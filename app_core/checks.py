@@ -0,0 +1,59 @@
+from django.conf import settings
+from django.contrib.auth.hashers import get_hashers
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.checks import Error, Tags, Warning, register
+
+
+# (setting del alias, alias por defecto, efecto con un cache por proceso)
+SHARED_CACHES = (
+  (
+    "TOKEN_AUTH_CACHE_ALIAS",
+    "default",
+    "a revoked token keeps authenticating in the other processes"
+  ),
+  (
+    "THROTTLE_CACHE_ALIAS",
+    "default",
+    "each process counts requests on its own, multiplying the rates"
+  ),
+)
+
+
+@register()
+def check_password_hasher(app_configs, **kwargs):
+  """ El hasher preferido debe tener su libreria instalada """
+
+  hasher = get_hashers()[0]
+  if getattr(hasher, "library", None) is None:
+    return []
+
+  try:
+    hasher._load_library()
+  except ValueError as exc:
+    return [Error(
+      f"The preferred password hasher cannot be loaded: {exc}",
+      hint="Install the hasher library or change PASSWORD_HASHER.",
+      id="app_core.E001",
+    )]
+
+  return []
+
+
+@register(Tags.caches, deploy=True)
+def check_shared_caches(app_configs, **kwargs):
+  """ Tokens y throttles necesitan un cache compartido entre procesos """
+
+  warnings = []
+  for setting, default, effect in SHARED_CACHES:
+    alias = getattr(settings, setting, default)
+    if isinstance(caches[alias], LocMemCache):
+      warnings.append(Warning(
+        f"{setting} ('{alias}') uses LocMemCache: with several worker "
+        f"processes {effect}.",
+        hint="Point the alias at a shared backend (Redis, Memcached) "
+        "or run a single process.",
+        id="app_core.W001",
+      ))
+
+  return warnings
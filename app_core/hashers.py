@@ -0,0 +1,18 @@
+from django.conf import settings
+from django.contrib.auth import hashers
+
+
+class PBKDF2PasswordHasher(hashers.PBKDF2PasswordHasher):
+  """ PBKDF2-SHA256 con iteraciones de ``PASSWORD_PBKDF2_ITERATIONS``
+
+  Mismo algoritmo que el de Django, asi que verifica sus claves. Sin el
+  setting usa las iteraciones de Django; las claves con otro numero se
+  actualizan en el siguiente login.
+  """
+
+  @property
+  def iterations(self):
+    return (
+      getattr(settings, "PASSWORD_PBKDF2_ITERATIONS", None)
+      or hashers.PBKDF2PasswordHasher.iterations
+    )
@@ -0,0 +1,34 @@
+# Generated by Django 4.1.4 on 2026-10-18 08:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app_core', '0006_recipe_image'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='ingredient',
+            index=models.Index(fields=['user', '-name', 'id'], name='ingredient_user_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='recipe',
+            index=models.Index(fields=['user', 'id'], name='recipe_user_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='tag',
+            index=models.Index(fields=['user', '-name', 'id'], name='tag_user_name_idx'),
+        ),
+        # Indices inversos en las tablas intermedias M2M (auto-creadas, sin Meta)
+        migrations.RunSQL(
+            'CREATE INDEX "recipe_tags_tag_recipe_idx" ON "app_core_recipe_tags" ("tag_id", "recipe_id");',
+            reverse_sql='DROP INDEX "recipe_tags_tag_recipe_idx";',
+        ),
+        migrations.RunSQL(
+            'CREATE INDEX "recipe_ingr_ingr_recipe_idx" ON "app_core_recipe_ingredients" ("ingredient_id", "recipe_id");',
+            reverse_sql='DROP INDEX "recipe_ingr_ingr_recipe_idx";',
+        ),
+    ]
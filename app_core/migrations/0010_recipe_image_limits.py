@@ -0,0 +1,25 @@
+# Generated by Django 4.1.4 on 2026-10-18 09:08
+
+import app_core.models
+import app_core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app_core', '0009_recipe_image_renditions'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='recipe',
+            name='image_bytes',
+            field=models.PositiveBigIntegerField(default=0),
+        ),
+        migrations.AlterField(
+            model_name='recipe',
+            name='image',
+            field=models.ImageField(null=True, upload_to=app_core.models.recipe_image_file_patch, validators=[app_core.validators.validate_recipe_image]),
+        ),
+    ]
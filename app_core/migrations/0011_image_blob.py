@@ -0,0 +1,47 @@
+# Generated by Django 4.1.4 on 2026-10-18 09:15
+
+import app_core.models
+import app_core.storage
+import app_core.validators
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def register_existing_images(apps, schema_editor):
+    """ Crear los blobs de las imagenes ya subidas con su conteo de recetas """
+
+    Recipe = apps.get_model('app_core', 'Recipe')
+    ImageBlob = apps.get_model('app_core', 'ImageBlob')
+
+    counts = (
+        Recipe.objects.exclude(image__isnull=True).exclude(image='')
+        .values('image').annotate(refcount=Count('id'))
+    )
+    ImageBlob.objects.bulk_create(
+        [ImageBlob(name=row['image'], refcount=row['refcount']) for row in counts],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app_core', '0010_recipe_image_limits'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImageBlob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=255, unique=True)),
+                ('refcount', models.PositiveIntegerField(default=0)),
+            ],
+        ),
+        migrations.AlterField(
+            model_name='recipe',
+            name='image',
+            field=models.ImageField(null=True, storage=app_core.storage.ContentAddressedStorage(), upload_to=app_core.models.recipe_image_file_patch, validators=[app_core.validators.validate_recipe_image]),
+        ),
+        migrations.RunPython(register_existing_images, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,81 @@
+from django.db import migrations
+
+
+SQLITE_CREATE = """
+CREATE VIRTUAL TABLE app_core_recipe_search USING fts5(
+    title, name, tags, ingredients,
+    tokenize = 'unicode61 remove_diacritics 2',
+    prefix = '2 3'
+)
+"""
+
+SQLITE_FILL = """
+INSERT INTO app_core_recipe_search (rowid, title, name, tags, ingredients)
+SELECT r.id, r.title, r.name,
+    COALESCE((SELECT group_concat(t.name, ' ')
+              FROM app_core_recipe_tags rt JOIN app_core_tag t ON t.id = rt.tag_id
+              WHERE rt.recipe_id = r.id), ''),
+    COALESCE((SELECT group_concat(i.name, ' ')
+              FROM app_core_recipe_ingredients ri JOIN app_core_ingredient i ON i.id = ri.ingredient_id
+              WHERE ri.recipe_id = r.id), '')
+FROM app_core_recipe r
+"""
+
+POSTGRES_CREATE = """
+CREATE TABLE app_core_recipe_search (
+    recipe_id bigint PRIMARY KEY REFERENCES app_core_recipe (id) ON DELETE CASCADE,
+    document tsvector NOT NULL
+);
+CREATE INDEX app_core_recipe_search_document_idx
+    ON app_core_recipe_search USING GIN (document)
+"""
+
+POSTGRES_FILL = """
+INSERT INTO app_core_recipe_search (recipe_id, document)
+SELECT r.id,
+    setweight(to_tsvector('simple', r.title), 'A') ||
+    setweight(to_tsvector('simple', r.name), 'B') ||
+    setweight(to_tsvector('simple', COALESCE((
+        SELECT string_agg(t.name, ' ')
+        FROM app_core_recipe_tags rt JOIN app_core_tag t ON t.id = rt.tag_id
+        WHERE rt.recipe_id = r.id), '')), 'C') ||
+    setweight(to_tsvector('simple', COALESCE((
+        SELECT string_agg(i.name, ' ')
+        FROM app_core_recipe_ingredients ri JOIN app_core_ingredient i ON i.id = ri.ingredient_id
+        WHERE ri.recipe_id = r.id), '')), 'C')
+FROM app_core_recipe r
+"""
+
+DROP = "DROP TABLE IF EXISTS app_core_recipe_search"
+
+
+def create_search_index(apps, schema_editor):
+    """ Indice de busqueda segun el motor: FTS5 en SQLite, tsvector/GIN en Postgres """
+
+    vendor = schema_editor.connection.vendor
+    if vendor == "sqlite":
+        statements = (SQLITE_CREATE, SQLITE_FILL)
+    elif vendor == "postgresql":
+        statements = (POSTGRES_CREATE, POSTGRES_FILL)
+    else:
+        # Sin indice: la busqueda cae a icontains sobre el titulo
+        return
+
+    for statement in statements:
+        schema_editor.execute(statement)
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor in ("sqlite", "postgresql"):
+        schema_editor.execute(DROP)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app_core', '0011_image_blob'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,77 @@
+# Generated by Django 4.1.4 on 2026-10-18 09:55
+
+from django.db import migrations, models
+from django.db.models import Count, Min
+from django.db.models.functions import Lower
+from django.utils import timezone
+import django.db.models.functions.text
+
+
+RELATIONS = (
+    ('Tag', 'tags', 'tag_id'),
+    ('Ingredient', 'ingredients', 'ingredient_id'),
+)
+
+
+def merge_duplicates(apps, schema_editor):
+    """ Unir tags/ingredientes del mismo usuario con el mismo nombre
+
+    Se conserva el de menor id y los enlaces de los duplicados pasan a el (sin
+    repetir recetas que ya lo tenian). Las recetas afectadas se marcan como
+    modificadas para invalidar ETags y caches.
+    """
+
+    Recipe = apps.get_model('app_core', 'Recipe')
+    now = timezone.now()
+
+    for model_name, relation, column in RELATIONS:
+        model = apps.get_model('app_core', model_name)
+        through = Recipe._meta.get_field(relation).remote_field.through
+        named = model.objects.annotate(lower_name=Lower('name'))
+
+        groups = (
+            named.values('user_id', 'lower_name')
+            .annotate(keep=Min('id'), total=Count('id'))
+            .filter(total__gt=1)
+            .order_by()
+        )
+        for group in groups:
+            duplicates = list(
+                named.filter(user_id=group['user_id'], lower_name=group['lower_name'])
+                .exclude(id=group['keep'])
+                .values_list('id', flat=True)
+            )
+            links = through.objects.filter(**{f'{column}__in': duplicates})
+            recipe_ids = set(links.values_list('recipe_id', flat=True))
+            linked = set(
+                through.objects.filter(**{column: group['keep']})
+                .values_list('recipe_id', flat=True)
+            )
+
+            through.objects.bulk_create(
+                [through(recipe_id=pk, **{column: group['keep']}) for pk in recipe_ids - linked],
+                batch_size=1000,
+            )
+            links.delete()
+            model.objects.filter(id__in=duplicates).delete()
+            model.objects.filter(id=group['keep']).update(updated_at=now)
+            Recipe.objects.filter(id__in=recipe_ids).update(updated_at=now)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app_core', '0013_recipe_range_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(merge_duplicates, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='ingredient',
+            constraint=models.UniqueConstraint(models.F('user'), django.db.models.functions.text.Lower('name'), name='ingredient_user_lower_name_uniq'),
+        ),
+        migrations.AddConstraint(
+            model_name='tag',
+            constraint=models.UniqueConstraint(models.F('user'), django.db.models.functions.text.Lower('name'), name='tag_user_lower_name_uniq'),
+        ),
+    ]
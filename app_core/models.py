@@ -1,10 +1,16 @@
-from django.db import models
+from django.db import IntegrityError, connections, models, transaction
+from django.db.models.functions import Lower
+from django.db.models.signals import post_save
 from django.contrib.auth.models import AbstractBaseUser, BaseUserManager, PermissionsMixin
 
 import uuid
 import os
 
 from django.conf import settings
+from django.utils import timezone
+
+from app_core.storage import ContentAddressedStorage
+from app_core.validators import validate_recipe_image
 
 
 def recipe_image_file_patch(instance, filename):
@@ -54,6 +60,66 @@ class User(AbstractBaseUser, PermissionsMixin):
   USERNAME_FIELD = "email"
   
 
+class UserNameQuerySet(models.QuerySet):
+  """ Objetos con un nombre unico por usuario, sin distinguir mayusculas """
+
+  def upsert(self, user, name):
+    """ Crear el objeto o retornar el que ya tiene ese nombre: (objeto, creado)
+
+    En SQLite y Postgres es un solo ``INSERT ... ON CONFLICT ... RETURNING``
+    sobre la restriccion (user, LOWER(name)); la fila es nueva si conserva
+    el ``updated_at`` enviado. Solo se emite ``post_save`` al crear.
+
+    El LOWER de SQLite solo convierte ASCII: ahi "Émile" y "émile" son
+    nombres distintos (Postgres los une segun el locale de la base).
+    """
+
+    connection = connections[self.db]
+    if connection.vendor not in ("sqlite", "postgresql"):
+      return self._get_or_create(user, name)
+
+    opts = self.model._meta
+    qn = connection.ops.quote_name
+    table = qn(opts.db_table)
+    user_id, name_column, updated_column = (
+      qn(opts.get_field(field).column) for field in ("user", "name", "updated_at")
+    )
+    updated_at = timezone.now()
+
+    [instance] = self.raw(
+      f"INSERT INTO {table} ({user_id}, {name_column}, {updated_column}) "
+      f"VALUES (%s, %s, %s) "
+      f"ON CONFLICT ({user_id}, (LOWER({name_column}))) "
+      f"DO UPDATE SET {name_column} = {table}.{name_column} "
+      f"RETURNING {qn(opts.pk.column)}, {user_id}, {name_column}, {updated_column}",
+      [
+        user.pk,
+        name,
+        opts.get_field("updated_at").get_db_prep_value(updated_at, connection),
+      ]
+    )
+
+    created = instance.updated_at == updated_at
+    if created:
+      post_save.send(
+        sender=self.model,
+        instance=instance,
+        created=True,
+        update_fields=None,
+        raw=False,
+        using=self.db
+      )
+
+    return instance, created
+
+  def _get_or_create(self, user, name):
+    try:
+      with transaction.atomic(using=self.db):
+        return self.create(user=user, name=name), True
+    except IntegrityError:
+      return self.get(user=user, name__iexact=name), False
+
+
 class Tag(models.Model):
   """ Modelo del Tag para la receta """
 
@@ -62,6 +128,22 @@ class Tag(models.Model):
     settings.AUTH_USER_MODEL,
     on_delete=models.CASCADE
   )
+  updated_at = models.DateTimeField(auto_now=True)
+
+  objects = UserNameQuerySet.as_manager()
+
+  class Meta:
+    indexes = [
+      # Listado por usuario ordenado por (-name, id)
+      models.Index(fields=["user", "-name", "id"], name="tag_user_name_idx"),
+    ]
+    constraints = [
+      models.UniqueConstraint(
+        "user",
+        Lower("name"),
+        name="tag_user_lower_name_uniq"
+      ),
+    ]
 
   def __str__(self):
     return self.name
@@ -75,6 +157,25 @@ class Ingredient(models.Model):
     settings.AUTH_USER_MODEL,
     on_delete=models.CASCADE
   )
+  updated_at = models.DateTimeField(auto_now=True)
+
+  objects = UserNameQuerySet.as_manager()
+
+  class Meta:
+    indexes = [
+      # Listado por usuario ordenado por (-name, id)
+      models.Index(
+        fields=["user", "-name", "id"],
+        name="ingredient_user_name_idx"
+      ),
+    ]
+    constraints = [
+      models.UniqueConstraint(
+        "user",
+        Lower("name"),
+        name="ingredient_user_lower_name_uniq"
+      ),
+    ]
 
   def __str__(self):
     return self.name
@@ -88,12 +189,39 @@ class Recipe(models.Model):
     on_delete=models.CASCADE
   )
   title = models.CharField(max_length=255)
-  image = models.ImageField(null=True, upload_to=recipe_image_file_patch)
+  image = models.ImageField(
+    null=True,
+    upload_to=recipe_image_file_patch,
+    storage=ContentAddressedStorage(),
+    validators=[validate_recipe_image]
+  )
+  image_bytes = models.PositiveBigIntegerField(default=0)
+  image_renditions = models.JSONField(default=dict, blank=True)
   time_minutes = models.IntegerField()
   price = models.DecimalField(max_digits=5, decimal_places=2)
   link = models.CharField(max_length=255, blank=True)
   ingredients = models.ManyToManyField("Ingredient")
   tags = models.ManyToManyField("Tag")
+  updated_at = models.DateTimeField(auto_now=True)
+
+  class Meta:
+    indexes = [
+      # Listado por usuario ordenado por id
+      models.Index(fields=["user", "id"], name="recipe_user_id_idx"),
+      # Filtros de rango y ordering por tiempo y precio
+      models.Index(fields=["user", "time_minutes", "id"], name="recipe_user_time_idx"),
+      models.Index(fields=["user", "price", "id"], name="recipe_user_price_idx"),
+    ]
 
   def __str__(self):
-    return self.title
\ No newline at end of file
+    return self.title
+
+
+class ImageBlob(models.Model):
+  """ Archivo de imagen unico por contenido y cuantas recetas lo usan """
+
+  name = models.CharField(max_length=255, unique=True)
+  refcount = models.PositiveIntegerField(default=0)
+
+  def __str__(self):
+    return self.name
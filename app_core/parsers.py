@@ -0,0 +1,28 @@
+from django.conf import settings
+from rest_framework import parsers
+from rest_framework.exceptions import ParseError
+
+from app_core.renderers import FastJSONRenderer, orjson
+
+
+class FastJSONParser(parsers.JSONParser):
+  """ JSONParser de DRF sobre orjson
+
+  orjson solo lee UTF-8 y siempre rechaza NaN/Infinity; con otra
+  codificacion, ``STRICT_JSON`` desactivado o sin orjson se usa el de DRF.
+  """
+
+  renderer_class = FastJSONRenderer
+
+  def parse(self, stream, media_type=None, parser_context=None):
+    encoding = (parser_context or {}).get(
+      "encoding",
+      settings.DEFAULT_CHARSET
+    )
+    if orjson is None or not self.strict or encoding.lower() not in ("utf-8", "utf8"):
+      return super().parse(stream, media_type, parser_context)
+
+    try:
+      return orjson.loads(stream.read())
+    except orjson.JSONDecodeError as exc:
+      raise ParseError(f"JSON parse error - {exc}")
@@ -0,0 +1,41 @@
+from rest_framework import renderers
+
+try:
+  import orjson
+except ImportError:  # pragma: no cover - orjson es opcional
+  orjson = None
+
+
+class FastJSONRenderer(renderers.JSONRenderer):
+  """ JSONRenderer de DRF sobre orjson, con los mismos bytes de salida
+
+  orjson solo cubre el caso comun (compacto, UTF-8, sin indentar); si no
+  esta instalado, o la peticion pide ``indent`` o ASCII, se usa el render de
+  DRF. Los tipos que orjson no conoce (Decimal, textos lazy) y las fechas,
+  que formatea distinto, pasan por el ``default`` del encoder de DRF.
+  """
+
+  options = (
+    (orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS)
+    if orjson is not None else 0
+  )
+
+  def render(self, data, accepted_media_type=None, renderer_context=None):
+    if data is None:
+      return b""
+
+    indent = self.get_indent(accepted_media_type, renderer_context or {})
+    if orjson is None or indent is not None or self.ensure_ascii or not self.compact:
+      return super().render(data, accepted_media_type, renderer_context)
+
+    ret = orjson.dumps(
+      data,
+      default=self.encoder_class().default,
+      option=self.options
+    )
+
+    # Igual que DRF: JSON que tambien es un subconjunto estricto de JavaScript
+    if b"\xe2\x80\xa8" in ret or b"\xe2\x80\xa9" in ret:
+      ret = ret.replace(b"\xe2\x80\xa8", b"\\u2028").replace(b"\xe2\x80\xa9", b"\\u2029")
+
+    return ret
@@ -0,0 +1,116 @@
+from django.contrib.auth import get_user_model
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import Signal, receiver
+from django.utils import timezone
+
+from rest_framework.authtoken.models import Token
+
+from app_core.authentication import invalidate_token
+from app_core.models import Ingredient, Recipe, Tag
+
+
+RELATIONS = {Tag: "tags", Ingredient: "ingredients"}
+
+# Escrituras masivas de recetas (bulk_create/bulk_update y enlaces M2M en
+# bloque) que no emiten post_save ni m2m_changed.
+# Argumentos: user_id, recipe_ids, tag_ids, ingredient_ids
+recipes_bulk_changed = Signal()
+
+
+def touch(model, pks):
+  """ Actualizar ``updated_at`` de los objetos sin cargarlos """
+
+  model.objects.filter(pk__in=pks).update(updated_at=timezone.now())
+
+
+def _through(relation):
+  """ Tabla intermedia de ``Recipe.<relation>`` y columna del otro lado """
+
+  field = Recipe._meta.get_field(relation)
+  return field.remote_field.through, f"{field.m2m_reverse_field_name()}_id"
+
+
+def related_ids(relation, recipe_id):
+  """ IDs de tags/ingredientes enlazados a una receta """
+
+  through, column = _through(relation)
+  return through.objects.filter(recipe_id=recipe_id).values_list(column, flat=True)
+
+
+def recipe_ids(relation, related_id):
+  """ IDs de recetas enlazadas a un tag/ingrediente """
+
+  through, column = _through(relation)
+  return through.objects.filter(**{column: related_id}).values_list(
+    "recipe_id", flat=True
+  )
+
+
+@receiver(m2m_changed, sender=Recipe.tags.through)
+@receiver(m2m_changed, sender=Recipe.ingredients.through)
+def touch_on_m2m_change(sender, instance, action, reverse, model, pk_set, **kwargs):
+  """ Cambiar enlaces receta/tag modifica a ambos lados de la relacion """
+
+  if action == "pre_clear":
+    # En clear pk_set es None: tocar el otro lado antes de desenlazar
+    if reverse:
+      touch(model, recipe_ids(RELATIONS[instance.__class__], instance.pk))
+    else:
+      relation = "tags" if sender is Recipe.tags.through else "ingredients"
+      touch(model, related_ids(relation, instance.pk))
+  elif action in ("post_add", "post_remove"):
+    touch(model, pk_set)
+  else:
+    return
+
+  touch(instance.__class__, [instance.pk])
+
+
+@receiver(post_save, sender=Tag)
+@receiver(post_save, sender=Ingredient)
+def touch_recipes_on_rename(sender, instance, created, **kwargs):
+  """ Las recetas anidan el nombre del tag/ingrediente """
+
+  if not created:
+    touch(Recipe, recipe_ids(RELATIONS[sender], instance.pk))
+
+
+@receiver(pre_delete, sender=Tag)
+@receiver(pre_delete, sender=Ingredient)
+def touch_recipes_on_delete(sender, instance, **kwargs):
+  """ El borrado en cascada de enlaces no emite m2m_changed """
+
+  touch(Recipe, recipe_ids(RELATIONS[sender], instance.pk))
+
+
+@receiver(pre_delete, sender=Recipe)
+def touch_relations_on_recipe_delete(sender, instance, **kwargs):
+  """ Los tags/ingredientes pierden una receta (assigned_only, usage) """
+
+  touch(Tag, related_ids("tags", instance.pk))
+  touch(Ingredient, related_ids("ingredients", instance.pk))
+
+
+@receiver(recipes_bulk_changed, sender=Recipe)
+def touch_relations_on_bulk_change(sender, tag_ids, ingredient_ids, **kwargs):
+  """ Tags/ingredientes enlazados o desenlazados en bloque """
+
+  touch(Tag, tag_ids)
+  touch(Ingredient, ingredient_ids)
+
+
+@receiver(post_save, sender=Token)
+@receiver(post_delete, sender=Token)
+def invalidate_cached_token(sender, instance, **kwargs):
+  """ Un token borrado o regenerado deja de autenticar de inmediato """
+
+  invalidate_token(instance.key)
+
+
+@receiver(post_save, sender=get_user_model())
+def invalidate_user_tokens(sender, instance, created, **kwargs):
+  """ Cambio de clave, desactivacion o perfil: recargar el usuario """
+
+  if not created:
+    for key in Token.objects.filter(user=instance).values_list("key", flat=True):
+      invalidate_token(key)
@@ -0,0 +1,61 @@
+import hashlib
+import os
+
+from django.core.files import File
+from django.core.files.storage import FileSystemStorage
+from django.utils.deconstruct import deconstructible
+
+
+def content_hash(content):
+  """ sha256 del contenido, leido por bloques """
+
+  digest = hashlib.sha256()
+  for chunk in content.chunks():
+    digest.update(chunk)
+
+  if content.seekable():
+    content.seek(0)
+
+  return digest.hexdigest()
+
+
+@deconstructible
+class ContentAddressedStorage(FileSystemStorage):
+  """ Almacenamiento que nombra los archivos por el hash de su contenido
+
+  Del nombre generado por ``upload_to`` solo se conservan el directorio y la
+  extension: ``uploads/recipe/<sha256>.<ext>``. Un contenido ya guardado no
+  se vuelve a escribir, asi que cada imagen distinta ocupa disco una sola
+  vez y su URL no cambia nunca (cache de CDN efectivo).
+  """
+
+  def hashed_name(self, name, digest):
+    directory, filename = os.path.split(name)
+    _, ext = os.path.splitext(filename)
+
+    return os.path.join(directory, f"{digest}{ext.lower()}")
+
+  def save(self, name, content, max_length=None):
+    if name is None:
+      name = content.name
+    if not hasattr(content, "chunks"):
+      content = File(content, name)
+
+    name = self.hashed_name(name, content_hash(content))
+    return self.save_as(name, content)
+
+  def save_as(self, name, content):
+    """ Guardar con el nombre exacto ``name`` si aun no existe
+
+    Para archivos derivados de un contenido ya identificado por su hash.
+    """
+
+    if self.exists(name):
+      return name
+
+    stored = self._save(name, content)
+    if stored != name:
+      # Otra peticion escribio el mismo contenido a la vez: sobra esta copia
+      self.delete(stored)
+
+    return name
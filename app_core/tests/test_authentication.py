@@ -0,0 +1,83 @@
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from django.test import TestCase
+
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from app_core.authentication import get_token_cache, token_cache_key
+
+
+ME_URL = reverse("user_app:me")
+
+
+class CachedTokenAuthenticationTests(TestCase):
+  """ Probar la autenticacion por token con cache """
+
+  def setUp(self):
+    get_token_cache().clear()
+    self.user = get_user_model().objects.create_user(
+      "test@gmail.com",
+      "testpass"
+    )
+    self.token = Token.objects.create(user=self.user)
+    self.client = APIClient()
+    self.client.credentials(HTTP_AUTHORIZATION=f"Token {self.token.key}")
+
+  def test_warm_request_has_no_auth_queries(self):
+    """ Prueba que el token en cache no consulta la base de datos """
+
+    self.client.get(ME_URL)
+
+    with self.assertNumQueries(0):
+      res = self.client.get(ME_URL)
+
+    self.assertEqual(res.status_code, status.HTTP_200_OK)
+    self.assertEqual(res.data["email"], self.user.email)
+
+  def test_deleted_token_rejected(self):
+    """ Prueba que un token borrado deja de autenticar """
+
+    self.client.get(ME_URL)
+    self.token.delete()
+
+    res = self.client.get(ME_URL)
+
+    self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+  def test_deactivated_user_rejected(self):
+    """ Prueba que un usuario desactivado deja de autenticar """
+
+    self.client.get(ME_URL)
+    self.user.is_active = False
+    self.user.save()
+
+    res = self.client.get(ME_URL)
+
+    self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+  def test_password_change_reloads_user(self):
+    """ Prueba que cambiar la clave invalida el usuario en cache """
+
+    self.client.get(ME_URL)
+    self.user.set_password("newpass123")
+    self.user.save()
+
+    cache_key = token_cache_key(self.token.key)
+    self.assertIsNone(get_token_cache().get(cache_key))
+
+    res = self.client.get(ME_URL)
+    cached = get_token_cache().get(cache_key)
+
+    self.assertEqual(res.status_code, status.HTTP_200_OK)
+    self.assertTrue(cached.user.check_password("newpass123"))
+
+  def test_invalid_token_rejected(self):
+    """ Prueba que un token invalido no se cachea como valido """
+
+    self.client.credentials(HTTP_AUTHORIZATION="Token invalid")
+
+    res = self.client.get(ME_URL)
+
+    self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
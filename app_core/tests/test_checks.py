@@ -0,0 +1,34 @@
+from django.test import SimpleTestCase, override_settings
+
+from app_core.checks import check_shared_caches
+
+
+LOCMEM = {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+SHARED = {"BACKEND": "django.core.cache.backends.db.DatabaseCache", "LOCATION": "cache"}
+
+
+class SharedCacheCheckTests(SimpleTestCase):
+  """ Probar el check de caches compartidos entre procesos """
+
+  @override_settings(
+    CACHES={"default": LOCMEM, "shared": SHARED},
+    TOKEN_AUTH_CACHE_ALIAS="default",
+    THROTTLE_CACHE_ALIAS="shared"
+  )
+  def test_locmem_alias_warns(self):
+    """ Prueba que un alias LocMemCache genera un aviso """
+
+    warnings = check_shared_caches(None)
+
+    self.assertEqual([warning.id for warning in warnings], ["app_core.W001"])
+    self.assertIn("TOKEN_AUTH_CACHE_ALIAS", warnings[0].msg)
+
+  @override_settings(
+    CACHES={"default": SHARED},
+    TOKEN_AUTH_CACHE_ALIAS="default",
+    THROTTLE_CACHE_ALIAS="default"
+  )
+  def test_shared_aliases_pass(self):
+    """ Prueba que un backend compartido no genera avisos """
+
+    self.assertEqual(check_shared_caches(None), [])
@@ -106,3 +106,47 @@ class ModelTest(TestCase):
 
     exp_patch = f"uploads/recipe/{uuid}.jpg"
     self.assertEqual(file_patch, exp_patch)
+
+
+  def test_updated_at_touched_on_m2m_change(self):
+    """ Probar que enlazar un tag actualiza receta y tag """
+
+    user = sample_user()
+    recipe = models.Recipe.objects.create(
+      user=user,
+      title="Steak and mushoroom sauce",
+      time_minutes=5,
+      price=5.00
+    )
+    tag = models.Tag.objects.create(user=user, name="Meat")
+    recipe_before = recipe.updated_at
+    tag_before = tag.updated_at
+
+    recipe.tags.add(tag)
+    recipe.refresh_from_db()
+    tag.refresh_from_db()
+
+    self.assertGreater(recipe.updated_at, recipe_before)
+    self.assertGreater(tag.updated_at, tag_before)
+
+
+  def test_updated_at_touched_on_tag_rename(self):
+    """ Probar que renombrar un tag actualiza sus recetas """
+
+    user = sample_user()
+    recipe = models.Recipe.objects.create(
+      user=user,
+      title="Steak and mushoroom sauce",
+      time_minutes=5,
+      price=5.00
+    )
+    tag = models.Tag.objects.create(user=user, name="Meat")
+    recipe.tags.add(tag)
+    recipe.refresh_from_db()
+    before = recipe.updated_at
+
+    tag.name = "Beef"
+    tag.save()
+    recipe.refresh_from_db()
+
+    self.assertGreater(recipe.updated_at, before)
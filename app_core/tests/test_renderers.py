@@ -0,0 +1,72 @@
+import datetime
+import io
+import uuid
+from collections import OrderedDict
+from decimal import Decimal
+from unittest import mock
+
+from django.test import SimpleTestCase
+from django.utils.translation import gettext_lazy
+
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from app_core import parsers, renderers
+
+
+PAYLOAD = {
+  "results": [
+    OrderedDict([
+      ("id", 1),
+      ("title", "Cr\u00e8me br\u00fbl\u00e9e \u2028\u2029 \u2615"),
+      ("price", Decimal("5.50")),
+      ("tags", [1, 2]),
+    ]),
+  ],
+  "created": datetime.datetime(2022, 1, 2, 3, 4, 5, 678901, tzinfo=datetime.timezone.utc),
+  "day": datetime.date(2022, 1, 2),
+  "uuid": uuid.UUID(int=1),
+  "detail": gettext_lazy("Not found."),
+  7: None,
+}
+
+
+class FastJSONRendererTests(SimpleTestCase):
+  """ Probar el renderer y parser JSON sobre orjson """
+
+  def test_render_matches_drf(self):
+    """ Prueba los mismos bytes que el JSONRenderer de DRF """
+
+    self.assertEqual(
+      renderers.FastJSONRenderer().render(PAYLOAD),
+      JSONRenderer().render(PAYLOAD)
+    )
+
+  def test_render_indent_and_fallback(self):
+    """ Prueba ``indent`` y el render sin orjson """
+
+    media_type = "application/json; indent=4"
+    self.assertEqual(
+      renderers.FastJSONRenderer().render(PAYLOAD, media_type),
+      JSONRenderer().render(PAYLOAD, media_type)
+    )
+
+    with mock.patch.object(renderers, "orjson", None):
+      self.assertEqual(
+        renderers.FastJSONRenderer().render(PAYLOAD),
+        JSONRenderer().render(PAYLOAD)
+      )
+
+  def test_parse(self):
+    """ Prueba leer JSON y rechazar JSON invalido o NaN """
+
+    body = '{"title": "Crème", "price": 5.5, "tags": [1]}'.encode("utf-8")
+    self.assertEqual(
+      parsers.FastJSONParser().parse(io.BytesIO(body)),
+      JSONParser().parse(io.BytesIO(body))
+    )
+
+    for body in (b'{"title": ', b'{"price": NaN}'):
+      with self.assertRaises(ParseError):
+        parsers.FastJSONParser().parse(io.BytesIO(body))
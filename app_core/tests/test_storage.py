@@ -0,0 +1,45 @@
+import hashlib
+import tempfile
+
+from django.core.files.base import ContentFile
+from django.test import TestCase, override_settings
+
+from app_core.storage import ContentAddressedStorage
+
+
+class ContentAddressedStorageTests(TestCase):
+  """ Probar el almacenamiento por hash de contenido """
+
+  def setUp(self):
+    self.media_root = tempfile.TemporaryDirectory()
+    self.addCleanup(self.media_root.cleanup)
+    override = override_settings(MEDIA_ROOT=self.media_root.name)
+    override.enable()
+    self.addCleanup(override.disable)
+    self.storage = ContentAddressedStorage()
+
+  def test_name_is_content_hash(self):
+    """ Prueba que el nombre es el sha256 con el directorio y la extension """
+
+    name = self.storage.save("uploads/recipe/photo.JPG", ContentFile(b"data"))
+
+    digest = hashlib.sha256(b"data").hexdigest()
+    self.assertEqual(name, f"uploads/recipe/{digest}.jpg")
+    self.assertTrue(self.storage.exists(name))
+
+  def test_same_content_stored_once(self):
+    """ Prueba que el mismo contenido devuelve el mismo archivo """
+
+    first = self.storage.save("uploads/recipe/a.png", ContentFile(b"same"))
+    second = self.storage.save("uploads/recipe/b.png", ContentFile(b"same"))
+
+    self.assertEqual(first, second)
+    _, files = self.storage.listdir("uploads/recipe")
+    self.assertEqual(len(files), 1)
+
+  def test_save_as_keeps_exact_name(self):
+    """ Prueba que save_as no renombra archivos derivados """
+
+    name = self.storage.save_as("uploads/recipe/x_thumbnail.jpg", ContentFile(b"t"))
+
+    self.assertEqual(name, "uploads/recipe/x_thumbnail.jpg")
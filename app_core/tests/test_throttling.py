@@ -0,0 +1,138 @@
+from unittest import mock
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.request import Request
+from rest_framework.test import APIClient, APIRequestFactory
+
+from app_core.throttling import IPThrottle, get_throttle_cache
+
+
+RECIPES_URL = reverse("recipe_app:recipe-list")
+
+
+def throttle_rates(**rates):
+  """ REST_FRAMEWORK del proyecto con otras tasas de throttle """
+
+  return override_settings(REST_FRAMEWORK={
+    **settings.REST_FRAMEWORK,
+    "DEFAULT_THROTTLE_RATES": {
+      **settings.REST_FRAMEWORK["DEFAULT_THROTTLE_RATES"],
+      **rates,
+    },
+  })
+
+
+class MinuteThrottle(IPThrottle):
+  rate = "4/min"
+
+
+class SlidingWindowThrottleTests(TestCase):
+  """ Probar los contadores de ventana deslizante """
+
+  def setUp(self):
+    get_throttle_cache().clear()
+    self.request = Request(APIRequestFactory().get("/", REMOTE_ADDR="10.0.0.1"))
+
+  def _allow(self, now):
+    throttle = MinuteThrottle()
+    with mock.patch.object(MinuteThrottle, "timer", mock.Mock(return_value=now)):
+      return throttle.allow_request(self.request, None), throttle
+
+  def test_limit_within_window(self):
+    """ Prueba que se rechaza al pasar el limite y se indica la espera """
+
+    allowed = [self._allow(600 + i)[0] for i in range(5)]
+    _, throttle = self._allow(610)
+
+    self.assertEqual(allowed, [True, True, True, True, False])
+    # La siguiente ventana aun pondera las 4 de esta: 50s + 0s
+    self.assertEqual(throttle.wait(), 50)
+
+  def test_previous_window_weighs_in(self):
+    """ Prueba que la ventana anterior cuenta segun lo que aun solapa """
+
+    for i in range(4):
+      self._allow(600 + i)
+
+    # A los 10s de la siguiente ventana se estiman 4 * 50/60 peticiones
+    allowed, _ = self._allow(670)
+    blocked, throttle = self._allow(670)
+
+    self.assertTrue(allowed)
+    self.assertFalse(blocked)
+    # Con 1 en la actual, la anterior debe pesar menos de 3: a los 15s
+    self.assertAlmostEqual(throttle.wait(), 5)
+
+  async def test_async_path_matches_sync(self):
+    """ Prueba que ``aallow_request`` cuenta igual que ``allow_request`` """
+
+    allowed = []
+    for i in range(5):
+      throttle = MinuteThrottle()
+      with mock.patch.object(MinuteThrottle, "timer", mock.Mock(return_value=600 + i)):
+        allowed.append(await throttle.aallow_request(self.request, None))
+
+    self.assertEqual(allowed, [True, True, True, True, False])
+    # Rechazada a los 4s de la ventana: 56s hasta la siguiente
+    self.assertEqual(throttle.wait(), 56)
+
+  def test_counter_expired_before_incr(self):
+    """ Prueba que si la clave expira entre add() e incr() se reinicia """
+
+    self._allow(600)
+    cache = get_throttle_cache()
+    with mock.patch.object(cache, "incr", side_effect=ValueError):
+      _, throttle = self._allow(601)
+
+    self.assertEqual(cache.get(throttle._window_key(throttle.window)), 1)
+
+  def test_identities_are_separate(self):
+    """ Prueba que cada IP tiene su propio contador """
+
+    for i in range(4):
+      self._allow(600 + i)
+
+    self.request = Request(APIRequestFactory().get("/", REMOTE_ADDR="10.0.0.2"))
+    allowed, _ = self._allow(605)
+
+    self.assertTrue(allowed)
+
+
+class RecipeThrottleTests(TestCase):
+  """ Probar el throttle de las vistas de recetas """
+
+  def setUp(self):
+    get_throttle_cache().clear()
+    self.client = APIClient()
+    self.user = get_user_model().objects.create_user(
+      "test@gmail.com",
+      "testpass"
+    )
+    self.client.force_authenticate(self.user)
+
+  def test_disabled_by_default(self):
+    """ Prueba que sin tasa configurada no se limita """
+
+    for _ in range(5):
+      res = self.client.get(RECIPES_URL)
+
+    self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+  @throttle_rates(recipes="2/min")
+  def test_enabled_per_user(self):
+    """ Prueba que con tasa se limita por usuario con Retry-After """
+
+    codes = [self.client.get(RECIPES_URL).status_code for _ in range(3)]
+
+    other = get_user_model().objects.create_user("other@gmail.com", "testpass")
+    self.client.force_authenticate(other)
+    res = self.client.get(RECIPES_URL)
+
+    self.assertEqual(codes[-1], status.HTTP_429_TOO_MANY_REQUESTS)
+    self.assertEqual(codes[:2], [status.HTTP_200_OK] * 2)
+    self.assertEqual(res.status_code, status.HTTP_200_OK)
@@ -0,0 +1,221 @@
+import hashlib
+
+from django.conf import settings
+from django.core.cache import caches
+
+from rest_framework.settings import api_settings
+from rest_framework.throttling import SimpleRateThrottle
+
+
+THROTTLE_KEY = "app_core:throttle:{scope}:{ident}:{window}"
+
+
+def get_throttle_cache():
+  """ Cache para los contadores de los throttles """
+
+  return caches[getattr(settings, "THROTTLE_CACHE_ALIAS", "default")]
+
+
+class SlidingWindowThrottle(SimpleRateThrottle):
+  """ Throttle de ventana deslizante con contadores en el cache
+
+  Guarda un contador por ventana fija y estima la ventana deslizante
+  ponderando el de la anterior por la parte que aun la solapa. Son dos
+  enteros por identidad (en lugar de la lista de tiempos de DRF) y se
+  actualizan con ``add``/``incr``. La tasa se lee de
+  ``DEFAULT_THROTTLE_RATES[scope]``; ``None`` desactiva el throttle.
+  """
+
+  def get_rate(self):
+    # api_settings y no el atributo de clase: sigue a override_settings
+    self.THROTTLE_RATES = api_settings.DEFAULT_THROTTLE_RATES
+    return super().get_rate()
+
+  def get_ident_key(self, request, view):
+    """ Identidad a limitar (sin cifrar), o ``None`` para no limitar
+
+    Las subclases la definen; la base no limita nada.
+    """
+
+    return None
+
+  def get_cache_key(self, request, view):
+    ident = self.get_ident_key(request, view)
+    if ident is None:
+      return None
+
+    return hashlib.sha256(ident.encode("utf-8")).hexdigest()
+
+  def allow_request(self, request, view):
+    if not self._start(request, view):
+      return True
+
+    if self._exceeded(self.cache.get_many(self._keys())):
+      return self.throttle_failure()
+    return self.throttle_success()
+
+  async def aallow_request(self, request, view):
+    """ ``allow_request`` con la API async del cache """
+
+    if not self._start(request, view):
+      return True
+
+    if self._exceeded(await self.cache.aget_many(self._keys())):
+      return self.throttle_failure()
+
+    steps = self._record()
+    call = self._advance(steps)
+    while call is not None:
+      method, args = call
+      try:
+        result = await getattr(self.cache, f"a{method}")(*args)
+      except ValueError as exc:
+        call = self._advance(steps, error=exc)
+      else:
+        call = self._advance(steps, result)
+
+    return True
+
+  def estimate(self):
+    """ Peticiones en los ultimos ``duration`` segundos (aproximado) """
+
+    return self.previous * (1 - self._elapsed() / self.duration) + self.current
+
+  def throttle_success(self):
+    steps = self._record()
+    call = self._advance(steps)
+    while call is not None:
+      method, args = call
+      try:
+        result = getattr(self.cache, method)(*args)
+      except ValueError as exc:
+        call = self._advance(steps, error=exc)
+      else:
+        call = self._advance(steps, result)
+
+    return True
+
+  def wait(self):
+    """ Segundos hasta que la estimacion baje del limite (Retry-After) """
+
+    elapsed = self._elapsed()
+    if self.current < self.num_requests and self.previous:
+      # El peso de la ventana anterior baja dentro de la actual
+      until = self.duration * (1 - (self.num_requests - self.current) / self.previous)
+      return max(until - elapsed, 0) or None
+
+    # Hay que esperar a la siguiente, donde la actual pasa a ser la anterior
+    until = self.duration * (1 - self.num_requests / max(self.current, 1))
+    return self.duration - elapsed + max(until, 0)
+
+  def _start(self, request, view):
+    """ Preparar la peticion; False si este throttle no la limita """
+
+    if self.rate is None:
+      return False
+
+    self.key = self.get_cache_key(request, view)
+    if self.key is None:
+      return False
+
+    self.cache = get_throttle_cache()
+    self.now = self.timer()
+    self.window = int(self.now // self.duration)
+    return True
+
+  def _keys(self):
+    return [self._window_key(self.window - 1), self._window_key(self.window)]
+
+  def _exceeded(self, counts):
+    previous, current = self._keys()
+    self.previous = counts.get(previous, 0)
+    self.current = counts.get(current, 0)
+
+    return self.estimate() >= self.num_requests
+
+  def _record(self):
+    """ Contar la peticion en la ventana actual
+
+    Genera las llamadas al cache como ``(metodo, args)`` y recibe sus
+    resultados: ``throttle_success`` las hace con la API sincrona y
+    ``aallow_request`` con la async, con los mismos pasos.
+    """
+
+    key = self._window_key(self.window)
+    # Dos ventanas de vida: la actual y la siguiente la ponderan
+    timeout = self.duration * 2
+
+    if not (yield "add", (key, 1, timeout)):
+      try:
+        yield "incr", (key, )
+      except ValueError:
+        # La clave expiro entre add() e incr()
+        yield "set", (key, 1, timeout)
+
+  @staticmethod
+  def _advance(steps, result=None, error=None):
+    """ Siguiente llamada de ``steps``, o None si termino """
+
+    try:
+      if error is not None:
+        return steps.throw(error)
+      return steps.send(result)
+    except StopIteration:
+      return None
+
+  def _elapsed(self):
+    return self.now - self.window * self.duration
+
+  def _window_key(self, window):
+    return THROTTLE_KEY.format(scope=self.scope, ident=self.key, window=window)
+
+
+class IPThrottle(SlidingWindowThrottle):
+  """ Limitar por IP de origen (``NUM_PROXIES`` para X-Forwarded-For) """
+
+  def get_ident_key(self, request, view):
+    return self.get_ident(request) or None
+
+
+class EmailThrottle(SlidingWindowThrottle):
+  """ Limitar por el email del cuerpo de la peticion
+
+  Se comprueba antes de validar el serializador, asi que un ataque contra
+  una cuenta se corta sin llegar a ``authenticate()`` ni al hasher.
+  """
+
+  email_field = "email"
+
+  def get_ident_key(self, request, view):
+    data = request.data
+    email = data.get(self.email_field) if hasattr(data, "get") else None
+    if not isinstance(email, str) or not email.strip():
+      return None
+
+    return email.strip().lower()
+
+
+class UserThrottle(SlidingWindowThrottle):
+  """ Limitar por usuario autenticado, o por IP si es anonimo """
+
+  def get_ident_key(self, request, view):
+    if request.user and request.user.is_authenticated:
+      return f"user:{request.user.pk}"
+
+    return f"ip:{self.get_ident(request)}"
+
+
+class LoginIPThrottle(IPThrottle):
+  scope = "login_ip"
+
+
+class LoginEmailThrottle(EmailThrottle):
+  scope = "login_email"
+
+
+class UserCreateThrottle(IPThrottle):
+  scope = "user_create"
+
+
+class RecipeThrottle(UserThrottle):
+  scope = "recipes"
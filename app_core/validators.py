@@ -0,0 +1,43 @@
+from django.conf import settings
+from django.core.exceptions import ValidationError
+
+from PIL import Image
+
+
+ALLOWED_IMAGE_FORMATS = ("JPEG", "PNG", "WEBP", "GIF")
+
+
+def image_header_error(image_format, size):
+  """ Mensaje de error para un formato/dimensiones no aceptados, o None """
+
+  if image_format not in ALLOWED_IMAGE_FORMATS:
+    return f"Unsupported image format. Allowed: {', '.join(ALLOWED_IMAGE_FORMATS)}."
+
+  width, height = size
+  max_side = getattr(settings, "RECIPE_IMAGE_MAX_DIMENSION", 10000)
+  max_pixels = getattr(settings, "RECIPE_IMAGE_MAX_PIXELS", 40_000_000)
+
+  if width > max_side or height > max_side or width * height > max_pixels:
+    return f"Image dimensions {width}x{height} exceed the allowed limits."
+
+  return None
+
+
+def validate_recipe_image(value):
+  """ Validar formato y dimensiones leyendo solo la cabecera de la imagen """
+
+  file = getattr(value, "file", value)
+  position = file.tell() if hasattr(file, "tell") else 0
+
+  try:
+    # Image.open es perezoso: lee la cabecera sin decodificar los pixeles
+    with Image.open(file) as image:
+      error = image_header_error(image.format, image.size)
+  except (Image.DecompressionBombError, OSError, ValueError):
+    error = "Upload a valid image."
+  finally:
+    if hasattr(file, "seek"):
+      file.seek(position)
+
+  if error:
+    raise ValidationError(error, code="invalid_image")
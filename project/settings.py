@@ -10,8 +10,11 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/4.1/ref/settings/
 """
 
+import os
 from pathlib import Path
 
+from django.core.exceptions import ImproperlyConfigured
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -23,9 +26,13 @@ BASE_DIR = Path(__file__).resolve().parent.parent
 SECRET_KEY = 'django-insecure-9sy-*i81kp%@nqdw)6z+-_3hn7c9x3!^scgjfnu8_um6&u@fm@'
 
 # SECURITY WARNING: don't run with debug turned on in production!
-DEBUG = True
+# Desactivado salvo DEBUG=1 (desarrollo); tambien decide la API navegable
+DEBUG = os.environ.get('DEBUG', '0') == '1'
 
-ALLOWED_HOSTS = []
+# Separados por comas; con DEBUG=1 y vacio Django acepta localhost
+ALLOWED_HOSTS = [
+    host for host in os.environ.get('ALLOWED_HOSTS', '').split(',') if host
+]
 
 
 # Application definition
@@ -88,6 +95,60 @@ DATABASES = {
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/4.1/topics/cache/
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'token_auth': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'token_auth',
+        'OPTIONS': {'MAX_ENTRIES': 10000},
+    },
+}
+
+# Respuestas de listado/detalle de recipe_app (invalidadas por señales)
+RECIPE_APP_CACHE_ALIAS = 'default'
+RECIPE_APP_CACHE_TIMEOUT = 300
+
+# Resolucion token -> usuario de CachedTokenAuthentication. LocMemCache es por
+# proceso: con varios workers usar un cache compartido o un token revocado
+# sigue valido en los demas hasta el timeout (check --deploy: app_core.W001)
+TOKEN_AUTH_CACHE_ALIAS = 'token_auth'
+TOKEN_AUTH_CACHE_TIMEOUT = 300
+
+
+# JSON con orjson (si esta instalado); la API navegable solo en desarrollo
+REST_FRAMEWORK = {
+    'DEFAULT_RENDERER_CLASSES': [
+        'app_core.renderers.FastJSONRenderer',
+    ] + (['rest_framework.renderers.BrowsableAPIRenderer'] if DEBUG else []),
+    'DEFAULT_PARSER_CLASSES': [
+        'app_core.parsers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
+    # Ventanas deslizantes de app_core.throttling; None desactiva el scope
+    'DEFAULT_THROTTLE_RATES': {
+        'login_ip': '30/min',
+        'login_email': '10/min',
+        'user_create': '30/hour',
+        'recipes': None,
+    },
+}
+
+# Contadores de los throttles. Deben compartirse entre procesos: con el
+# LocMemCache de desarrollo cada worker cuenta aparte (app_core.W001)
+THROTTLE_CACHE_ALIAS = 'default'
+
+# Lecturas de recetas, tags, ingredientes y usuario con vistas async
+# (app_core.async_views). Solo bajo ASGI: con WSGI cada vista async necesita
+# su propio event loop. Opcional porque en Django 4.1 el ORM y el cache async
+# siguen usando un hilo por llamada; comparar con ``benchmark_asgi``
+ASYNC_VIEWS = os.environ.get('ASYNC_VIEWS', '0') == '1'
+
 # Password validation
 # https://docs.djangoproject.com/en/4.1/ref/settings/#auth-password-validators
 
@@ -107,6 +168,27 @@ AUTH_PASSWORD_VALIDATORS = [
 ]
 
 
+# Hasher de claves por despliegue: pbkdf2, argon2 (argon2-cffi), bcrypt o scrypt
+# El preferido va primero; el resto solo verifica claves existentes, que se
+# vuelven a guardar con el preferido en el siguiente login
+PASSWORD_HASHER = os.environ.get('PASSWORD_HASHER', 'pbkdf2')
+_HASHERS = {
+    'pbkdf2': 'app_core.hashers.PBKDF2PasswordHasher',
+    'argon2': 'django.contrib.auth.hashers.Argon2PasswordHasher',
+    'bcrypt': 'django.contrib.auth.hashers.BCryptSHA256PasswordHasher',
+    'scrypt': 'django.contrib.auth.hashers.ScryptPasswordHasher',
+}
+if PASSWORD_HASHER not in _HASHERS:
+    raise ImproperlyConfigured(
+        f"PASSWORD_HASHER must be one of: {', '.join(_HASHERS)}"
+    )
+PASSWORD_HASHERS = [_HASHERS.pop(PASSWORD_HASHER), *_HASHERS.values(),
+                    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher']
+
+# Iteraciones de PBKDF2 (vacio = las de Django)
+PASSWORD_PBKDF2_ITERATIONS = int(os.environ.get('PASSWORD_PBKDF2_ITERATIONS', 0)) or None
+
+
 # Internationalization
 # https://docs.djangoproject.com/en/4.1/topics/i18n/
 
@@ -127,6 +209,19 @@ STATIC_URL = 'static/'
 MEDIA_URL = 'media/'
 
 MEDIA_ROOT = 'media_root/'
+
+# Transferencia de imagenes delegada al proxy: None, "x-accel-redirect" o "x-sendfile"
+MEDIA_SENDFILE_BACKEND = None
+MEDIA_ACCEL_REDIRECT_PREFIX = '/protected-media/'
+
+# Hilos que generan las versiones de las imagenes de recetas (0 = en linea)
+RECIPE_IMAGE_WORKERS = 2
+
+# Limites de las imagenes subidas (bytes, pixeles, lado mayor y cuota por usuario)
+RECIPE_IMAGE_MAX_BYTES = 15 * 1024 * 1024
+RECIPE_IMAGE_MAX_PIXELS = 40_000_000
+RECIPE_IMAGE_MAX_DIMENSION = 10000
+RECIPE_IMAGE_QUOTA_BYTES = 200 * 1024 * 1024
 STATIC_ROOT = 'static_root /'
 
 # Default primary key field type
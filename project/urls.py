@@ -15,11 +15,13 @@ Including another URLconf
 """
 from django.contrib import admin
 from django.urls import path, include
-from django.conf.urls.static import static
 from django.conf import settings
 
+from recipe_app.views import RecipeMediaView
+
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('api/user', include("user_app.urls")),
     path('api/recipe', include("recipe_app.urls")),
-] + static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
+    path(settings.MEDIA_URL.lstrip('/') + '<path:name>', RecipeMediaView.as_view(), name='media'),
+]
@@ -0,0 +1,145 @@
+from collections import Counter
+
+from django.utils import timezone
+
+from app_core.models import Ingredient, Recipe, Tag
+from app_core.signals import recipes_bulk_changed
+from recipe_app import images, search
+from recipe_app.filters import get_through
+
+
+RELATED_MODELS = {"tags": Tag, "ingredients": Ingredient}
+BATCH_SIZE = 1000
+
+
+def owned_ids(relation, user, ids):
+  """ IDs de ``ids`` que existen y pertenecen al usuario, en una query """
+
+  if not ids:
+    return set()
+
+  model = RELATED_MODELS[relation]
+  return set(
+    model.objects.filter(user=user, id__in=ids).values_list("id", flat=True)
+  )
+
+
+def add_links(relation, pairs):
+  """ Insertar filas (recipe_id, related_id) en la tabla intermedia """
+
+  through, column = get_through(relation)
+  through.objects.bulk_create(
+    (through(recipe_id=recipe_id, **{column: related_id})
+     for recipe_id, related_id in pairs),
+    batch_size=BATCH_SIZE
+  )
+
+
+def clear_links(relation, recipe_ids):
+  """ Borrar los enlaces de las recetas con un solo DELETE """
+
+  through, column = get_through(relation)
+  removed = set(
+    through.objects.filter(recipe_id__in=recipe_ids).values_list(column, flat=True)
+  )
+  through.objects.filter(recipe_id__in=recipe_ids).delete()
+
+  return removed
+
+
+def create_recipes(user, items):
+  """ Crear recetas y sus enlaces con bulk_create
+
+  ``items`` son diccionarios validados con listas de IDs en ``tags`` e
+  ``ingredients``. Retorna las recetas creadas.
+  """
+
+  relations = {
+    relation: [item.pop(relation, []) for item in items]
+    for relation in RELATED_MODELS
+  }
+  recipes = Recipe.objects.bulk_create(
+    (Recipe(user=user, **item) for item in items),
+    batch_size=BATCH_SIZE
+  )
+
+  changed = {}
+  for relation, id_lists in relations.items():
+    add_links(relation, (
+      (recipe.id, related_id)
+      for recipe, related_ids in zip(recipes, id_lists)
+      for related_id in related_ids
+    ))
+    changed[relation] = {pk for ids in id_lists for pk in ids}
+
+  send_changed(user, recipes, changed)
+  return recipes
+
+
+def update_recipes(user, instances, items):
+  """ Actualizar recetas con bulk_update y reemplazar sus enlaces """
+
+  now = timezone.now()
+  fields = {"updated_at"}
+  replaced = {relation: {} for relation in RELATED_MODELS}
+
+  for instance, item in zip(instances, items):
+    for relation in RELATED_MODELS:
+      if relation in item:
+        replaced[relation][instance.id] = item.pop(relation)
+    for attr, value in item.items():
+      setattr(instance, attr, value)
+      fields.add(attr)
+    instance.updated_at = now
+
+  Recipe.objects.bulk_update(instances, sorted(fields), batch_size=BATCH_SIZE)
+
+  changed = {}
+  for relation, id_lists in replaced.items():
+    changed[relation] = clear_links(relation, list(id_lists))
+    add_links(relation, (
+      (recipe_id, related_id)
+      for recipe_id, related_ids in id_lists.items()
+      for related_id in related_ids
+    ))
+    changed[relation] |= {pk for ids in id_lists.values() for pk in ids}
+
+  send_changed(user, instances, changed)
+  return instances
+
+
+def delete_recipes(user, recipe_ids):
+  """ Borrar recetas del usuario y sus enlaces
+
+  Sin ``pre_delete``/``post_delete`` por receta: blobs, indice de busqueda,
+  ``updated_at`` de tags/ingredientes y cache se actualizan una vez por
+  lote, asi que las queries no crecen con el numero de recetas.
+  """
+
+  recipes = Recipe.objects.filter(user=user, id__in=recipe_ids)
+  rows = list(recipes.values_list("id", "image"))
+  deleted = [pk for pk, _ in rows]
+
+  changed = {
+    relation: clear_links(relation, deleted)
+    for relation in RELATED_MODELS
+  }
+  images.release_blobs(Counter(image for _, image in rows if image))
+  # Los enlaces ya se borraron y no hay otras FK a Recipe: nada en cascada
+  Recipe.objects.filter(id__in=deleted)._raw_delete(recipes.db)
+  search.remove_recipes(deleted)
+
+  send_changed(user, [], changed)
+  return deleted
+
+
+def send_changed(user, recipes, changed):
+  """ Notificar escrituras que no emiten post_save ni m2m_changed """
+
+  recipes_bulk_changed.send(
+    sender=Recipe,
+    user_id=user.pk,
+    recipe_ids=[recipe.id for recipe in recipes],
+    tag_ids=changed.get("tags", set()),
+    ingredient_ids=changed.get("ingredients", set()),
+  )
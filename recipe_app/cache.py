@@ -0,0 +1,217 @@
+import hashlib
+import uuid
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, parse_http_date_safe
+
+from rest_framework.response import Response
+
+
+VERSION_KEY = "recipe_app:version:{user_id}"
+RESPONSE_KEY = "recipe_app:response:{basename}:{action}:{user_id}:{version}:{url}"
+STATS_KEY = "recipe_app:stats:{name}"
+
+
+def get_cache():
+  """ Cache configurado para las respuestas de recipe_app """
+
+  return caches[getattr(settings, "RECIPE_APP_CACHE_ALIAS", "default")]
+
+
+def get_timeout():
+  return getattr(settings, "RECIPE_APP_CACHE_TIMEOUT", 300)
+
+
+def get_version(user_id):
+  """ Version actual de los datos del usuario
+
+  La version es un token aleatorio y no un contador: si la clave se pierde
+  (expulsion del cache) la nueva version nunca coincide con una anterior,
+  asi que no se pueden servir respuestas viejas.
+  """
+
+  cache = get_cache()
+  key = VERSION_KEY.format(user_id=user_id)
+  version = cache.get(key)
+
+  if version is None:
+    cache.add(key, uuid.uuid4().hex, None)
+    version = cache.get(key)
+
+  return version
+
+
+async def aget_version(user_id):
+  """ ``get_version`` con la API async del cache """
+
+  cache = get_cache()
+  key = VERSION_KEY.format(user_id=user_id)
+  version = await cache.aget(key)
+
+  if version is None:
+    await cache.aadd(key, uuid.uuid4().hex, None)
+    version = await cache.aget(key)
+
+  return version
+
+
+def bump_version(user_id):
+  """ Invalidar todas las respuestas en cache del usuario
+
+  Rota la version ya y otra vez al confirmar la transaccion: una lectura
+  concurrente puede cachear filas aun sin confirmar bajo la version
+  intermedia, y la rotacion del commit la descarta.
+  """
+
+  def rotate():
+    get_cache().set(VERSION_KEY.format(user_id=user_id), uuid.uuid4().hex, None)
+
+  rotate()
+  if transaction.get_connection().in_atomic_block:
+    transaction.on_commit(rotate)
+
+
+def response_key(view, request, version=None):
+  """ Clave por usuario, version, accion y URL completa con parametros """
+
+  url = hashlib.md5(request.build_absolute_uri().encode("utf-8")).hexdigest()
+
+  return RESPONSE_KEY.format(
+    basename=view.basename,
+    action=view.action,
+    user_id=request.user.pk,
+    version=version or get_version(request.user.pk),
+    url=url,
+  )
+
+
+def _incr(name):
+  cache = get_cache()
+  key = STATS_KEY.format(name=name)
+  cache.add(key, 0, None)
+
+  try:
+    cache.incr(key)
+  except ValueError:
+    # La clave fue expulsada entre add() e incr()
+    cache.set(key, 1, None)
+
+
+async def _aincr(name):
+  cache = get_cache()
+  key = STATS_KEY.format(name=name)
+  await cache.aadd(key, 0, None)
+
+  try:
+    await cache.aincr(key)
+  except ValueError:
+    await cache.aset(key, 1, None)
+
+
+def get_stats():
+  """ Contadores de aciertos y fallos del cache de respuestas """
+
+  cache = get_cache()
+  return {
+    name: cache.get(STATS_KEY.format(name=name), 0)
+    for name in ("hits", "misses")
+  }
+
+
+class CachedResponseMixin:
+  """ Cachear las respuestas de las acciones en ``cached_actions`` """
+
+  cached_actions = ()
+
+  def dispatch_cached(self, handler, request, *args, **kwargs):
+    """ Servir desde cache o ejecutar ``handler`` y guardar el resultado """
+
+    cache = get_cache()
+    key = response_key(self, request)
+    entry = cache.get(key)
+
+    if entry is not None:
+      _incr("hits")
+      return self._cached_response(request, entry)
+
+    _incr("misses")
+    response = handler(request, *args, **kwargs)
+
+    if response.status_code == 200:
+      cache.set(key, self._cache_entry(response), get_timeout())
+
+    response["X-Cache"] = "MISS"
+    return response
+
+  async def adispatch_cached(self, handler, request, *args, **kwargs):
+    """ ``dispatch_cached`` para handlers async """
+
+    cache = get_cache()
+    version = await aget_version(request.user.pk)
+    key = response_key(self, request, version)
+    entry = await cache.aget(key)
+
+    if entry is not None:
+      await _aincr("hits")
+      return self._cached_response(request, entry)
+
+    await _aincr("misses")
+    response = await handler(request, *args, **kwargs)
+
+    if response.status_code == 200:
+      await cache.aset(key, self._cache_entry(response), get_timeout())
+
+    response["X-Cache"] = "MISS"
+    return response
+
+  @staticmethod
+  def _cache_entry(response):
+    return {
+      "data": response.data,
+      "etag": response.get("ETag"),
+      "last_modified": parse_http_date_safe(response.get("Last-Modified")),
+    }
+
+  def _cached_response(self, request, entry):
+    """ Respuesta desde cache, con 304 si los validadores coinciden """
+
+    response = Response(entry["data"], headers={"X-Cache": "HIT"})
+
+    if entry["etag"]:
+      response["ETag"] = entry["etag"]
+    if entry["last_modified"] is not None:
+      response["Last-Modified"] = http_date(entry["last_modified"])
+
+    return get_conditional_response(
+      request,
+      etag=entry["etag"],
+      last_modified=entry["last_modified"],
+      response=response,
+    )
+
+  def list(self, request, *args, **kwargs):
+    if "list" not in self.cached_actions:
+      return super().list(request, *args, **kwargs)
+
+    return self.dispatch_cached(super().list, request, *args, **kwargs)
+
+  def retrieve(self, request, *args, **kwargs):
+    if "retrieve" not in self.cached_actions:
+      return super().retrieve(request, *args, **kwargs)
+
+    return self.dispatch_cached(super().retrieve, request, *args, **kwargs)
+
+  async def alist(self, request, *args, **kwargs):
+    if "list" not in self.cached_actions:
+      return await super().alist(request, *args, **kwargs)
+
+    return await self.adispatch_cached(super().alist, request, *args, **kwargs)
+
+  async def aretrieve(self, request, *args, **kwargs):
+    if "retrieve" not in self.cached_actions:
+      return await super().aretrieve(request, *args, **kwargs)
+
+    return await self.adispatch_cached(super().aretrieve, request, *args, **kwargs)
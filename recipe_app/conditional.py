@@ -0,0 +1,161 @@
+import hashlib
+
+from django.core.exceptions import ValidationError
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response, quote_etag
+from django.utils.http import http_date
+
+
+# Un solo aggregate: COUNT detecta borrados y MAX(updated_at) cambios
+VALIDATOR_STATE = {"count": Count("pk"), "last_modified": Max("updated_at")}
+
+
+class ConditionalGetMixin:
+  """ ETag / Last-Modified para las acciones en ``conditional_actions``
+
+  Los validadores salen de un solo aggregate (COUNT + MAX(updated_at)) sobre
+  el queryset filtrado, asi que una peticion que coincide recibe un 304 sin
+  serializar nada. El COUNT detecta borrados y MAX(updated_at) detecta
+  altas y cambios, incluidos los de enlaces M2M.
+
+  Los listados solo envian ETag: un borrado no cambia MAX(updated_at), asi
+  que un Last-Modified de listado podria validar una respuesta vieja.
+  """
+
+  conditional_actions = ()
+
+  def get_conditional_queryset(self):
+    """ Queryset sobre el que se calculan los validadores """
+
+    return self.get_queryset()
+
+  def get_validators(self, request, *args, **kwargs):
+    """ Retornar (etag, last_modified) o (None, None) si no hay objeto """
+
+    queryset = self._validator_queryset(*args, **kwargs)
+    if queryset is None:
+      return None, None
+
+    return self._validators(request, queryset.aggregate(**VALIDATOR_STATE))
+
+  async def aget_validators(self, request, *args, **kwargs):
+    """ ``get_validators`` con el ORM async """
+
+    queryset = self._validator_queryset(*args, **kwargs)
+    if queryset is None:
+      return None, None
+
+    return self._validators(request, await queryset.aaggregate(**VALIDATOR_STATE))
+
+  def dispatch_conditional(self, handler, request, *args, **kwargs):
+    """ Responder 304 si el cliente tiene la version actual """
+
+    etag, last_modified = self.get_validators(request, *args, **kwargs)
+    if etag is None:
+      return handler(request, *args, **kwargs)
+
+    response = self._not_modified(request, etag, last_modified)
+    if response is not None:
+      return response
+
+    response = handler(request, *args, **kwargs)
+    return self._set_validators(response, etag, last_modified)
+
+  async def adispatch_conditional(self, handler, request, *args, **kwargs):
+    """ ``dispatch_conditional`` para handlers async """
+
+    etag, last_modified = await self.aget_validators(request, *args, **kwargs)
+    if etag is None:
+      return await handler(request, *args, **kwargs)
+
+    response = self._not_modified(request, etag, last_modified)
+    if response is not None:
+      return response
+
+    response = await handler(request, *args, **kwargs)
+    return self._set_validators(response, etag, last_modified)
+
+  def list(self, request, *args, **kwargs):
+    if "list" not in self.conditional_actions:
+      return super().list(request, *args, **kwargs)
+
+    return self.dispatch_conditional(super().list, request, *args, **kwargs)
+
+  def retrieve(self, request, *args, **kwargs):
+    if "retrieve" not in self.conditional_actions:
+      return super().retrieve(request, *args, **kwargs)
+
+    return self.dispatch_conditional(super().retrieve, request, *args, **kwargs)
+
+  async def alist(self, request, *args, **kwargs):
+    if "list" not in self.conditional_actions:
+      return await super().alist(request, *args, **kwargs)
+
+    return await self.adispatch_conditional(super().alist, request, *args, **kwargs)
+
+  async def aretrieve(self, request, *args, **kwargs):
+    if "retrieve" not in self.conditional_actions:
+      return await super().aretrieve(request, *args, **kwargs)
+
+    return await self.adispatch_conditional(
+      super().aretrieve,
+      request,
+      *args,
+      **kwargs
+    )
+
+  def _validator_queryset(self, *args, **kwargs):
+    """ Queryset de los validadores; None si el id no es valido (404) """
+
+    queryset = self.get_conditional_queryset()
+
+    if self.action == "retrieve":
+      lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+      try:
+        queryset = queryset.filter(
+          **{self.lookup_field: kwargs[lookup_url_kwarg]}
+        )
+      except (TypeError, ValueError, ValidationError):
+        return None
+
+    return queryset.order_by()
+
+  def _validators(self, request, state):
+    if self.action == "retrieve" and not state["count"]:
+      return None, None
+
+    last_modified = state["last_modified"]
+    token = "|".join([
+      self.action,
+      request.get_full_path(),
+      request.META.get("HTTP_ACCEPT", ""),
+      str(state["count"]),
+      last_modified.isoformat() if last_modified else "",
+    ])
+    etag = quote_etag(hashlib.md5(token.encode("utf-8")).hexdigest())
+
+    if self.action != "retrieve" or last_modified is None:
+      return etag, None
+
+    return etag, int(last_modified.timestamp())
+
+  @staticmethod
+  def _not_modified(request, etag, last_modified):
+    response = get_conditional_response(
+      request,
+      etag=etag,
+      last_modified=last_modified
+    )
+    if response is not None:
+      response["ETag"] = etag
+
+    return response
+
+  @staticmethod
+  def _set_validators(response, etag, last_modified):
+    if response.status_code == 200:
+      response["ETag"] = etag
+      if last_modified is not None:
+        response["Last-Modified"] = http_date(last_modified)
+
+    return response
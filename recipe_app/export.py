@@ -0,0 +1,95 @@
+import csv
+from itertools import islice
+
+from rest_framework.exceptions import ValidationError
+
+from app_core.renderers import FastJSONRenderer
+from recipe_app import serializers
+
+
+CHUNK_SIZE = 2000
+
+FORMATS = {
+  "ndjson": ("application/x-ndjson", "recipes.ndjson"),
+  "csv": ("text/csv", "recipes.csv"),
+}
+
+
+def get_format(params):
+  """ Formato de ``export_format`` (ndjson por defecto) """
+
+  name = params.get("export_format", "ndjson")
+  if name not in FORMATS:
+    raise ValidationError({
+      "export_format": f"Expected one of: {', '.join(FORMATS)}."
+    })
+
+  return name
+
+
+def chunks(rows, size=None):
+  """ Leer ``rows`` por bloques con un cursor del lado del servidor """
+
+  size = size or CHUNK_SIZE
+  iterator = rows.iterator(chunk_size=size)
+  while True:
+    chunk = list(islice(iterator, size))
+    if not chunk:
+      return
+    yield chunk
+
+
+def recipes(rows, context):
+  """ Recetas serializadas; tags e ingredientes se leen una vez por bloque """
+
+  for chunk in chunks(rows):
+    yield from serializers.RecipeRowSerializer(
+      chunk,
+      many=True,
+      context=context
+    ).data
+
+
+def ndjson(items):
+  """ Una linea JSON por receta """
+
+  renderer = FastJSONRenderer()
+  for item in items:
+    yield renderer.render(item) + b"\n"
+
+
+class Echo:
+  """ Buffer que retorna lo escrito, para que csv.writer produzca lineas """
+
+  def write(self, value):
+    return value
+
+
+def csv_lines(items, fields):
+  """ CSV con cabecera; tags e ingredientes por nombre separados por ``;`` """
+
+  writer = csv.writer(Echo())
+  yield writer.writerow(fields)
+
+  for item in items:
+    yield writer.writerow([csv_value(item[name]) for name in fields])
+
+
+def csv_value(value):
+  if isinstance(value, list):
+    return ";".join(
+      str(entry["name"] if isinstance(entry, dict) else entry) for entry in value
+    )
+
+  return value
+
+
+def stream(name, rows, fields, context):
+  """ Iterador de bytes/texto del export en el formato ``name`` """
+
+  if name == "csv":
+    # Por nombre, como los lee el import: los IDs no sirven en otra cuenta
+    context = {**context, "expand": serializers.RecipeSerializer.expandable}
+    return csv_lines(recipes(rows, context), fields)
+
+  return ndjson(recipes(rows, context))
@@ -0,0 +1,62 @@
+from django.core.exceptions import ValidationError as DjangoValidationError
+from rest_framework import serializers
+from rest_framework.relations import MANY_RELATION_KWARGS, ManyRelatedField
+
+
+class UserManyRelatedField(ManyRelatedField):
+  """ Lista de PKs validada con una sola query ``filter(pk__in=...)`` """
+
+  def to_internal_value(self, data):
+    if isinstance(data, str) or not hasattr(data, "__iter__"):
+      self.fail("not_a_list", input_type=type(data).__name__)
+    if not self.allow_empty and len(data) == 0:
+      self.fail("empty")
+
+    child = self.child_relation
+    queryset = child.get_queryset()
+    pk_field = queryset.model._meta.pk
+
+    pks = []
+    for item in data:
+      if isinstance(item, bool):
+        child.fail("incorrect_type", data_type=type(item).__name__)
+      try:
+        pks.append(pk_field.to_python(item))
+      except DjangoValidationError:
+        child.fail("incorrect_type", data_type=type(item).__name__)
+
+    objects = {obj.pk: obj for obj in queryset.filter(pk__in=set(pks))}
+    missing = [pk for pk in dict.fromkeys(pks) if pk not in objects]
+    if missing:
+      raise serializers.ValidationError([
+        child.error_messages["does_not_exist"].format(pk_value=pk)
+        for pk in missing
+      ])
+
+    return [objects[pk] for pk in dict.fromkeys(pks)]
+
+
+class UserPrimaryKeyRelatedField(serializers.PrimaryKeyRelatedField):
+  """ PrimaryKeyRelatedField limitado a objetos del usuario de la peticion
+
+  Con ``many=True`` toda la lista se valida con una query y se reportan
+  todos los IDs inexistentes (o de otro usuario) a la vez.
+  """
+
+  def get_queryset(self):
+    queryset = super().get_queryset()
+    request = self.context.get("request")
+
+    if request is not None:
+      queryset = queryset.filter(user=request.user)
+
+    return queryset
+
+  @classmethod
+  def many_init(cls, *args, **kwargs):
+    list_kwargs = {"child_relation": cls(*args, **kwargs)}
+    for key in kwargs:
+      if key in MANY_RELATION_KWARGS:
+        list_kwargs[key] = kwargs[key]
+
+    return UserManyRelatedField(**list_kwargs)
@@ -0,0 +1,212 @@
+from decimal import ROUND_CEILING, ROUND_FLOOR, Decimal, InvalidOperation
+
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db.models import Count, Exists, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+from rest_framework.exceptions import ValidationError
+
+from app_core.models import Recipe
+
+
+MATCH_ANY = "any"
+MATCH_ALL = "all"
+MATCH_CHOICES = (MATCH_ANY, MATCH_ALL)
+
+# Campos de ``ordering``; cada uno tiene un indice (user, campo, id)
+ORDERING_FIELDS = ("id", "time_minutes", "price")
+
+# Rango de las claves primarias (BigAutoField)
+MAX_ID = 2 ** 63 - 1
+
+# Rango de IntegerField en todos los motores (SQLite no lo valida)
+MAX_INTEGER = 2 ** 31 - 1
+
+# parametro -> (campo de Recipe, lookup, maximo); sin maximo lo validan los
+# validadores del campo (max_digits de DecimalField)
+RANGE_FILTERS = {
+  "max_time": ("time_minutes", "lte", MAX_INTEGER),
+  "min_price": ("price", "gte", None),
+  "max_price": ("price", "lte", None),
+}
+
+
+def params_to_ints(name, value):
+  """ Convertir lista string IDs a lista de integers """
+
+  try:
+    ids = [int(str_id) for str_id in value.split(",")]
+  except ValueError:
+    ids = None
+
+  # Fuera del rango de la columna la base de datos lanza OverflowError
+  if ids is None or not all(1 <= pk <= MAX_ID for pk in ids):
+    raise ValidationError({name: "Expected a comma separated list of IDs."})
+
+  return ids
+
+
+def get_match(params):
+  """ Retornar la semantica de coincidencia pedida (any / all) """
+
+  match = params.get("match", MATCH_ANY)
+  if match not in MATCH_CHOICES:
+    raise ValidationError({"match": f"Expected one of: {', '.join(MATCH_CHOICES)}."})
+
+  return match
+
+
+def parse_flag(params, name):
+  """ Leer un parametro booleano 0/1 de la peticion """
+
+  try:
+    return bool(int(params.get(name, 0)))
+  except ValueError:
+    raise ValidationError({name: "Expected 0 or 1."})
+
+
+def parse_names(params, name):
+  """ Leer una lista de nombres separados por comas, o None si no esta """
+
+  value = params.get(name)
+  if value is None:
+    return None
+
+  return [item.strip() for item in value.split(",") if item.strip()]
+
+
+def parse_number(params, name):
+  """ Leer un numero no negativo de la peticion, o None si no esta """
+
+  value = params.get(name)
+  if value in (None, ""):
+    return None
+
+  try:
+    number = Decimal(value)
+  except InvalidOperation:
+    raise ValidationError({name: "Expected a number."})
+
+  if not number.is_finite() or number < 0:
+    raise ValidationError({name: "Expected a non-negative number."})
+
+  return number
+
+
+def parse_bound(params, name, field_name, lookup, maximum=None):
+  """ Leer el limite ``name`` con el tipo y rango del campo, o None si no esta
+
+  Se redondea a los decimales del campo hacia dentro del rango (hacia arriba
+  en ``gte``, hacia abajo en ``lte``), que filtra las mismas filas. Un valor
+  que la columna no puede guardar es 400: la base de datos lanzaria
+  OverflowError.
+  """
+
+  number = parse_number(params, name)
+  if number is None:
+    return None
+
+  field = Recipe._meta.get_field(field_name)
+  places = getattr(field, "decimal_places", 0)
+  rounding = ROUND_CEILING if lookup == "gte" else ROUND_FLOOR
+
+  try:
+    number = number.quantize(Decimal(1).scaleb(-places), rounding=rounding)
+    value = field.to_python(number if places else int(number))
+    field.run_validators(value)
+  except (InvalidOperation, DjangoValidationError):
+    value = None
+
+  if value is None or (maximum is not None and value > maximum):
+    raise ValidationError({name: "Value out of range."})
+
+  return value
+
+
+def get_ordering(params):
+  """ Orden keyset pedido en ``ordering``, o None si no se pidio
+
+  Siempre termina en ``id`` en la misma direccion, para que el orden sea
+  total y se pueda recorrer el indice (user, campo, id) en ambos sentidos.
+  """
+
+  value = params.get("ordering")
+  if not value:
+    return None
+
+  field = value.lstrip("-")
+  if field not in ORDERING_FIELDS:
+    raise ValidationError({
+      "ordering": f"Expected one of: {', '.join(ORDERING_FIELDS)}, optionally prefixed with -."
+    })
+
+  prefix = "-" if value.startswith("-") else ""
+  if field == "id":
+    return (f"{prefix}id", )
+
+  return (f"{prefix}{field}", f"{prefix}id")
+
+
+def get_through(relation):
+  """ Retornar tabla intermedia y columna del objeto relacionado """
+
+  field = Recipe._meta.get_field(relation)
+  return field.remote_field.through, f"{field.m2m_reverse_field_name()}_id"
+
+
+def filter_assigned(queryset, relation):
+  """ Tags/ingredientes usados por alguna receta, via EXISTS correlado """
+
+  through, column = get_through(relation)
+  links = through.objects.filter(**{column: OuterRef("pk")})
+
+  return queryset.filter(Exists(links))
+
+
+def annotate_usage(queryset, relation):
+  """ Anotar ``usage`` con el numero de recetas, en la misma query """
+
+  through, column = get_through(relation)
+  usage = through.objects.filter(
+    **{column: OuterRef("pk")}
+  ).order_by().values(column).annotate(total=Count("pk")).values("total")
+
+  return queryset.annotate(usage=Coalesce(Subquery(usage), Value(0)))
+
+
+def filter_by_relation(queryset, relation, ids, match=MATCH_ANY):
+  """ Filtrar recetas por IDs de una relacion M2M usando un subquery
+
+  Filtra con ``id IN (SELECT recipe_id FROM <through> ...)`` en vez de
+  hacer JOIN con la tabla intermedia, asi que no multiplica filas ni
+  necesita DISTINCT. Con ``match="all"`` la receta debe tener todos los IDs.
+  """
+
+  through, column = get_through(relation)
+  ids = set(ids)
+
+  links = through.objects.filter(**{f"{column}__in": ids})
+  if match == MATCH_ALL:
+    links = links.values("recipe_id").annotate(
+      matched=Count(column)
+    ).filter(matched=len(ids))
+
+  return queryset.filter(id__in=links.values("recipe_id"))
+
+
+def filter_recipes(queryset, params):
+  """ Aplicar los filtros de tags, ingredientes, tiempo y precio """
+
+  match = get_match(params)
+
+  for name, (field_name, lookup, maximum) in RANGE_FILTERS.items():
+    value = parse_bound(params, name, field_name, lookup, maximum)
+    if value is not None:
+      queryset = queryset.filter(**{f"{field_name}__{lookup}": value})
+
+  for relation in ("tags", "ingredients"):
+    value = params.get(relation)
+    if value:
+      ids = params_to_ints(relation, value)
+      queryset = filter_by_relation(queryset, relation, ids, match)
+
+  return queryset
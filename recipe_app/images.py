@@ -0,0 +1,202 @@
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import close_old_connections, transaction
+from django.db.models import F, Sum
+from django.db.models.functions import Greatest
+
+from PIL import Image, ImageOps
+
+from app_core.models import ImageBlob, Recipe
+
+
+logger = logging.getLogger(__name__)
+
+# nombre -> (tamaño maximo, formato de Pillow, extension)
+RENDITIONS = {
+  "thumbnail": ((200, 200), "JPEG", "jpg"),
+  "medium": ((800, 800), "JPEG", "jpg"),
+  "webp": ((1600, 1600), "WEBP", "webp"),
+}
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_storage():
+  return Recipe._meta.get_field("image").storage
+
+
+def get_executor():
+  """ Pool de hilos del proceso; hace de cola local de tareas """
+
+  global _executor
+
+  with _executor_lock:
+    if _executor is None:
+      _executor = ThreadPoolExecutor(
+        max_workers=getattr(settings, "RECIPE_IMAGE_WORKERS", 2),
+        thread_name_prefix="recipe-images"
+      )
+
+  return _executor
+
+
+def rendition_name(name, key):
+  """ Nombre del archivo de una version derivada de ``name`` """
+
+  root, _ = os.path.splitext(name)
+  return f"{root}_{key}.{RENDITIONS[key][2]}"
+
+
+def rendition_urls(renditions, request=None):
+  """ URLs de las versiones de una receta, absolutas si hay peticion """
+
+  storage = get_storage()
+  urls = {}
+
+  for key, name in (renditions or {}).items():
+    url = storage.url(name)
+    urls[key] = request.build_absolute_uri(url) if request is not None else url
+
+  return urls
+
+
+def remaining_quota(user, exclude=None):
+  """ Bytes de imagen que aun puede subir ``user``
+
+  La imagen de ``exclude`` no cuenta: se va a reemplazar.
+  """
+
+  recipes = Recipe.objects.filter(user=user)
+  if exclude is not None:
+    recipes = recipes.exclude(pk=exclude.pk)
+
+  used = recipes.aggregate(total=Sum("image_bytes"))["total"] or 0
+  quota = getattr(settings, "RECIPE_IMAGE_QUOTA_BYTES", 200 * 1024 * 1024)
+
+  return max(quota - used, 0)
+
+
+def acquire_blob(name):
+  """ Sumar una receta que usa el archivo ``name`` """
+
+  ImageBlob.objects.bulk_create([ImageBlob(name=name)], ignore_conflicts=True)
+  ImageBlob.objects.filter(name=name).update(refcount=F("refcount") + 1)
+
+
+def release_blob(name):
+  """ Restar una referencia a ``name`` y borrarlo al quedar sin recetas
+
+  Los archivos se borran al confirmar la transaccion, y solo si nadie volvio
+  a subir el mismo contenido entretanto.
+  """
+
+  release_blobs({name: 1})
+
+
+def release_blobs(counts):
+  """ ``release_blob`` por lotes: ``counts`` es nombre -> referencias
+
+  Un UPDATE por nombre distinto y no por receta.
+  """
+
+  for name, count in counts.items():
+    ImageBlob.objects.filter(name=name, refcount__gt=0).update(
+      refcount=Greatest(F("refcount") - count, 0)
+    )
+
+  unused = ImageBlob.objects.filter(name__in=list(counts), refcount=0)
+  names = list(unused.values_list("name", flat=True))
+  if not names:
+    return
+
+  # refcount=0 otra vez: un acquire_blob entretanto conserva el blob
+  unused.filter(name__in=names).delete()
+  transaction.on_commit(lambda: [delete_blob_files(name) for name in names])
+
+
+def delete_blob_files(name):
+  """ Borrar el original y sus versiones si el blob sigue sin uso """
+
+  if ImageBlob.objects.filter(name=name).exists():
+    return
+
+  storage = get_storage()
+  for target in [name] + [rendition_name(name, key) for key in RENDITIONS]:
+    storage.delete(target)
+
+
+def schedule_renditions(recipe):
+  """ Encolar el procesado de la imagen al confirmar la transaccion
+
+  Con ``RECIPE_IMAGE_WORKERS = 0`` se procesa en linea (tests y scripts).
+  """
+
+  recipe_id, name = recipe.pk, recipe.image.name
+
+  def submit():
+    if getattr(settings, "RECIPE_IMAGE_WORKERS", 2) == 0:
+      process_recipe_image(recipe_id, name)
+    else:
+      get_executor().submit(_run_in_worker, recipe_id, name)
+
+  transaction.on_commit(submit)
+
+
+def _run_in_worker(recipe_id, name):
+  try:
+    process_recipe_image(recipe_id, name)
+  except Exception:
+    logger.exception("Failed to process image %s of recipe %s", name, recipe_id)
+  finally:
+    close_old_connections()
+
+
+def render(image, key):
+  """ Redimensionar y recodificar sin metadatos EXIF """
+
+  size, image_format, _ = RENDITIONS[key]
+  rendition = image.copy()
+  rendition.thumbnail(size)
+
+  if image_format == "JPEG" and rendition.mode != "RGB":
+    rendition = rendition.convert("RGB")
+
+  buffer = BytesIO()
+  rendition.save(buffer, format=image_format, quality=85)
+  return buffer.getvalue()
+
+
+def process_recipe_image(recipe_id, name):
+  """ Generar las versiones de ``name`` y guardarlas en la receta """
+
+  storage = get_storage()
+  renditions = {key: rendition_name(name, key) for key in RENDITIONS}
+  missing = [key for key, target in renditions.items() if not storage.exists(target)]
+
+  # El nombre es el hash del original: versiones ya generadas para el mismo
+  # contenido (de esta u otra receta) son identicas y se reutilizan
+  if missing:
+    with storage.open(name) as original:
+      image = Image.open(original)
+      # Aplicar la orientacion EXIF antes de descartar los metadatos
+      image = ImageOps.exif_transpose(image)
+
+      for key in missing:
+        storage.save_as(renditions[key], ContentFile(render(image, key)))
+
+  recipe = Recipe.objects.filter(pk=recipe_id, image=name).first()
+  if recipe is None:
+    # La receta se borro o tiene otra imagen: si el blob quedo sin uso
+    # mientras se procesaba, borrar tambien lo que se acaba de escribir
+    delete_blob_files(name)
+    return
+
+  recipe.image_renditions = renditions
+  recipe.save(update_fields=["image_renditions", "updated_at"])
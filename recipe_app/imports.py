@@ -0,0 +1,187 @@
+import codecs
+import csv
+import io
+from itertools import islice
+
+from django.db import transaction
+from django.db.models import Value
+from django.db.models.functions import Lower
+from rest_framework.exceptions import ParseError, ValidationError
+
+from app_core.parsers import FastJSONParser
+from recipe_app import bulk, serializers
+
+
+CHUNK_SIZE = 500
+FORMATS = ("ndjson", "csv")
+
+
+def get_format(params, upload):
+  """ Formato de ``import_format``, o segun la extension del archivo """
+
+  name = params.get("import_format")
+  if name is None:
+    return "csv" if upload.name.lower().endswith(".csv") else "ndjson"
+
+  if name not in FORMATS:
+    raise ValidationError({
+      "import_format": f"Expected one of: {', '.join(FORMATS)}."
+    })
+
+  return name
+
+
+def read_items(upload, name):
+  """ Filas ``(linea, datos, error)`` del archivo, leido por lineas """
+
+  try:
+    if name == "csv":
+      yield from _read_csv(upload)
+    else:
+      yield from _read_ndjson(upload)
+  except UnicodeDecodeError:
+    yield None, None, {"non_field_errors": ["File is not valid UTF-8."]}
+
+
+def _read_ndjson(upload):
+  parser = FastJSONParser()
+
+  for number, line in enumerate(upload, start=1):
+    if not line.strip():
+      continue
+    try:
+      yield number, parser.parse(io.BytesIO(line)), None
+    except ParseError as exc:
+      yield number, None, {"non_field_errors": [exc.detail]}
+
+
+def _read_csv(upload):
+  # Mismas columnas que el export; tags e ingredientes separados por ";"
+  reader = csv.DictReader(codecs.iterdecode(upload, "utf-8"))
+
+  for row in reader:
+    for relation in bulk.RELATED_MODELS:
+      if relation in row:
+        row[relation] = [name for name in (row[relation] or "").split(";") if name]
+    yield reader.line_num, row, None
+
+
+class NameMap:
+  """ Nombre -> id de los tags o ingredientes de un usuario
+
+  Los nombres no distinguen mayusculas, igual que la restriccion unica de
+  (user, LOWER(name)). Los que faltan se crean con un solo ``bulk_create``
+  por bloque y se vuelven a leer para conocer sus IDs. Crece con los nombres
+  distintos del archivo, no con el numero de recetas.
+  """
+
+  def __init__(self, relation, user):
+    self.model = bulk.RELATED_MODELS[relation]
+    self.user = user
+    self.ids = {}
+    self.created = set()
+
+  def __getitem__(self, name):
+    return self.ids[name.lower()]
+
+  def resolve(self, names):
+    missing = {}
+    for name in names:
+      if name.lower() not in self.ids:
+        missing.setdefault(name.lower(), name)
+    if missing:
+      self._load(missing.values())
+
+    new = sorted(
+      name for key, name in missing.items() if key not in self.ids
+    )
+    if new:
+      # Un nombre creado a la vez por otra peticion se ignora y se lee abajo
+      self.model.objects.bulk_create(
+        (self.model(user=self.user, name=name) for name in new),
+        batch_size=bulk.BATCH_SIZE,
+        ignore_conflicts=True
+      )
+      self._load(new)
+      self.created.update(name.lower() for name in new)
+
+  def _load(self, names):
+    # LOWER en los dos lados: la misma comparacion que la restriccion
+    names = list(names)
+    for start in range(0, len(names), bulk.BATCH_SIZE):
+      rows = self.model.objects.annotate(lower_name=Lower("name")).filter(
+        user=self.user,
+        lower_name__in=[
+          Lower(Value(name)) for name in names[start:start + bulk.BATCH_SIZE]
+        ]
+      ).order_by("id").values_list("id", "name")
+      for pk, name in rows:
+        self.ids.setdefault(name.lower(), pk)
+
+
+def import_chunk(user, rows, maps, context):
+  """ Validar y crear las recetas de un bloque; retorna (creadas, errores) """
+
+  valid = []
+  errors = []
+  # Un solo serializador por bloque, como hace ListSerializer con su hijo
+  serializer = serializers.RecipeImportSerializer(context=context)
+
+  for line, data, error in rows:
+    if error is None:
+      try:
+        valid.append(serializer.run_validation(data))
+        continue
+      except ValidationError as exc:
+        error = exc.detail
+    errors.append({"line": line, "errors": error})
+
+  if not valid:
+    return 0, errors
+
+  with transaction.atomic():
+    for relation, names in maps.items():
+      # En orden del archivo: la primera grafia de un nombre nuevo es la que se crea
+      names.resolve(dict.fromkeys(
+        name for item in valid for name in item.get(relation, [])
+      ))
+
+    items = [
+      {
+        **item,
+        **{
+          relation: list(dict.fromkeys(names[name] for name in item.get(relation, [])))
+          for relation, names in maps.items()
+        },
+      }
+      for item in valid
+    ]
+    bulk.create_recipes(user, items)
+
+  return len(items), errors
+
+
+def run(user, rows, context, chunk_size=None):
+  """ Importar ``rows`` por bloques; produce una linea de progreso por bloque """
+
+  size = chunk_size or CHUNK_SIZE
+  maps = {relation: NameMap(relation, user) for relation in bulk.RELATED_MODELS}
+  totals = {"processed": 0, "created": 0, "failed": 0}
+
+  while True:
+    chunk = list(islice(rows, size))
+    if not chunk:
+      break
+
+    created, errors = import_chunk(user, chunk, maps, context)
+    totals["processed"] += len(chunk)
+    totals["created"] += created
+    totals["failed"] += len(errors)
+    yield {**totals, "errors": errors}
+
+  yield {
+    **totals,
+    "tags_created": len(maps["tags"].created),
+    "ingredients_created": len(maps["ingredients"].created),
+    "done": True,
+  }
@@ -0,0 +1,85 @@
+import random
+import time
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+
+from app_core.models import Ingredient, Recipe, Tag
+
+
+class Rollback(Exception):
+  """ Forzar rollback de los datos sembrados por un benchmark """
+
+
+def seed_recipes(recipes, tags=50, ingredients=200, tags_per_recipe=3,
+                 ingredients_per_recipe=5, batch_size=5000, seed=0):
+  """ Sembrar un usuario con recetas, tags e ingredientes aleatorios """
+
+  rng = random.Random(seed)
+  user = get_user_model().objects.create_user(
+    f"benchmark-{time.time_ns()}@example.com",
+    "benchmark"
+  )
+  tag_ids = [
+    tag.id for tag in Tag.objects.bulk_create(
+      Tag(user=user, name=f"Tag {i}") for i in range(tags)
+    )
+  ]
+  ingredient_ids = [
+    ingredient.id for ingredient in Ingredient.objects.bulk_create(
+      Ingredient(user=user, name=f"Ingredient {i}") for i in range(ingredients)
+    )
+  ]
+
+  tag_links = Recipe.tags.through
+  ingredient_links = Recipe.ingredients.through
+
+  for start in range(0, recipes, batch_size):
+    batch = Recipe.objects.bulk_create(
+      Recipe(
+        user=user,
+        name=f"recipe-{i}",
+        title=f"Recipe {i}",
+        time_minutes=rng.randint(5, 180),
+        price=Decimal(rng.randint(100, 99999)) / 100,
+      )
+      for i in range(start, min(start + batch_size, recipes))
+    )
+    tag_links.objects.bulk_create(
+      tag_links(recipe_id=recipe.id, tag_id=tag_id)
+      for recipe in batch
+      for tag_id in rng.sample(tag_ids, tags_per_recipe)
+    )
+    ingredient_links.objects.bulk_create(
+      ingredient_links(recipe_id=recipe.id, ingredient_id=ingredient_id)
+      for recipe in batch
+      for ingredient_id in rng.sample(ingredient_ids, ingredients_per_recipe)
+    )
+
+  return user, tag_ids, ingredient_ids
+
+
+def timed(func, repeat=5):
+  """ Ejecutar ``func`` varias veces y retornar (mejor tiempo ms, resultado) """
+
+  best = None
+  result = None
+  for _ in range(repeat):
+    start = time.perf_counter()
+    result = func()
+    elapsed = (time.perf_counter() - start) * 1000
+    best = elapsed if best is None else min(best, elapsed)
+
+  return best, result
+
+
+def run_rolled_back(func):
+  """ Ejecutar ``func`` dentro de una transaccion que siempre se revierte """
+
+  try:
+    with transaction.atomic():
+      func()
+      raise Rollback()
+  except Rollback:
+    pass
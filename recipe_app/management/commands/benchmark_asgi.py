@@ -0,0 +1,239 @@
+import asyncio
+import io
+import json
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.core.handlers.asgi import ASGIHandler
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management.base import BaseCommand
+from django.db import connections
+from django.test.utils import override_settings
+from django.urls import reverse
+
+from rest_framework.authtoken.models import Token
+
+from app_core.models import Recipe
+from recipe_app.management.commands._benchmark import seed_recipes
+
+
+# Modo -> (handler, ASYNC_VIEWS)
+MODES = {
+  "wsgi": ("wsgi", "0"),
+  "asgi-sync": ("asgi", "0"),
+  "asgi": ("asgi", "1"),
+}
+HOST = "testserver"
+
+
+class Command(BaseCommand):
+  """ Comparar peticiones/s y p99 de las lecturas bajo WSGI y ASGI
+
+  Cada modo corre en su propio proceso (``ASYNC_VIEWS`` se lee al cargar
+  las URLs) y llama al handler de Django directamente, sin servidor: WSGI
+  con un pool de hilos como un worker ``gthread`` y ASGI con tareas en un
+  event loop como un worker de uvicorn. Los datos sembrados se confirman
+  para que los vean todos los hilos y se borran al terminar.
+  """
+
+  help = "Load test recipe read endpoints under WSGI and ASGI handlers."
+
+  def add_arguments(self, parser):
+    parser.add_argument("--recipes", type=int, default=1000)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument(
+      "--modes",
+      nargs="+",
+      choices=list(MODES),
+      default=list(MODES)
+    )
+    parser.add_argument(
+      "--cache",
+      action="store_true",
+      help="Keep the response cache on (default: every request hits the DB)."
+    )
+    parser.add_argument("--worker", choices=list(MODES), help="Internal.")
+    parser.add_argument("--token", help="Internal.")
+
+  def handle(self, *args, **options):
+    if options["worker"]:
+      return self._worker(options)
+
+    self.stdout.write(f"Seeding {options['recipes']} recipes...")
+    user, _, _ = seed_recipes(options["recipes"])
+    try:
+      token = Token.objects.create(user=user)
+      self.stdout.write(
+        f"{'mode':<11}{'endpoint':<10}{'req/s':>9}{'p50 ms':>9}{'p99 ms':>9}"
+      )
+      for mode in options["modes"]:
+        for result in self._spawn(mode, token.key, options):
+          self.stdout.write(
+            f"{mode:<11}{result['endpoint']:<10}{result['rps']:>9.1f}"
+            f"{result['p50']:>9.1f}{result['p99']:>9.1f}"
+          )
+    finally:
+      user.delete()
+
+  def _spawn(self, mode, token, options):
+    """ Ejecutar un modo en un proceso hijo; retorna sus resultados """
+
+    command = [
+      sys.executable,
+      str(Path(settings.BASE_DIR) / "manage.py"),
+      "benchmark_asgi",
+      "--worker", mode,
+      "--token", token,
+      "--requests", str(options["requests"]),
+      "--concurrency", str(options["concurrency"]),
+    ]
+    if options["cache"]:
+      command.append("--cache")
+
+    env = {
+      **os.environ,
+      "DJANGO_SETTINGS_MODULE": settings.SETTINGS_MODULE,
+      "ASYNC_VIEWS": MODES[mode][1],
+    }
+    output = subprocess.run(
+      command,
+      env=env,
+      check=True,
+      capture_output=True,
+      text=True
+    ).stdout
+    return [json.loads(line) for line in output.splitlines() if line.startswith("{")]
+
+  def _worker(self, options):
+    user_id = Token.objects.get(key=options["token"]).user_id
+    recipe_id = Recipe.objects.filter(user_id=user_id).order_by("id").values_list(
+      "id",
+      flat=True
+    ).first()
+    connections.close_all()
+
+    endpoints = (
+      ("list", reverse("recipe_app:recipe-list") + "?page_size=50"),
+      ("detail", reverse("recipe_app:recipe-detail", args=[recipe_id])),
+      ("tags", reverse("recipe_app:tag-list")),
+    )
+    overrides = {"ALLOWED_HOSTS": [HOST]}
+    if not options["cache"]:
+      overrides["RECIPE_APP_CACHE_TIMEOUT"] = 0
+
+    handler, _ = MODES[options["worker"]]
+    run = self._run_wsgi if handler == "wsgi" else self._run_asgi
+    with override_settings(**overrides):
+      for name, url in endpoints:
+        # Calentar conexiones, caches de tokens y URLs antes de medir
+        run(url, options["token"], options["concurrency"], options["concurrency"])
+        elapsed, latencies = run(
+          url,
+          options["token"],
+          options["requests"],
+          options["concurrency"]
+        )
+        self.stdout.write(json.dumps({
+          "endpoint": name,
+          **summarize(options["requests"], elapsed, latencies),
+        }))
+
+  def _run_wsgi(self, url, token, requests, concurrency):
+    handler = WSGIHandler()
+    path = urlsplit(url)
+
+    def request(_):
+      environ = {
+        "REQUEST_METHOD": "GET",
+        "PATH_INFO": path.path,
+        "QUERY_STRING": path.query,
+        "SERVER_NAME": HOST,
+        "SERVER_PORT": "80",
+        "SERVER_PROTOCOL": "HTTP/1.1",
+        "HTTP_HOST": HOST,
+        "HTTP_AUTHORIZATION": f"Token {token}",
+        "REMOTE_ADDR": "127.0.0.1",
+        "wsgi.url_scheme": "http",
+        "wsgi.input": io.BytesIO(),
+        "wsgi.errors": sys.stderr,
+        "wsgi.multithread": True,
+        "wsgi.multiprocess": False,
+        "wsgi.run_once": False,
+        "wsgi.version": (1, 0),
+      }
+      start = time.perf_counter()
+      response = handler(environ, _start_response)
+      b"".join(response)
+      response.close()
+      return time.perf_counter() - start
+
+    with ThreadPoolExecutor(concurrency) as pool:
+      start = time.perf_counter()
+      latencies = list(pool.map(request, range(requests)))
+      return time.perf_counter() - start, latencies
+
+  def _run_asgi(self, url, token, requests, concurrency):
+    return asyncio.run(self._asgi(url, token, requests, concurrency))
+
+  async def _asgi(self, url, token, requests, concurrency):
+    handler = ASGIHandler()
+    path = urlsplit(url)
+    scope = {
+      "type": "http",
+      "asgi": {"version": "3.0"},
+      "http_version": "1.1",
+      "method": "GET",
+      "scheme": "http",
+      "path": path.path,
+      "raw_path": path.path.encode(),
+      "query_string": path.query.encode(),
+      "root_path": "",
+      "headers": [
+        (b"host", HOST.encode()),
+        (b"authorization", f"Token {token}".encode()),
+      ],
+      "client": ("127.0.0.1", 0),
+      "server": (HOST, 80),
+    }
+    pending = iter(range(requests))
+    latencies = []
+
+    async def receive():
+      return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+      if message["type"] == "http.response.start" and message["status"] != 200:
+        raise RuntimeError(f"Benchmark request failed: {message['status']}")
+
+    async def client():
+      for _ in pending:
+        start = time.perf_counter()
+        await handler(scope, receive, send)
+        latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    return time.perf_counter() - start, latencies
+
+
+def _start_response(status, headers, exc_info=None):
+  if not status.startswith("200"):
+    raise RuntimeError(f"Benchmark request failed: {status}")
+
+
+def summarize(requests, elapsed, latencies):
+  """ Peticiones/s y percentiles 50/99 en ms """
+
+  latencies = sorted(latencies)
+  return {
+    "rps": requests / elapsed,
+    "p50": latencies[len(latencies) // 2] * 1000,
+    "p99": latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000,
+  }
@@ -0,0 +1,59 @@
+from django.core.management.base import BaseCommand
+
+from app_core.models import Recipe
+from recipe_app import filters
+from recipe_app.management.commands._benchmark import (
+  run_rolled_back, seed_recipes, timed
+)
+
+
+class Command(BaseCommand):
+  """ Comparar el filtro por JOIN con el filtro por subquery """
+
+  help = "Benchmark the tag/ingredient recipe filters on a seeded dataset."
+
+  def add_arguments(self, parser):
+    parser.add_argument("--recipes", type=int, default=100000)
+    parser.add_argument("--repeat", type=int, default=5)
+
+  def handle(self, *args, **options):
+    run_rolled_back(lambda: self._run(options["recipes"], options["repeat"]))
+
+  def _run(self, recipes, repeat):
+    self.stdout.write(f"Seeding {recipes} recipes...")
+    user, tag_ids, ingredient_ids = seed_recipes(recipes)
+    tags = tag_ids[:3]
+    ingredients = ingredient_ids[:3]
+    base = Recipe.objects.filter(user=user)
+
+    def join_filter():
+      return base.filter(tags__id__in=tags).filter(
+        ingredients__id__in=ingredients
+      )
+
+    cases = {
+      "join (legacy)": join_filter,
+      "join + distinct": lambda: join_filter().distinct(),
+      "subquery any": lambda: filters.filter_by_relation(
+        filters.filter_by_relation(base, "tags", tags),
+        "ingredients", ingredients
+      ),
+      "subquery all": lambda: filters.filter_by_relation(
+        filters.filter_by_relation(base, "tags", tags[:2], filters.MATCH_ALL),
+        "ingredients", ingredients[:1], filters.MATCH_ALL
+      ),
+    }
+
+    self.stdout.write(f"{'case':<18}{'rows':>8}{'unique':>8}{'all ms':>10}{'page ms':>10}")
+    for name, build in cases.items():
+      elapsed, ids = timed(
+        lambda: list(build().values_list("id", flat=True)), repeat
+      )
+      page_elapsed, _ = timed(
+        lambda: list(build().order_by("id")[:50].values_list("id", flat=True)),
+        repeat
+      )
+      self.stdout.write(
+        f"{name:<18}{len(ids):>8}{len(set(ids)):>8}"
+        f"{elapsed:>10.1f}{page_elapsed:>10.1f}"
+      )
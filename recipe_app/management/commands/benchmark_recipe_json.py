@@ -0,0 +1,81 @@
+import io
+
+from django.core.management.base import BaseCommand
+
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from app_core.models import Recipe
+from app_core.parsers import FastJSONParser
+from app_core.renderers import FastJSONRenderer, orjson
+from recipe_app import serializers
+from recipe_app.management.commands._benchmark import (
+  run_rolled_back, seed_recipes, timed
+)
+from recipe_app.views import RECIPE_LIST_FIELDS
+
+
+class Command(BaseCommand):
+  """ Comparar el JSON de DRF con el de orjson sobre el listado de recetas """
+
+  help = "Benchmark JSON rendering and parsing of recipe list payloads."
+
+  def add_arguments(self, parser):
+    parser.add_argument(
+      "--sizes",
+      type=int,
+      nargs="+",
+      default=[100, 1000, 10000]
+    )
+    parser.add_argument("--repeat", type=int, default=5)
+
+  def handle(self, *args, **options):
+    if orjson is None:
+      self.stderr.write("orjson is not installed: both paths use json")
+
+    run_rolled_back(lambda: self._run(options["sizes"], options["repeat"]))
+
+  def _run(self, sizes, repeat):
+    self.stdout.write(f"Seeding {max(sizes)} recipes...")
+    user, _, _ = seed_recipes(max(sizes))
+    request = Request(APIRequestFactory().get("/"))
+    rows = Recipe.objects.filter(user=user).order_by("id").values(
+      *RECIPE_LIST_FIELDS
+    )
+
+    cases = (
+      ("drf", JSONRenderer(), JSONParser()),
+      ("fast", FastJSONRenderer(), FastJSONParser()),
+    )
+
+    self.stdout.write(
+      f"{'recipes':>8}{'renderer':>10}{'KB':>8}{'render ms':>11}{'parse ms':>10}"
+    )
+    for size in sizes:
+      payload = {
+        "next": None,
+        "previous": None,
+        "results": serializers.RecipeRowSerializer(
+          rows[:size],
+          many=True,
+          context={"request": request}
+        ).data,
+      }
+      bodies = set()
+
+      for name, renderer, parser in cases:
+        render_elapsed, body = timed(lambda: renderer.render(payload), repeat)
+        parse_elapsed, _ = timed(
+          lambda: parser.parse(io.BytesIO(body)),
+          repeat
+        )
+        bodies.add(body)
+        self.stdout.write(
+          f"{size:>8}{name:>10}{len(body) / 1024:>8.0f}"
+          f"{render_elapsed:>11.2f}{parse_elapsed:>10.2f}"
+        )
+
+      if len(bodies) != 1:
+        self.stderr.write(f"{size}: responses differ")
@@ -0,0 +1,47 @@
+from django.core.management.base import BaseCommand
+
+from app_core.models import Recipe
+from recipe_app import search
+from recipe_app.management.commands._benchmark import (
+  run_rolled_back, seed_recipes, timed
+)
+
+
+class Command(BaseCommand):
+  """ Medir la busqueda de texto completo sobre un dataset sembrado """
+
+  help = "Benchmark ranked recipe search on a seeded dataset."
+
+  def add_arguments(self, parser):
+    parser.add_argument("--recipes", type=int, default=100000)
+    parser.add_argument("--repeat", type=int, default=5)
+
+  def handle(self, *args, **options):
+    run_rolled_back(lambda: self._run(options["recipes"], options["repeat"]))
+
+  def _run(self, recipes, repeat):
+    self.stdout.write(f"Seeding {recipes} recipes...")
+    user, _, _ = seed_recipes(recipes)
+    # seed_recipes usa bulk_create: no hay señales que indexen
+    elapsed, _ = timed(search.rebuild_index, 1)
+    self.stdout.write(f"Index rebuilt in {elapsed:.0f} ms")
+
+    base = Recipe.objects.filter(user=user)
+    queries = {
+      "exact title": f"recipe {recipes // 2}",
+      "prefix": f"{recipes // 3}"[:3],
+      "tag name": "tag 7",
+      "ingredient": "ingredient 42",
+    }
+
+    self.stdout.write(f"{'case':<14}{'query':<20}{'rows':>8}{'page ms':>10}")
+    for name, query in queries.items():
+      results = search.search_recipes(base, query)
+      rows = results.count()
+      page_elapsed, _ = timed(
+        lambda: list(
+          results.order_by(*search.RANK_ORDERING)[:50].values_list("id", flat=True)
+        ),
+        repeat
+      )
+      self.stdout.write(f"{name:<14}{query:<20}{rows:>8}{page_elapsed:>10.1f}")
@@ -0,0 +1,78 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Prefetch
+
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from app_core.models import Ingredient, Recipe, Tag
+from recipe_app import serializers
+from recipe_app.management.commands._benchmark import (
+  run_rolled_back, seed_recipes, timed
+)
+from recipe_app.views import RECIPE_LIST_FIELDS
+
+
+class Command(BaseCommand):
+  """ Comparar el serializador de modelo con el de filas en el listado """
+
+  help = "Benchmark model vs row serializers for recipe list responses."
+
+  def add_arguments(self, parser):
+    parser.add_argument(
+      "--sizes",
+      type=int,
+      nargs="+",
+      default=[100, 1000, 10000]
+    )
+    parser.add_argument("--repeat", type=int, default=5)
+
+  def handle(self, *args, **options):
+    run_rolled_back(lambda: self._run(options["sizes"], options["repeat"]))
+
+  def _run(self, sizes, repeat):
+    self.stdout.write(f"Seeding {max(sizes)} recipes...")
+    user, _, _ = seed_recipes(max(sizes))
+    request = Request(APIRequestFactory().get("/"))
+    renderer = JSONRenderer()
+
+    base = Recipe.objects.filter(user=user).order_by("id")
+
+    def model_path(size):
+      queryset = base.only(*RECIPE_LIST_FIELDS).prefetch_related(
+        Prefetch("tags", queryset=Tag.objects.only("id").order_by("id")),
+        Prefetch(
+          "ingredients",
+          queryset=Ingredient.objects.only("id").order_by("id")
+        ),
+      )[:size]
+      return renderer.render(serializers.RecipeSerializer(
+        queryset,
+        many=True,
+        context={"request": request}
+      ).data)
+
+    def row_path(size):
+      rows = base.values(*RECIPE_LIST_FIELDS)[:size]
+      return renderer.render(serializers.RecipeRowSerializer(
+        rows,
+        many=True,
+        context={"request": request}
+      ).data)
+
+    self.stdout.write(
+      f"{'recipes':>8}{'model ms':>10}{'rows ms':>10}"
+      f"{'model/s':>10}{'rows/s':>10}{'speedup':>9}"
+    )
+    for size in sizes:
+      model_elapsed, model_body = timed(lambda: model_path(size), repeat)
+      row_elapsed, row_body = timed(lambda: row_path(size), repeat)
+      if model_body != row_body:
+        self.stderr.write(f"{size}: responses differ")
+
+      self.stdout.write(
+        f"{size:>8}{model_elapsed:>10.1f}{row_elapsed:>10.1f}"
+        f"{size / model_elapsed * 1000:>10.0f}"
+        f"{size / row_elapsed * 1000:>10.0f}"
+        f"{model_elapsed / row_elapsed:>8.1f}x"
+      )
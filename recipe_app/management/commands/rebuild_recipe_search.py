@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from recipe_app import search
+
+
+class Command(BaseCommand):
+  """ Reconstruir el indice de busqueda de recetas """
+
+  help = "Rebuild the full-text search index for every recipe."
+
+  def handle(self, *args, **options):
+    search.rebuild_index()
+    self.stdout.write(self.style.SUCCESS("Recipe search index rebuilt."))
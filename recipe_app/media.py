@@ -0,0 +1,165 @@
+import mimetypes
+import os
+import re
+from urllib.parse import quote
+
+from django.conf import settings
+from django.db.models import Q
+from django.http import FileResponse, Http404, HttpResponse
+
+from app_core.models import Recipe
+from recipe_app import images
+
+
+# Los nombres son el hash del contenido (ContentAddressedStorage): nunca cambian
+CACHE_CONTROL = "private, max-age=31536000, immutable"
+
+RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+class RangeNotSatisfiable(Exception):
+  pass
+
+
+def owned_recipe(user, name):
+  """ Receta de ``user`` a la que pertenece ``name`` (original o version)
+
+  Las versiones se nombran a partir del original (``rendition_name``), asi
+  que una sola query por prefijo las encuentra; el nombre exacto se
+  comprueba despues contra la receta.
+  """
+
+  candidates = Q(image=name)
+  root, _ = os.path.splitext(name)
+
+  for key in images.RENDITIONS:
+    suffix = f"_{key}"
+    if root.endswith(suffix):
+      candidates |= Q(image__startswith=f"{root[:-len(suffix)]}.")
+
+  recipes = Recipe.objects.filter(candidates, user=user).only(
+    "image", "image_renditions"
+  )
+
+  for recipe in recipes:
+    if name == recipe.image.name or name in recipe.image_renditions.values():
+      return recipe
+
+  raise Http404
+
+
+def parse_range(header, size):
+  """ Rango ``(inicio, fin)`` pedido, o None para enviar el archivo entero
+
+  Solo se atienden rangos simples; los multiples se ignoran (RFC 9110).
+  """
+
+  match = RANGE_RE.match(header or "")
+  if match is None:
+    return None
+
+  start, end = match.groups()
+  if not start and not end:
+    return None
+
+  if not start:
+    # Sufijo: los ultimos N bytes
+    start, end = max(size - int(end), 0), size - 1
+  else:
+    start, end = int(start), min(int(end) if end else size - 1, size - 1)
+
+  if start >= size or start > end:
+    raise RangeNotSatisfiable()
+
+  return start, end
+
+
+class FileRange:
+  """ Lectura limitada a ``length`` bytes desde la posicion actual
+
+  Sin ``fileno``: el servidor WSGI no puede usar sendfile sobre el archivo
+  completo y enviar bytes fuera del rango.
+  """
+
+  def __init__(self, file, length):
+    self.file = file
+    self.remaining = length
+
+  def read(self, size=-1):
+    if size < 0 or size > self.remaining:
+      size = self.remaining
+
+    data = self.file.read(size)
+    self.remaining -= len(data)
+    return data
+
+  def close(self):
+    self.file.close()
+
+
+def file_response(request, name, content_type):
+  """ Respuesta servida por Django, con soporte de Range """
+
+  storage = images.get_storage()
+
+  try:
+    file = storage.open(name)
+  except FileNotFoundError:
+    raise Http404
+
+  size = file.size
+
+  try:
+    byte_range = parse_range(request.META.get("HTTP_RANGE"), size)
+  except RangeNotSatisfiable:
+    file.close()
+    response = HttpResponse(status=416)
+    response["Content-Range"] = f"bytes */{size}"
+    return response
+
+  if byte_range is None:
+    # Archivo completo: con fileno el servidor puede usar sendfile
+    response = FileResponse(file, content_type=content_type)
+  else:
+    start, end = byte_range
+    file.seek(start)
+    response = FileResponse(
+      FileRange(file, end - start + 1),
+      content_type=content_type,
+      status=206
+    )
+    response["Content-Range"] = f"bytes {start}-{end}/{size}"
+    response["Content-Length"] = end - start + 1
+
+  response["Accept-Ranges"] = "bytes"
+  return response
+
+
+def serve(request, name):
+  """ Servir ``name`` delegando la transferencia al proxy si esta configurado
+
+  ``MEDIA_SENDFILE_BACKEND``:
+
+  * ``"x-accel-redirect"``: nginx sirve ``MEDIA_ACCEL_REDIRECT_PREFIX + name``
+    desde una location ``internal``.
+  * ``"x-sendfile"``: Apache/lighttpd sirven la ruta absoluta del archivo.
+  * ``None``: Django envia el archivo (``FileResponse``).
+  """
+
+  backend = getattr(settings, "MEDIA_SENDFILE_BACKEND", None)
+  content_type = mimetypes.guess_type(name)[0] or "application/octet-stream"
+
+  if backend == "x-accel-redirect":
+    response = HttpResponse(content_type=content_type)
+    prefix = getattr(settings, "MEDIA_ACCEL_REDIRECT_PREFIX", "/protected-media/")
+    response["X-Accel-Redirect"] = quote(f"{prefix}{name}")
+  elif backend == "x-sendfile":
+    response = HttpResponse(content_type=content_type)
+    response["X-Sendfile"] = images.get_storage().path(name)
+  else:
+    response = file_response(request, name, content_type)
+
+  if response.status_code in (200, 206):
+    response["Cache-Control"] = CACHE_CONTROL
+
+  return response
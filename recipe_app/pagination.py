@@ -0,0 +1,232 @@
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from collections import OrderedDict
+
+from asgiref.sync import sync_to_async
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class RecipeAppPagination(PageNumberPagination):
+  """ Paginacion por keyset (cursor) con modo offset para numeros de pagina
+
+  Por defecto pagina por keyset sobre ``view.keyset_ordering``: cada pagina
+  filtra a partir de la ultima posicion vista, asi que una pagina profunda
+  cuesta lo mismo que la primera. Si la peticion incluye ``page`` se usa la
+  paginacion por numero de pagina de DRF, igual que cuando la vista no tiene
+  orden keyset para la peticion (``get_keyset_ordering()`` retorna None).
+  """
+
+  page_size = 50
+  page_size_query_param = "page_size"
+  max_page_size = 200
+  cursor_query_param = "cursor"
+  ordering = ("id", )
+  invalid_cursor_message = "Invalid cursor"
+
+  def paginate_queryset(self, queryset, request, view=None):
+    """ Elegir modo offset o keyset segun los parametros """
+
+    if self.use_offset(request, view):
+      return super().paginate_queryset(queryset, request, view)
+
+    queryset = self.get_keyset_queryset(queryset, request, view)
+    return self.get_keyset_page(list(queryset))
+
+  async def apaginate_queryset(self, queryset, request, view=None):
+    """ ``paginate_queryset`` con lectura async de la pagina keyset
+
+    El modo offset usa el ``Paginator`` de Django (COUNT y slice sincronos)
+    y se ejecuta en un hilo.
+    """
+
+    if self.use_offset(request, view):
+      paginate = super().paginate_queryset
+      return await sync_to_async(paginate)(queryset, request, view)
+
+    queryset = self.get_keyset_queryset(queryset, request, view)
+    return self.get_keyset_page([row async for row in queryset])
+
+  def use_offset(self, request, view):
+    """ Si la peticion pagina por numero de pagina """
+
+    self.keyset_ordering = self.get_keyset_ordering(view)
+    self.offset_mode = (
+      self.keyset_ordering is None
+      or self.page_query_param in request.query_params
+    )
+    return self.offset_mode
+
+  def get_keyset_queryset(self, queryset, request, view):
+    """ Queryset de la pagina keyset: una fila de mas para saber si sigue """
+
+    self.request = request
+    self.page_size = self.get_page_size(request)
+    self.keyset_ordering = tuple(self.keyset_ordering)
+    self.model = queryset.model
+
+    self.position, self.reverse = self.decode_cursor(request)
+    ordering = self.keyset_ordering
+    if self.reverse:
+      ordering = tuple(self._invert(term) for term in ordering)
+
+    queryset = queryset.order_by(*ordering)
+    if self.position is not None:
+      queryset = queryset.filter(self._after(ordering, self.position))
+
+    return queryset[:self.page_size + 1]
+
+  def get_keyset_page(self, results):
+    """ Recortar la pagina leida y fijar los enlaces disponibles """
+
+    has_more = len(results) > self.page_size
+    results = results[:self.page_size]
+
+    if self.reverse:
+      results.reverse()
+      self.has_next = self.position is not None
+      self.has_previous = has_more
+    else:
+      self.has_next = has_more
+      self.has_previous = self.position is not None
+
+    self.results = results
+    return results
+
+  def get_keyset_ordering(self, view):
+    """ Orden keyset de la vista para esta peticion """
+
+    if hasattr(view, "get_keyset_ordering"):
+      return view.get_keyset_ordering()
+
+    return getattr(view, "keyset_ordering", self.ordering)
+
+  def get_paginated_response(self, data):
+    """ Respuesta con enlaces next/previous """
+
+    if self.offset_mode:
+      return super().get_paginated_response(data)
+
+    return Response(OrderedDict([
+      ("next", self.get_next_link()),
+      ("previous", self.get_previous_link()),
+      ("results", data),
+    ]))
+
+  def get_paginated_response_schema(self, schema):
+    if getattr(self, "offset_mode", False):
+      return super().get_paginated_response_schema(schema)
+
+    return {
+      "type": "object",
+      "properties": {
+        "next": {"type": "string", "nullable": True, "format": "uri"},
+        "previous": {"type": "string", "nullable": True, "format": "uri"},
+        "results": schema,
+      },
+    }
+
+  def get_next_link(self):
+    if self.offset_mode:
+      return super().get_next_link()
+
+    if not self.has_next or not self.results:
+      return None
+
+    return self._link(self.results[-1], reverse=False)
+
+  def get_previous_link(self):
+    if self.offset_mode:
+      return super().get_previous_link()
+
+    if not self.has_previous or not self.results:
+      return None
+
+    return self._link(self.results[0], reverse=True)
+
+  def decode_cursor(self, request):
+    """ Retornar posicion y direccion del cursor de la peticion """
+
+    encoded = request.query_params.get(self.cursor_query_param)
+    if not encoded:
+      return None, False
+
+    try:
+      payload = json.loads(urlsafe_b64decode(encoded.encode("ascii")))
+      position = payload["p"]
+      reverse = bool(payload.get("r", False))
+      if len(position) != len(self.keyset_ordering):
+        raise ValueError(position)
+      position = [
+        self._field(term).to_python(value)
+        for term, value in zip(self.keyset_ordering, position)
+      ]
+    except (TypeError, ValueError, KeyError, ValidationError):
+      raise NotFound(self.invalid_cursor_message)
+
+    return position, reverse
+
+  def encode_cursor(self, position, reverse):
+    """ Codificar posicion en un cursor opaco """
+
+    payload = {"p": [str(value) for value in position]}
+    if reverse:
+      payload["r"] = 1
+
+    data = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return urlsafe_b64encode(data).decode("ascii")
+
+  def get_position(self, item):
+    """ Valores de ordenamiento de un objeto o fila ``values()`` """
+
+    names = [term.lstrip("-") for term in self.keyset_ordering]
+    if isinstance(item, dict):
+      return [item[name] for name in names]
+
+    return [getattr(item, name) for name in names]
+
+  def _link(self, item, reverse):
+    url = self.request.build_absolute_uri()
+    url = remove_query_param(url, self.page_query_param)
+    cursor = self.encode_cursor(self.get_position(item), reverse)
+    return replace_query_param(url, self.cursor_query_param, cursor)
+
+  def _field(self, term):
+    name = term.lstrip("-")
+    if name == "pk":
+      return self.model._meta.pk
+
+    return self.model._meta.get_field(name)
+
+  @staticmethod
+  def _invert(term):
+    return term[1:] if term.startswith("-") else f"-{term}"
+
+  @staticmethod
+  def _after(ordering, position):
+    """ Condicion keyset: filas estrictamente despues de ``position``
+
+    Ademas del OR por columnas incluye una cota sobre la primera columna
+    (``>=`` o ``<=``), que el motor puede usar para empezar la lectura del
+    indice en la posicion del cursor en vez de filtrar desde el principio.
+    """
+
+    condition = Q()
+    for index, term in enumerate(ordering):
+      name = term.lstrip("-")
+      lookup = "lt" if term.startswith("-") else "gt"
+      clause = Q(**{f"{name}__{lookup}": position[index]})
+      for previous, value in zip(ordering[:index], position[:index]):
+        clause &= Q(**{previous.lstrip("-"): value})
+      condition |= clause
+
+    if len(ordering) > 1:
+      first = ordering[0]
+      lookup = "lte" if first.startswith("-") else "gte"
+      condition &= Q(**{f"{first.lstrip('-')}__{lookup}": position[0]})
+
+    return condition
@@ -0,0 +1,225 @@
+import re
+from collections import defaultdict
+
+from django.db import connection, transaction
+from django.db.models import IntegerField, Q, Value
+
+from app_core.models import Recipe
+
+
+SEARCH_TABLE = "app_core_recipe_search"
+MAX_TERMS = 10
+RANK_ORDERING = ("-search_rank", "id")
+BATCH_SIZE = 500
+
+
+def get_terms(query):
+  """ Palabras de la busqueda; se descarta cualquier sintaxis del motor """
+
+  return re.findall(r"\w+", (query or "").lower())[:MAX_TERMS]
+
+
+class SqliteBackend:
+  """ Indice FTS5: ``rowid`` es el id de la receta """
+
+  def match_query(self, terms):
+    # Prefijo en cada termino, todos obligatorios
+    return " ".join(f'"{term}"*' for term in terms)
+
+  def join(self, match):
+    """ Argumentos de ``extra()``: JOIN con el indice, filtro y ranking """
+
+    # El "+" impide buscar en el indice por rowid: asi SQLite no puede
+    # recorrer las recetas del usuario y repetir el MATCH para cada una, y
+    # usa el indice como tabla externa del JOIN
+    return {
+      "tables": [SEARCH_TABLE],
+      "where": [
+        f"+{SEARCH_TABLE}.rowid = {Recipe._meta.db_table}.id",
+        f"{SEARCH_TABLE} MATCH %s",
+      ],
+      "params": [match],
+      # bm25 es menor cuanto mejor: se invierte para ordenar de mayor a menor
+      "select": {"search_rank": f"-bm25({SEARCH_TABLE}, 10.0, 4.0, 2.0, 2.0)"},
+      "select_params": [],
+    }
+
+  def remove(self, cursor, recipe_ids):
+    cursor.executemany(
+      f"DELETE FROM {SEARCH_TABLE} WHERE rowid = %s",
+      [(pk, ) for pk in recipe_ids]
+    )
+
+  def clear(self, cursor):
+    cursor.execute(f"DELETE FROM {SEARCH_TABLE}")
+
+  def write(self, cursor, documents):
+    self.remove(cursor, [document[0] for document in documents])
+    self.insert(cursor, documents)
+
+  def insert(self, cursor, documents):
+    cursor.executemany(
+      f"INSERT INTO {SEARCH_TABLE} (rowid, title, name, tags, ingredients) "
+      f"VALUES (%s, %s, %s, %s, %s)",
+      documents
+    )
+
+
+class PostgresBackend:
+  """ Tabla con ``tsvector`` ponderado e indice GIN """
+
+  def match_query(self, terms):
+    return " & ".join(f"{term}:*" for term in terms)
+
+  def join(self, match):
+    return {
+      "tables": [SEARCH_TABLE],
+      "where": [
+        f"{SEARCH_TABLE}.recipe_id = {Recipe._meta.db_table}.id",
+        f"{SEARCH_TABLE}.document @@ to_tsquery('simple', %s)",
+      ],
+      "params": [match],
+      "select": {
+        "search_rank": (
+          f"ts_rank({SEARCH_TABLE}.document, to_tsquery('simple', %s))"
+        ),
+      },
+      "select_params": [match],
+    }
+
+  def remove(self, cursor, recipe_ids):
+    cursor.execute(
+      f"DELETE FROM {SEARCH_TABLE} WHERE recipe_id = ANY(%s)",
+      [list(recipe_ids)]
+    )
+
+  def clear(self, cursor):
+    cursor.execute(f"TRUNCATE {SEARCH_TABLE}")
+
+  def write(self, cursor, documents):
+    self.insert(cursor, documents)
+
+  def insert(self, cursor, documents):
+    cursor.executemany(
+      f"INSERT INTO {SEARCH_TABLE} (recipe_id, document) VALUES (%s, "
+      "setweight(to_tsvector('simple', %s), 'A') || "
+      "setweight(to_tsvector('simple', %s), 'B') || "
+      "setweight(to_tsvector('simple', %s), 'C') || "
+      "setweight(to_tsvector('simple', %s), 'C')) "
+      "ON CONFLICT (recipe_id) DO UPDATE SET document = EXCLUDED.document",
+      documents
+    )
+
+
+BACKENDS = {
+  "sqlite": SqliteBackend,
+  "postgresql": PostgresBackend,
+}
+
+
+def get_backend():
+  """ Backend del motor actual, o None si no tiene indice de busqueda """
+
+  backend = BACKENDS.get(connection.vendor)
+  return backend() if backend is not None else None
+
+
+def search_recipes(queryset, query):
+  """ Filtrar por ``query`` y anotar ``search_rank`` (mayor es mejor)
+
+  Sin indice para el motor actual se cae a ``icontains`` sobre el titulo,
+  con el mismo ranking para todas las filas.
+  """
+
+  terms = get_terms(query)
+  backend = get_backend()
+
+  if not terms or backend is None:
+    condition = Q(pk__in=[]) if not terms else Q()
+    for term in terms:
+      condition &= Q(title__icontains=term)
+    return queryset.filter(condition).annotate(
+      search_rank=Value(0, output_field=IntegerField())
+    )
+
+  # JOIN con el indice: el motor recorre las coincidencias una sola vez y
+  # calcula el ranking en la misma pasada (un subquery correlado por fila
+  # repetiria la busqueda para cada receta)
+  return queryset.extra(**backend.join(backend.match_query(terms)))
+
+
+def documents(recipe_ids):
+  """ Filas ``(id, title, name, tags, ingredients)`` para indexar """
+
+  names = {relation: defaultdict(list) for relation in ("tags", "ingredients")}
+
+  for relation, by_recipe in names.items():
+    field = Recipe._meta.get_field(relation)
+    through = field.remote_field.through
+    related = field.m2m_reverse_field_name()
+    rows = through.objects.filter(recipe_id__in=recipe_ids).values_list(
+      "recipe_id", f"{related}__name"
+    )
+    for recipe_id, name in rows:
+      by_recipe[recipe_id].append(name)
+
+  recipes = Recipe.objects.filter(id__in=recipe_ids).values_list(
+    "id", "title", "name"
+  )
+
+  return [
+    (
+      pk,
+      title,
+      name,
+      " ".join(names["tags"][pk]),
+      " ".join(names["ingredients"][pk]),
+    )
+    for pk, title, name in recipes
+  ]
+
+
+def index_recipes(recipe_ids):
+  """ Reindexar recetas; las que ya no existen se quitan del indice """
+
+  backend = get_backend()
+  recipe_ids = list(set(recipe_ids))
+  if backend is None or not recipe_ids:
+    return
+
+  with connection.cursor() as cursor:
+    for start in range(0, len(recipe_ids), BATCH_SIZE):
+      batch = recipe_ids[start:start + BATCH_SIZE]
+      rows = documents(batch)
+      found = {row[0] for row in rows}
+      backend.remove(cursor, [pk for pk in batch if pk not in found])
+      if rows:
+        backend.write(cursor, rows)
+
+
+def remove_recipes(recipe_ids):
+  """ Quitar recetas del indice """
+
+  backend = get_backend()
+  if backend is None or not recipe_ids:
+    return
+
+  with connection.cursor() as cursor:
+    backend.remove(cursor, list(recipe_ids))
+
+
+def rebuild_index():
+  """ Vaciar el indice y reindexar todas las recetas por lotes """
+
+  backend = get_backend()
+  if backend is None:
+    return
+
+  ids = Recipe.objects.order_by("id").values_list("id", flat=True)
+
+  with transaction.atomic(), connection.cursor() as cursor:
+    backend.clear(cursor)
+    batch = list(ids[:BATCH_SIZE])
+    while batch:
+      backend.insert(cursor, documents(batch))
+      batch = list(ids.filter(id__gt=batch[-1])[:BATCH_SIZE])
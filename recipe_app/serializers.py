@@ -1,35 +1,108 @@
+from collections import defaultdict
+from operator import itemgetter
+
+from django.db import transaction
 from rest_framework import serializers
+from rest_framework.permissions import SAFE_METHODS
 
 from  app_core.models import Tag, Ingredient, Recipe
+from recipe_app import bulk, filters, images
+from recipe_app.fields import UserPrimaryKeyRelatedField
+
+
+class SparseFieldsMixin:
+  """ Respuestas con ``fields=`` / ``expand=`` de la peticion
+
+  ``fields`` limita los campos emitidos (``id`` siempre se incluye) y
+  ``expand`` elige que relaciones de ``expandable`` se anidan como objetos
+  en vez de IDs; sin ``expand`` se usan las de ``default_expand``. Solo
+  aplica en lecturas y al serializador raiz: los anidados se emiten enteros.
+  La vista usa ``get_selection()`` para leer solo las columnas necesarias.
+  """
+
+  expandable = {}
+  default_expand = ()
+
+  @classmethod
+  def get_selection(cls, request=None):
+    """ Retornar (campos emitidos, relaciones expandidas) para ``request`` """
+
+    declared = list(cls.Meta.fields)
+    if request is None or request.method not in SAFE_METHODS:
+      return declared, set(cls.default_expand)
+
+    params = request.query_params
+    requested = filters.parse_names(params, "fields")
+    expand = filters.parse_names(params, "expand")
+
+    if requested is not None:
+      unknown = sorted(set(requested) - set(declared))
+      if unknown:
+        raise serializers.ValidationError(
+          {"fields": [f'Unknown field "{name}".' for name in unknown]}
+        )
+      declared = [name for name in declared if name == "id" or name in requested]
+
+    if expand is None:
+      expand = cls.default_expand
+    unknown = sorted(set(expand) - set(cls.expandable))
+    if unknown:
+      raise serializers.ValidationError(
+        {"expand": [f'Cannot expand "{name}".' for name in unknown]}
+      )
+
+    return declared, set(expand) & set(declared)
+
+  def get_fields(self):
+    fields = super().get_fields()
+
+    root = self.parent if isinstance(self.parent, serializers.ListSerializer) else self
+    if root.parent is not None:
+      return fields
+
+    selected, expand = self.get_selection(self.context.get("request"))
+    for name in expand:
+      fields[name] = self.expandable[name](many=True, read_only=True)
+
+    return {name: fields[name] for name in selected}
 
 
 class TagSerializer(serializers.ModelSerializer):
   """ Serializador para objeto de tag """
 
+  usage = serializers.IntegerField(read_only=True)
+
   class Meta:
     model = Tag
-    fields = ("id", "name")
+    fields = ("id", "name", "usage")
     read_only_fields = ("id",)
 
 
 class IngredientSerializer(serializers.ModelSerializer):
     """ Serializador para objeto de ingrediente """
 
+    usage = serializers.IntegerField(read_only=True)
+
     class Meta:
       model = Ingredient
-      fields = ("id", "name")
+      fields = ("id", "name", "usage")
       read_only_fields = ("id", )
 
 
-class RecipeSerializer(serializers.ModelSerializer):
+class RecipeSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """ Serializador para recetas """
 
-    ingredients = serializers.PrimaryKeyRelatedField(
+    expandable = {
+      "tags": TagSerializer,
+      "ingredients": IngredientSerializer,
+    }
+
+    ingredients = UserPrimaryKeyRelatedField(
       many=True,
       queryset=Ingredient.objects.all()
     )
 
-    tags = serializers.PrimaryKeyRelatedField(
+    tags = UserPrimaryKeyRelatedField(
       many=True,
       queryset=Tag.objects.all()
     )
@@ -40,16 +113,312 @@ class RecipeSerializer(serializers.ModelSerializer):
       read_only_fields = ("id", )
 
 
-class RecipeDetailSerializer(RecipeSerializer):
+class RenditionsMixin(serializers.Serializer):
+  """ URLs de las versiones procesadas de la imagen """
+
+  image_renditions = serializers.SerializerMethodField()
+
+  def get_image_renditions(self, obj):
+    return images.rendition_urls(
+      obj.image_renditions,
+      self.context.get("request")
+    )
+
+
+class RecipeDetailSerializer(RenditionsMixin, RecipeSerializer):
   """ Serializa detalles de la receta """
-  
-  ingredients = IngredientSerializer(many=True, read_only=True)
-  tags = TagSerializer(many=True, read_only= True)
 
+  # El detalle anida tags e ingredientes salvo que ``expand`` diga otra cosa
+  default_expand = ("tags", "ingredients")
+
+  class Meta(RecipeSerializer.Meta):
+    fields = RecipeSerializer.Meta.fields + ("image_renditions", )
+
+
+class RecipeRowListSerializer(serializers.ListSerializer):
+  """ Pagina de filas: las relaciones se leen una vez para todas """
+
+  def to_representation(self, data):
+    rows = list(data)
+    # Ya leidas si la vista async llamo a ``aload_relations``
+    if self.child.relations is None:
+      self.child.load_relations(rows)
+
+    return [self.child.to_representation(row) for row in rows]
+
+
+class RecipeRowSerializer(serializers.BaseSerializer):
+  """ Lectura rapida de recetas desde filas ``values()``
+
+  Emite el mismo JSON que ``model_serializer_class`` (mismos campos, orden y
+  formato, incluido ``fields=`` / ``expand=``) sin pasar por los campos de
+  DRF fila por fila: las columnas salen tal cual de la fila, salvo las que
+  necesitan formato (decimales, metodos ``get_<campo>(row)``), y los IDs de
+  tags e ingredientes se agrupan por receta con una query por relacion.
+  Solo lectura: las escrituras siguen usando el serializador de modelo.
+  """
+
+  model_serializer_class = RecipeSerializer
+  # Campos cuyo valor en la fila ya es su representacion JSON
+  passthrough_fields = (
+    serializers.CharField,
+    serializers.IntegerField,
+    serializers.BooleanField,
+  )
+
+  class Meta:
+    list_serializer_class = RecipeRowListSerializer
+
+  def __init__(self, *args, **kwargs):
+    super().__init__(*args, **kwargs)
+    self.relations = None
+
+  @classmethod
+  def get_selection(cls, request=None):
+    return cls.model_serializer_class.get_selection(request)
+
+  def get_representers(self):
+    """ Retornar [(campo, funcion(fila))]; la funcion es None en relaciones """
+
+    fields = self.model_serializer_class(context=self.context).fields
+    representers = []
+
+    for name, field in fields.items():
+      if name in RecipeSerializer.expandable:
+        representer = None
+      elif isinstance(field, serializers.SerializerMethodField):
+        representer = getattr(self, f"get_{name}")
+      elif isinstance(field, self.passthrough_fields):
+        representer = itemgetter(name)
+      else:
+        representer = self._formatter(name, field)
+      representers.append((name, representer))
+
+    return representers
+
+  def load_relations(self, rows):
+    """ Agrupar por receta los tags/ingredientes de ``rows`` """
+
+    self.relations = {
+      name: self._group(links, expanded)
+      for name, links, expanded in self._relation_links(rows)
+    }
+
+  async def aload_relations(self, rows):
+    """ ``load_relations`` con el ORM async """
+
+    self.relations = {}
+    for name, links, expanded in self._relation_links(rows):
+      self.relations[name] = self._group([link async for link in links], expanded)
+
+  def _relation_links(self, rows):
+    """ (relacion, query de enlaces, expandida) por cada relacion emitida """
+
+    _, expand = self.get_selection(self.context.get("request"))
+    # ``expand`` del contexto se suma al de la peticion (export CSV por nombre)
+    expand = expand | set(self.context.get("expand", ()))
+    self.representers = self.get_representers()
+    ids = [row["id"] for row in rows]
+
+    for name, representer in self.representers:
+      if representer is not None:
+        continue
 
-class RecipeImageSerializer(serializers.ModelSerializer):
+      through, column = filters.get_through(name)
+      links = through.objects.filter(recipe_id__in=ids).order_by(column)
+
+      if name in expand:
+        # Mismas claves que el serializador anidado sin ``usage`` anotado
+        name_lookup = f"{column.removesuffix('_id')}__name"
+        yield name, links.values_list("recipe_id", column, name_lookup), True
+      else:
+        yield name, links.values_list("recipe_id", column), False
+
+  @staticmethod
+  def _group(links, expanded):
+    by_recipe = defaultdict(list)
+
+    if expanded:
+      for recipe_id, pk, value in links:
+        by_recipe[recipe_id].append({"id": pk, "name": value})
+    else:
+      for recipe_id, pk in links:
+        by_recipe[recipe_id].append(pk)
+
+    return by_recipe
+
+  def to_representation(self, row):
+    if self.relations is None:
+      self.load_relations([row])
+
+    return {
+      name: (
+        self.relations[name].get(row["id"], [])
+        if representer is None
+        else representer(row)
+      )
+      for name, representer in self.representers
+    }
+
+  @staticmethod
+  def _formatter(name, field):
+    def represent(row):
+      value = row[name]
+      return None if value is None else field.to_representation(value)
+
+    return represent
+
+
+class RecipeDetailRowSerializer(RecipeRowSerializer):
+  """ Detalle de receta desde una fila ``values()`` """
+
+  model_serializer_class = RecipeDetailSerializer
+
+  def get_image_renditions(self, row):
+    return images.rendition_urls(
+      row["image_renditions"],
+      self.context.get("request")
+    )
+
+
+class RecipeImageSerializer(RenditionsMixin, serializers.ModelSerializer):
   """ Serializa imagenes """
   class Meta:
     model = Recipe
-    fields = ("id", "image")
-    read_only_fields = ("id", ) 
\ No newline at end of file
+    fields = ("id", "image", "image_renditions")
+    read_only_fields = ("id", )
+
+  def validate_image(self, value):
+    """ Rechazar la imagen si supera la cuota de bytes del usuario """
+
+    if value is not None and value.size > images.remaining_quota(
+      self.instance.user, exclude=self.instance
+    ):
+      raise serializers.ValidationError("Image storage quota exceeded.")
+
+    return value
+
+  def update(self, instance, validated_data):
+    """ Guardar el original y encolar el procesado de versiones """
+
+    image = validated_data.get("image")
+    instance.image_bytes = image.size if image is not None else 0
+    instance.image_renditions = {}
+    instance = super().update(instance, validated_data)
+    # Sin imagen (se quito con null) no hay versiones que procesar
+    if instance.image:
+      images.schedule_renditions(instance)
+
+    return instance
+
+
+class RecipeBulkListSerializer(serializers.ListSerializer):
+  """ Valida y escribe una lista de recetas en bloque
+
+  Los IDs de tags e ingredientes de todos los elementos se resuelven con una
+  query por relacion y los errores se reportan por elemento, alineados con
+  la lista recibida.
+  """
+
+  def to_internal_value(self, data):
+    # Validacion conjunta aqui: los errores de validate() se envuelven en
+    # non_field_errors y perderian la alineacion por elemento
+    attrs = super().to_internal_value(data)
+    user = self.context["request"].user
+    errors = [{} for _ in attrs]
+
+    for relation in bulk.RELATED_MODELS:
+      # IDs repetidos enlazan una vez, como en la creacion individual
+      for item in attrs:
+        if relation in item:
+          item[relation] = list(dict.fromkeys(item[relation]))
+
+      requested = {pk for item in attrs for pk in item.get(relation, [])}
+      found = bulk.owned_ids(relation, user, requested)
+      for error, item in zip(errors, attrs):
+        missing = sorted(set(item.get(relation, [])) - found)
+        if missing:
+          error[relation] = [
+            f'Invalid pk "{pk}" - object does not exist.' for pk in missing
+          ]
+
+    if self.instance is not None:
+      ids = [item.get("id") for item in attrs]
+      self.instances_by_id = {
+        recipe.id: recipe for recipe in self.instance.filter(id__in=ids)
+      }
+      seen = set()
+      for error, pk in zip(errors, ids):
+        if pk not in self.instances_by_id:
+          error["id"] = [f'Invalid pk "{pk}" - object does not exist.']
+        elif pk in seen:
+          error["id"] = [f'Duplicate pk "{pk}" in the request.']
+        seen.add(pk)
+    else:
+      for item in attrs:
+        item.pop("id", None)
+
+    if any(errors):
+      raise serializers.ValidationError(errors)
+
+    return attrs
+
+  def create(self, validated_data):
+    with transaction.atomic():
+      return bulk.create_recipes(self.context["request"].user, validated_data)
+
+  def update(self, instance, validated_data):
+    instances = [
+      self.instances_by_id[item.pop("id")] for item in validated_data
+    ]
+    with transaction.atomic():
+      return bulk.update_recipes(
+        self.context["request"].user,
+        instances,
+        validated_data
+      )
+
+
+class RecipeBulkSerializer(serializers.ModelSerializer):
+  """ Receta dentro de una peticion en bloque (solo escritura) """
+
+  id = serializers.IntegerField(required=False)
+  ingredients = serializers.ListField(
+    child=serializers.IntegerField(),
+    required=False
+  )
+  tags = serializers.ListField(
+    child=serializers.IntegerField(),
+    required=False
+  )
+
+  class Meta:
+    model = Recipe
+    fields = RecipeSerializer.Meta.fields
+    list_serializer_class = RecipeBulkListSerializer
+
+
+class RecipeBulkDeleteSerializer(serializers.Serializer):
+  """ IDs de recetas a borrar en bloque """
+
+  ids = serializers.ListField(
+    child=serializers.IntegerField(),
+    allow_empty=False
+  )
+
+
+class RecipeImportSerializer(serializers.ModelSerializer):
+  """ Receta de un archivo de import: tags e ingredientes por nombre """
+
+  ingredients = serializers.ListField(
+    child=serializers.CharField(max_length=255),
+    required=False
+  )
+  tags = serializers.ListField(
+    child=serializers.CharField(max_length=255),
+    required=False
+  )
+
+  class Meta:
+    model = Recipe
+    fields = ("title", "ingredients", "tags", "time_minutes", "price", "link")
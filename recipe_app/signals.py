@@ -0,0 +1,151 @@
+from django.contrib.auth import get_user_model
+from django.db.models.signals import (
+  m2m_changed, post_delete, post_save, pre_delete, pre_save
+)
+from django.dispatch import receiver
+
+from app_core.models import Ingredient, Recipe, Tag
+from app_core.signals import RELATIONS, recipe_ids, recipes_bulk_changed
+from recipe_app import images, search
+from recipe_app.cache import bump_version
+
+
+@receiver(post_save, sender=Tag)
+@receiver(post_save, sender=Ingredient)
+@receiver(post_save, sender=Recipe)
+@receiver(post_delete, sender=Tag)
+@receiver(post_delete, sender=Ingredient)
+@receiver(post_delete, sender=Recipe)
+def invalidate_user_cache(sender, instance, **kwargs):
+  """ Invalidar el cache del usuario al escribir sus objetos """
+
+  bump_version(instance.user_id)
+
+
+@receiver(m2m_changed, sender=Recipe.tags.through)
+@receiver(m2m_changed, sender=Recipe.ingredients.through)
+def invalidate_user_cache_m2m(sender, instance, action, **kwargs):
+  """ Invalidar el cache del usuario al cambiar tags/ingredientes de recetas """
+
+  if action.startswith("post_"):
+    bump_version(instance.user_id)
+
+
+@receiver(recipes_bulk_changed, sender=Recipe)
+def invalidate_user_cache_bulk(sender, user_id, **kwargs):
+  """ Invalidar el cache del usuario tras escrituras masivas """
+
+  bump_version(user_id)
+
+
+@receiver(post_save, sender=get_user_model())
+def invalidate_new_user_cache(sender, instance, created, **kwargs):
+  """ Un usuario nuevo nunca hereda respuestas de un ID reutilizado """
+
+  if created:
+    bump_version(instance.pk)
+
+
+@receiver(pre_save, sender=Recipe)
+def remember_previous_image(sender, instance, update_fields=None, **kwargs):
+  """ Guardar el nombre de la imagen anterior si el guardado puede cambiarla """
+
+  if update_fields is not None and "image" not in update_fields:
+    instance.__dict__.pop("_previous_image", None)
+    return
+
+  instance._previous_image = ""
+  if instance.pk is not None:
+    instance._previous_image = sender.objects.filter(
+      pk=instance.pk
+    ).values_list("image", flat=True).first()
+
+
+@receiver(post_save, sender=Recipe)
+def update_image_references(sender, instance, created, **kwargs):
+  """ Contar referencias de blobs al asignar o cambiar la imagen """
+
+  if not hasattr(instance, "_previous_image"):
+    return
+
+  previous = instance._previous_image or ""
+  current = instance.image.name or ""
+  del instance._previous_image
+
+  if previous == current:
+    return
+  if current:
+    images.acquire_blob(current)
+  if previous:
+    images.release_blob(previous)
+
+
+@receiver(pre_delete, sender=Recipe)
+def release_image_reference(sender, instance, **kwargs):
+  """ Liberar el blob de la receta borrada """
+
+  if instance.image:
+    images.release_blob(instance.image.name)
+
+
+SEARCH_FIELDS = {"title", "name"}
+
+
+@receiver(post_save, sender=Recipe)
+def index_recipe(sender, instance, update_fields=None, **kwargs):
+  """ Reindexar la receta si cambian campos indexados """
+
+  if update_fields is None or SEARCH_FIELDS & set(update_fields):
+    search.index_recipes([instance.pk])
+
+
+@receiver(post_delete, sender=Recipe)
+def unindex_recipe(sender, instance, **kwargs):
+  search.remove_recipes([instance.pk])
+
+
+@receiver(m2m_changed, sender=Recipe.tags.through)
+@receiver(m2m_changed, sender=Recipe.ingredients.through)
+def index_recipes_on_m2m_change(sender, instance, action, reverse, pk_set, **kwargs):
+  """ Los nombres de tags/ingredientes forman parte del documento """
+
+  if not reverse:
+    if action in ("post_add", "post_remove", "post_clear"):
+      search.index_recipes([instance.pk])
+  elif action == "pre_clear":
+    # En clear pk_set es None: guardar las recetas antes de desenlazar
+    instance._search_recipe_ids = list(
+      recipe_ids(RELATIONS[instance.__class__], instance.pk)
+    )
+  elif action == "post_clear":
+    search.index_recipes(instance.__dict__.pop("_search_recipe_ids", []))
+  elif action in ("post_add", "post_remove"):
+    search.index_recipes(pk_set)
+
+
+@receiver(post_save, sender=Tag)
+@receiver(post_save, sender=Ingredient)
+def index_recipes_on_rename(sender, instance, created, **kwargs):
+  if not created:
+    search.index_recipes(recipe_ids(RELATIONS[sender], instance.pk))
+
+
+@receiver(pre_delete, sender=Tag)
+@receiver(pre_delete, sender=Ingredient)
+def remember_recipes_on_delete(sender, instance, **kwargs):
+  """ Los enlaces se borran en cascada sin m2m_changed """
+
+  instance._search_recipe_ids = list(recipe_ids(RELATIONS[sender], instance.pk))
+
+
+@receiver(post_delete, sender=Tag)
+@receiver(post_delete, sender=Ingredient)
+def index_recipes_on_delete(sender, instance, **kwargs):
+  search.index_recipes(instance.__dict__.pop("_search_recipe_ids", []))
+
+
+@receiver(recipes_bulk_changed, sender=Recipe)
+def index_recipes_on_bulk_change(sender, recipe_ids, **kwargs):
+  """ Recetas creadas o actualizadas en bloque """
+
+  search.index_recipes(recipe_ids)
@@ -0,0 +1,212 @@
+import asyncio
+import json
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth import get_user_model
+from django.test import AsyncRequestFactory, TestCase, override_settings
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from app_core.authentication import get_token_cache
+from app_core.models import Ingredient, Recipe, Tag
+from recipe_app import cache, views
+from user_app.views import ManageUserView
+
+
+RECIPE_URL = reverse("recipe_app:recipe-list")
+TAG_URL = reverse("recipe_app:tag-list")
+ME_URL = reverse("user_app:me")
+
+
+def detail_url(recipe_id):
+  return reverse("recipe_app:recipe-detail", args=[recipe_id])
+
+
+def async_view(viewset, actions, **initkwargs):
+  """ Vista de ``viewset`` como la crea el router con ASYNC_VIEWS """
+
+  with override_settings(ASYNC_VIEWS=True):
+    return viewset.as_view(actions, **initkwargs)
+
+
+LIST_VIEW = async_view(
+  views.RecipeViewSet,
+  {"get": "list", "post": "create"},
+  basename="recipe",
+  detail=False
+)
+DETAIL_VIEW = async_view(
+  views.RecipeViewSet,
+  {"get": "retrieve", "patch": "partial_update"},
+  basename="recipe",
+  detail=True
+)
+TAG_VIEW = async_view(
+  views.TagViewSet,
+  {"get": "list", "post": "create"},
+  basename="tag",
+  detail=False
+)
+
+
+# Sin cache de respuestas: cada peticion pasa por la vista
+@override_settings(RECIPE_APP_CACHE_TIMEOUT=0)
+class AsyncViewTests(TestCase):
+  """ Probar las vistas async de lectura contra las sincronas """
+
+  def setUp(self):
+    get_token_cache().clear()
+    self.user = get_user_model().objects.create_user(
+      "test@gmail.com",
+      "testpass"
+    )
+    self.token = Token.objects.create(user=self.user)
+    self.client = APIClient()
+    self.client.credentials(HTTP_AUTHORIZATION=f"Token {self.token.key}")
+    # Cabeceras por nombre: AsyncRequestFactory de Django 4.1 no lee HTTP_*
+    self.headers = {"AUTHORIZATION": f"Token {self.token.key}"}
+    self.factory = AsyncRequestFactory()
+
+    vegan = Tag.objects.create(user=self.user, name="Vegan")
+    tofu = Ingredient.objects.create(user=self.user, name="Tofu")
+    self.recipes = []
+    for i in range(5):
+      recipe = Recipe.objects.create(
+        user=self.user,
+        title=f"Recipe {i}",
+        time_minutes=10 + i,
+        price="5.50"
+      )
+      recipe.tags.add(vegan)
+      recipe.ingredients.add(tofu)
+      self.recipes.append(recipe)
+
+  async def _same(self, view, url, params=None, **kwargs):
+    """ Llamar la vista async y la sincrona; retornar la respuesta async """
+
+    res = await view(self.factory.get(url, params or {}, **self.headers), **kwargs)
+    expected = await sync_to_async(self.client.get)(url, params or {})
+
+    self.assertEqual(res.status_code, expected.status_code)
+    self.assertEqual(json.loads(res.content), expected.json())
+    return res
+
+  async def test_list_matches_sync(self):
+    """ Prueba que el listado async emite lo mismo, con fields y expand """
+
+    await self._same(LIST_VIEW, RECIPE_URL)
+    await self._same(LIST_VIEW, RECIPE_URL, {"fields": "title,tags", "expand": "tags"})
+    await self._same(LIST_VIEW, RECIPE_URL, {"ordering": "-time_minutes"})
+    await self._same(LIST_VIEW, RECIPE_URL, {"page": 2, "page_size": 2})
+
+  async def test_list_follows_cursor(self):
+    """ Prueba recorrer las paginas keyset con la vista async """
+
+    seen = []
+    url, params = RECIPE_URL, {"page_size": 2}
+    while url:
+      res = await self._same(LIST_VIEW, url, params)
+      data = json.loads(res.content)
+      seen.extend(item["id"] for item in data["results"])
+      url, params = data["next"], None
+
+    self.assertEqual(seen, [recipe.id for recipe in self.recipes])
+
+  async def test_retrieve_matches_sync(self):
+    """ Prueba el detalle async, incluido un id inexistente o invalido """
+
+    recipe = self.recipes[0]
+    await self._same(DETAIL_VIEW, detail_url(recipe.id), pk=str(recipe.id))
+    await self._same(DETAIL_VIEW, detail_url(0), pk="0")
+    await self._same(DETAIL_VIEW, detail_url("abc"), pk="abc")
+
+  async def test_tags_match_sync(self):
+    """ Prueba el listado async de tags con uso """
+
+    await self._same(TAG_VIEW, TAG_URL, {"with_usage": "1"})
+
+  async def test_requires_authentication(self):
+    """ Prueba que sin token la vista async responde 401 """
+
+    res = await LIST_VIEW(AsyncRequestFactory().get(RECIPE_URL))
+    invalid = await LIST_VIEW(AsyncRequestFactory().get(
+      RECIPE_URL,
+      AUTHORIZATION="Token invalid"
+    ))
+
+    self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+    self.assertEqual(invalid.status_code, status.HTTP_401_UNAUTHORIZED)
+
+  async def test_other_methods_use_sync_view(self):
+    """ Prueba que las escrituras pasan por la vista sincrona """
+
+    request = self.factory.post(
+      RECIPE_URL,
+      {"title": "Soup", "time_minutes": 5, "price": "2.00", "tags": [], "ingredients": []},
+      content_type="application/json",
+      **self.headers
+    )
+    res = await LIST_VIEW(request)
+
+    self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+    self.assertTrue(await Recipe.objects.filter(title="Soup").aexists())
+
+  async def test_me_matches_sync(self):
+    """ Prueba el usuario autenticado con la vista async """
+
+    with override_settings(ASYNC_VIEWS=True):
+      view = ManageUserView.as_view()
+
+    self.assertTrue(asyncio.iscoroutinefunction(view))
+    await self._same(view, ME_URL)
+
+  async def test_sync_views_without_setting(self):
+    """ Prueba que sin ASYNC_VIEWS las vistas siguen siendo las de DRF """
+
+    view = views.RecipeViewSet.as_view({"get": "list"})
+    export = async_view(views.RecipeViewSet, {"get": "export"})
+
+    self.assertTrue(asyncio.iscoroutinefunction(LIST_VIEW))
+    self.assertFalse(asyncio.iscoroutinefunction(view))
+    self.assertFalse(asyncio.iscoroutinefunction(export))
+
+
+class AsyncCachedViewTests(TestCase):
+  """ Probar cache de respuestas y ETag en las vistas async """
+
+  def setUp(self):
+    get_token_cache().clear()
+    self.user = get_user_model().objects.create_user(
+      "test@gmail.com",
+      "testpass"
+    )
+    token = Token.objects.create(user=self.user)
+    self.headers = {"AUTHORIZATION": f"Token {token.key}"}
+    self.factory = AsyncRequestFactory()
+    Recipe.objects.create(
+      user=self.user,
+      title="Pancakes",
+      time_minutes=10,
+      price="5.00"
+    )
+
+  async def test_cache_hit_and_not_modified(self):
+    """ Prueba el HIT del cache y el 304 por ETag """
+
+    first = await LIST_VIEW(self.factory.get(RECIPE_URL, **self.headers))
+    second = await LIST_VIEW(self.factory.get(RECIPE_URL, **self.headers))
+
+    cache.bump_version(self.user.pk)
+    not_modified = await LIST_VIEW(self.factory.get(
+      RECIPE_URL,
+      IF_NONE_MATCH=first["ETag"],
+      **self.headers
+    ))
+
+    self.assertEqual(first["X-Cache"], "MISS")
+    self.assertEqual(second["X-Cache"], "HIT")
+    self.assertEqual(second.content, first.content)
+    self.assertEqual(not_modified.status_code, status.HTTP_304_NOT_MODIFIED)
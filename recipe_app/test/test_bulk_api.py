@@ -0,0 +1,262 @@
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.db import connection
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from app_core.models import ImageBlob, Ingredient, Recipe, Tag
+
+
+BULK_URL = reverse("recipe_app:recipe-bulk")
+
+
+def recipe_payload(index, **params):
+  """ Payload de receta para peticiones en bloque """
+
+  payload = {
+    "title": f"Recipe {index}",
+    "time_minutes": 10 + index,
+    "price": "5.00",
+  }
+  payload.update(params)
+
+  return payload
+
+
+class BulkRecipeApiTests(TestCase):
+  """ Probar los endpoints en bloque de recetas """
+
+  def setUp(self):
+    self.client = APIClient()
+    self.user = get_user_model().objects.create_user(
+      "test@gmail.com",
+      "testpass"
+    )
+    self.client.force_authenticate(self.user)
+    self.tag = Tag.objects.create(user=self.user, name="Vegan")
+    self.ingredient = Ingredient.objects.create(user=self.user, name="Tofu")
+
+  def test_bulk_create(self):
+    """ Prueba crear varias recetas con sus relaciones """
+
+    payload = [
+      recipe_payload(i, tags=[self.tag.id], ingredients=[self.ingredient.id])
+      for i in range(3)
+    ]
+
+    res = self.client.post(BULK_URL, payload, format="json")
+
+    self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+    self.assertEqual(len(res.data), 3)
+    self.assertEqual(Recipe.objects.filter(user=self.user).count(), 3)
+    for item in res.data:
+      self.assertEqual(item["tags"], [self.tag.id])
+      self.assertEqual(item["ingredients"], [self.ingredient.id])
+
+  def test_bulk_create_query_count_constant(self):
+    """ Prueba que el numero de queries no crece con los elementos """
+
+    def count(size, offset):
+      payload = [
+        recipe_payload(offset + i, tags=[self.tag.id])
+        for i in range(size)
+      ]
+      with CaptureQueriesContext(connection) as ctx:
+        res = self.client.post(BULK_URL, payload, format="json")
+      self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+      return len(ctx.captured_queries)
+
+    self.assertEqual(count(2, 0), count(20, 100))
+
+  def test_bulk_create_reports_errors_per_item(self):
+    """ Prueba errores alineados por elemento y sin escrituras parciales """
+
+    other = get_user_model().objects.create_user("other@gmail.com", "pass")
+    foreign_tag = Tag.objects.create(user=other, name="Foreign")
+    payload = [
+      recipe_payload(0, tags=[self.tag.id]),
+      recipe_payload(1, tags=[foreign_tag.id]),
+      {"title": "Missing fields"},
+    ]
+
+    res = self.client.post(BULK_URL, payload, format="json")
+
+    self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+    self.assertEqual(len(res.data), 3)
+    self.assertEqual(res.data[0], {})
+    self.assertIn("time_minutes", res.data[2])
+    self.assertFalse(Recipe.objects.exists())
+
+  def test_bulk_create_foreign_tag_rejected(self):
+    """ Prueba que no se aceptan tags de otro usuario """
+
+    other = get_user_model().objects.create_user("other@gmail.com", "pass")
+    foreign_tag = Tag.objects.create(user=other, name="Foreign")
+
+    res = self.client.post(
+      BULK_URL,
+      [recipe_payload(0, tags=[foreign_tag.id])],
+      format="json"
+    )
+
+    self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+    self.assertIn("tags", res.data[0])
+
+  def test_bulk_create_repeated_ids_linked_once(self):
+    """ Prueba que un tag repetido en un elemento se enlaza una vez """
+
+    res = self.client.post(BULK_URL, [
+      recipe_payload(0, tags=[self.tag.id, self.tag.id]),
+    ], format="json")
+
+    self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+    self.assertEqual(res.data[0]["tags"], [self.tag.id])
+
+  def test_bulk_update(self):
+    """ Prueba actualizar varias recetas y reemplazar sus tags """
+
+    recipes = [
+      Recipe.objects.create(user=self.user, title=f"R{i}", time_minutes=5, price=1)
+      for i in range(2)
+    ]
+    recipes[0].tags.add(self.tag)
+    tag2 = Tag.objects.create(user=self.user, name="Quick")
+
+    res = self.client.patch(BULK_URL, [
+      {"id": recipes[0].id, "title": "Updated", "tags": [tag2.id]},
+      {"id": recipes[1].id, "time_minutes": 50},
+    ], format="json")
+
+    self.assertEqual(res.status_code, status.HTTP_200_OK)
+    recipes[0].refresh_from_db()
+    recipes[1].refresh_from_db()
+    self.assertEqual(recipes[0].title, "Updated")
+    self.assertEqual(list(recipes[0].tags.all()), [tag2])
+    self.assertEqual(recipes[1].time_minutes, 50)
+
+  def test_bulk_update_repeated_ids(self):
+    """ Prueba reemplazar enlaces con IDs repetidos y rechazar recetas repetidas """
+
+    recipe = Recipe.objects.create(user=self.user, title="R", time_minutes=5, price=1)
+
+    res = self.client.patch(BULK_URL, [
+      {"id": recipe.id, "ingredients": [self.ingredient.id, self.ingredient.id]},
+    ], format="json")
+    duplicate = self.client.patch(BULK_URL, [
+      {"id": recipe.id, "title": "First"},
+      {"id": recipe.id, "title": "Second"},
+    ], format="json")
+
+    self.assertEqual(res.status_code, status.HTTP_200_OK)
+    self.assertEqual(list(recipe.ingredients.all()), [self.ingredient])
+    self.assertEqual(duplicate.status_code, status.HTTP_400_BAD_REQUEST)
+    self.assertEqual(duplicate.data[0], {})
+    self.assertIn("id", duplicate.data[1])
+    recipe.refresh_from_db()
+    self.assertEqual(recipe.title, "R")
+
+  def test_bulk_update_unknown_id(self):
+    """ Prueba que actualizar recetas ajenas falla por elemento """
+
+    other = get_user_model().objects.create_user("other@gmail.com", "pass")
+    recipe = Recipe.objects.create(user=other, title="R", time_minutes=5, price=1)
+
+    res = self.client.patch(
+      BULK_URL,
+      [{"id": recipe.id, "title": "Hijacked"}],
+      format="json"
+    )
+
+    self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+    self.assertIn("id", res.data[0])
+
+  def test_bulk_delete(self):
+    """ Prueba borrar varias recetas """
+
+    recipes = [
+      Recipe.objects.create(user=self.user, title=f"R{i}", time_minutes=5, price=1)
+      for i in range(3)
+    ]
+    recipes[0].tags.add(self.tag)
+
+    res = self.client.delete(
+      BULK_URL,
+      {"ids": [recipes[0].id, recipes[1].id]},
+      format="json"
+    )
+
+    self.assertEqual(res.status_code, status.HTTP_204_NO_CONTENT)
+    self.assertEqual(
+      list(Recipe.objects.values_list("id", flat=True)),
+      [recipes[2].id]
+    )
+
+  def test_bulk_delete_query_count_constant(self):
+    """ Prueba que borrar no hace queries por receta y libera los blobs """
+
+    def delete(size):
+      recipes = []
+      for i in range(size):
+        recipe = Recipe.objects.create(
+          user=self.user,
+          title=f"R{i}",
+          time_minutes=5,
+          price=1,
+          image="uploads/recipe/shared.jpg" if i % 2 else ""
+        )
+        recipe.tags.add(self.tag)
+        recipe.ingredients.add(self.ingredient)
+        recipes.append(recipe)
+      keep = Recipe.objects.create(
+        user=self.user,
+        title="Keep",
+        time_minutes=5,
+        price=1,
+        image="uploads/recipe/shared.jpg"
+      )
+
+      with self.assertNumQueries(14):
+        res = self.client.delete(
+          BULK_URL,
+          {"ids": [recipe.id for recipe in recipes]},
+          format="json"
+        )
+
+      self.assertEqual(res.status_code, status.HTTP_204_NO_CONTENT)
+      self.assertEqual(list(Recipe.objects.values_list("id", flat=True)), [keep.id])
+      self.assertEqual(
+        ImageBlob.objects.get(name="uploads/recipe/shared.jpg").refcount,
+        1
+      )
+      keep.delete()
+
+    delete(2)
+    delete(20)
+
+  def test_bulk_delete_missing_id(self):
+    """ Prueba que un ID inexistente no borra nada """
+
+    recipe = Recipe.objects.create(user=self.user, title="R", time_minutes=5, price=1)
+
+    res = self.client.delete(
+      BULK_URL,
+      {"ids": [recipe.id, recipe.id + 100]},
+      format="json"
+    )
+
+    self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+    self.assertTrue(Recipe.objects.filter(id=recipe.id).exists())
+
+  def test_bulk_create_invalidates_cache(self):
+    """ Prueba que la escritura en bloque invalida el listado en cache """
+
+    list_url = reverse("recipe_app:recipe-list")
+    self.client.get(list_url)
+
+    self.client.post(BULK_URL, [recipe_payload(0)], format="json")
+    res = self.client.get(list_url)
+
+    self.assertEqual(len(res.data["results"]), 1)
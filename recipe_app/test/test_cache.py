@@ -0,0 +1,140 @@
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.urls import reverse
+from django.test import TestCase
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from app_core.models import Recipe, Tag
+from recipe_app.cache import get_stats
+
+
+TAG_URL = reverse("recipe_app:tag-list")
+RECIPE_URL = reverse("recipe_app:recipe-list")
+CACHE_STATS_URL = reverse("recipe_app:cache-stats")
+
+
+def detail_url(recipe_id):
+  """ Retorna Receta Details URL """
+  return reverse("recipe_app:recipe-detail", args=[recipe_id])
+
+
+class ResponseCacheTests(TestCase):
+  """ Probar el cache de respuestas por usuario """
+
+  def setUp(self):
+    self.client = APIClient()
+    self.user = get_user_model().objects.create_user(
+      "test@gmail.com",
+      "testpass"
+    )
+    self.client.force_authenticate(self.user)
+    self.recipe = Recipe.objects.create(
+      user=self.user,
+      title="Pancakes",
+      time_minutes=10,
+      price=5.00
+    )
+
+  def test_second_list_served_from_cache(self):
+    """ Prueba que la segunda peticion no consulta la base de datos """
+
+    Tag.objects.create(user=self.user, name="Breakfast")
+    first = self.client.get(TAG_URL)
+
+    with self.assertNumQueries(0):
+      second = self.client.get(TAG_URL)
+
+    self.assertEqual(first["X-Cache"], "MISS")
+    self.assertEqual(second["X-Cache"], "HIT")
+    self.assertEqual(second.data, first.data)
+
+  def test_query_params_are_part_of_key(self):
+    """ Prueba que parametros distintos no comparten respuesta """
+
+    self.client.get(TAG_URL)
+    res = self.client.get(TAG_URL, {"with_usage": 1})
+
+    self.assertEqual(res["X-Cache"], "MISS")
+
+  def test_write_invalidates_list(self):
+    """ Prueba que crear un tag invalida el listado """
+
+    self.client.get(TAG_URL)
+    Tag.objects.create(user=self.user, name="Lunch")
+
+    res = self.client.get(TAG_URL)
+
+    self.assertEqual(res["X-Cache"], "MISS")
+    self.assertEqual(len(res.data["results"]), 1)
+
+  def test_version_rotated_again_on_commit(self):
+    """ Prueba que lo cacheado antes del commit de una escritura se descarta """
+
+    with self.captureOnCommitCallbacks(execute=True):
+      with transaction.atomic():
+        Tag.objects.create(user=self.user, name="Lunch")
+        # Como una lectura concurrente entre la escritura y el commit
+        self.client.get(TAG_URL)
+
+    res = self.client.get(TAG_URL)
+
+    self.assertEqual(res["X-Cache"], "MISS")
+
+  def test_m2m_change_invalidates_detail(self):
+    """ Prueba que agregar un tag a la receta invalida el detalle """
+
+    tag = Tag.objects.create(user=self.user, name="Sweet")
+    self.client.get(detail_url(self.recipe.id))
+    self.recipe.tags.add(tag)
+
+    res = self.client.get(detail_url(self.recipe.id))
+
+    self.assertEqual(res["X-Cache"], "MISS")
+    self.assertEqual(res.data["tags"][0]["name"], "Sweet")
+
+  def test_api_update_invalidates_detail(self):
+    """ Prueba que actualizar por el API invalida el detalle """
+
+    self.client.get(detail_url(self.recipe.id))
+    self.client.patch(detail_url(self.recipe.id), {"title": "Waffles"})
+
+    res = self.client.get(detail_url(self.recipe.id))
+
+    self.assertEqual(res.data["title"], "Waffles")
+
+  def test_cache_is_per_user(self):
+    """ Prueba que otro usuario no recibe respuestas ajenas """
+
+    self.client.get(RECIPE_URL)
+    user2 = get_user_model().objects.create_user("other@gmail.com", "pass")
+    self.client.force_authenticate(user2)
+
+    res = self.client.get(RECIPE_URL)
+
+    self.assertEqual(res["X-Cache"], "MISS")
+    self.assertEqual(res.data["results"], [])
+
+  def test_stats_count_hits_and_misses(self):
+    """ Prueba los contadores de aciertos y fallos """
+
+    before = get_stats()
+    self.client.get(RECIPE_URL)
+    self.client.get(RECIPE_URL)
+    after = get_stats()
+
+    self.assertEqual(after["hits"] - before["hits"], 1)
+    self.assertEqual(after["misses"] - before["misses"], 1)
+
+  def test_stats_endpoint_requires_staff(self):
+    """ Prueba que solo staff puede ver los contadores """
+
+    res = self.client.get(CACHE_STATS_URL)
+    self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+
+    self.user.is_staff = True
+    self.user.save()
+    res = self.client.get(CACHE_STATS_URL)
+    self.assertEqual(res.status_code, status.HTTP_200_OK)
+    self.assertIn("hits", res.data)
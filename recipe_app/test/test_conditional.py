@@ -0,0 +1,137 @@
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from django.test import TestCase
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from app_core.models import Recipe, Tag
+from recipe_app.cache import bump_version
+
+
+TAG_URL = reverse("recipe_app:tag-list")
+RECIPE_URL = reverse("recipe_app:recipe-list")
+
+
+def detail_url(recipe_id):
+  """ Retorna Receta Details URL """
+  return reverse("recipe_app:recipe-detail", args=[recipe_id])
+
+
+class ConditionalGetTests(TestCase):
+  """ Probar ETag / Last-Modified en los endpoints de recetas """
+
+  def setUp(self):
+    self.client = APIClient()
+    self.user = get_user_model().objects.create_user(
+      "test@gmail.com",
+      "testpass"
+    )
+    self.client.force_authenticate(self.user)
+    self.recipe = Recipe.objects.create(
+      user=self.user,
+      title="Pancakes",
+      time_minutes=10,
+      price=5.00
+    )
+
+  def test_detail_sends_validators(self):
+    """ Prueba que el detalle envia ETag y Last-Modified """
+
+    res = self.client.get(detail_url(self.recipe.id))
+
+    self.assertEqual(res.status_code, status.HTTP_200_OK)
+    self.assertIn("ETag", res)
+    self.assertIn("Last-Modified", res)
+
+  def test_detail_invalid_id_returns_404(self):
+    """ Prueba que un id no numerico responde 404 y no 500 """
+
+    res = self.client.get(detail_url("abc"))
+
+    self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+  def test_list_sends_only_etag(self):
+    """ Prueba que el listado envia ETag sin Last-Modified """
+
+    res = self.client.get(RECIPE_URL)
+
+    self.assertIn("ETag", res)
+    self.assertNotIn("Last-Modified", res)
+
+  def test_if_none_match_returns_304_without_serializing(self):
+    """ Prueba 304 con una sola query de aggregate """
+
+    etag = self.client.get(detail_url(self.recipe.id))["ETag"]
+    bump_version(self.user.pk)
+
+    with self.assertNumQueries(1):
+      res = self.client.get(
+        detail_url(self.recipe.id),
+        HTTP_IF_NONE_MATCH=etag
+      )
+
+    self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+    self.assertEqual(res["ETag"], etag)
+
+  def test_if_none_match_from_cache(self):
+    """ Prueba 304 servido desde el cache de respuestas """
+
+    etag = self.client.get(RECIPE_URL)["ETag"]
+
+    with self.assertNumQueries(0):
+      res = self.client.get(RECIPE_URL, HTTP_IF_NONE_MATCH=etag)
+
+    self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+
+  def test_if_modified_since_returns_304(self):
+    """ Prueba 304 con If-Modified-Since en el detalle """
+
+    last_modified = self.client.get(detail_url(self.recipe.id))["Last-Modified"]
+    bump_version(self.user.pk)
+
+    res = self.client.get(
+      detail_url(self.recipe.id),
+      HTTP_IF_MODIFIED_SINCE=last_modified
+    )
+
+    self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+
+  def test_m2m_change_changes_etag(self):
+    """ Prueba que enlazar un tag cambia el ETag del detalle """
+
+    tag = Tag.objects.create(user=self.user, name="Sweet")
+    etag = self.client.get(detail_url(self.recipe.id))["ETag"]
+
+    self.recipe.tags.add(tag)
+    res = self.client.get(detail_url(self.recipe.id), HTTP_IF_NONE_MATCH=etag)
+
+    self.assertEqual(res.status_code, status.HTTP_200_OK)
+    self.assertNotEqual(res["ETag"], etag)
+
+  def test_delete_changes_list_etag(self):
+    """ Prueba que borrar una receta cambia el ETag del listado """
+
+    Recipe.objects.create(
+      user=self.user,
+      title="Waffles",
+      time_minutes=10,
+      price=5.00
+    )
+    etag = self.client.get(RECIPE_URL)["ETag"]
+
+    self.recipe.delete()
+    res = self.client.get(RECIPE_URL, HTTP_IF_NONE_MATCH=etag)
+
+    self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+  def test_tag_list_etag(self):
+    """ Prueba 304 en el listado de tags """
+
+    Tag.objects.create(user=self.user, name="Sweet")
+    etag = self.client.get(TAG_URL)["ETag"]
+    bump_version(self.user.pk)
+
+    res = self.client.get(TAG_URL, HTTP_IF_NONE_MATCH=etag)
+
+    self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
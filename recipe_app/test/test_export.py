@@ -0,0 +1,97 @@
+import csv
+import io
+import json
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from django.test import TestCase
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from app_core.models import Ingredient, Recipe, Tag
+from recipe_app import export
+
+
+EXPORT_URL = reverse("recipe_app:recipe-export")
+RECIPE_URL = reverse("recipe_app:recipe-list")
+
+
+class RecipeExportTests(TestCase):
+  """ Probar el export en streaming de las recetas del usuario """
+
+  def setUp(self):
+    self.client = APIClient()
+    self.user = get_user_model().objects.create_user(
+      "test@gmail.com",
+      "testpass"
+    )
+    self.client.force_authenticate(self.user)
+
+    self.tag = Tag.objects.create(user=self.user, name="Vegan")
+    self.ingredient = Ingredient.objects.create(user=self.user, name="Tofu")
+    for index in range(5):
+      recipe = Recipe.objects.create(
+        user=self.user,
+        title=f"Receta {index}",
+        time_minutes=10 + index,
+        price=5.25
+      )
+      recipe.tags.add(self.tag)
+      if index % 2:
+        recipe.ingredients.add(self.ingredient)
+
+    other = get_user_model().objects.create_user("other@gmail.com", "testpass")
+    Recipe.objects.create(user=other, title="Ajena", time_minutes=5, price=1)
+
+  def _body(self, res):
+    self.assertEqual(res.status_code, status.HTTP_200_OK)
+    self.assertTrue(res.streaming)
+    return b"".join(res.streaming_content).decode("utf-8")
+
+  def test_export_ndjson(self):
+    """ Prueba una linea por receta, igual que el listado y solo del usuario """
+
+    res = self.client.get(EXPORT_URL)
+
+    self.assertEqual(res["Content-Type"], "application/x-ndjson")
+    self.assertIn("attachment", res["Content-Disposition"])
+    lines = [json.loads(line) for line in self._body(res).splitlines()]
+    listed = self.client.get(RECIPE_URL).json()["results"]
+    self.assertEqual(lines, listed)
+
+  def test_export_csv_with_filters(self):
+    """ Prueba CSV con cabecera, filtros y ``fields`` """
+
+    res = self.client.get(EXPORT_URL, {
+      "export_format": "csv",
+      "fields": "title,ingredients",
+      "expand": "ingredients",
+      "ingredients": str(self.ingredient.id),
+    })
+
+    self.assertEqual(res["Content-Type"], "text/csv")
+    rows = list(csv.reader(io.StringIO(self._body(res))))
+    self.assertEqual(rows[0], ["id", "title", "ingredients"])
+    self.assertEqual([row[1:] for row in rows[1:]], [
+      ["Receta 1", "Tofu"],
+      ["Receta 3", "Tofu"],
+    ])
+
+  def test_export_relations_per_chunk(self):
+    """ Prueba que tags e ingredientes se leen una vez por bloque """
+
+    with mock.patch.object(export, "CHUNK_SIZE", 2):
+      res = self.client.get(EXPORT_URL)
+      with self.assertNumQueries(1 + 3 * 2):
+        lines = self._body(res).splitlines()
+
+    self.assertEqual(len(lines), 5)
+
+  def test_export_invalid_format(self):
+    """ Prueba que un formato desconocido retorna 400 """
+
+    res = self.client.get(EXPORT_URL, {"export_format": "xml"})
+
+    self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,121 @@
+import io
+import tempfile
+
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from django.test import TestCase, override_settings
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from app_core.models import ImageBlob, Recipe
+from recipe_app import images
+
+from PIL import Image
+
+
+def image_upload_url(recipe_id):
+  """ Url de retorno para imagen subida """
+  return reverse("recipe_app:recipe-upload-image", args=[recipe_id])
+
+
+def jpeg(color):
+  """ Contenido JPEG de un color """
+
+  buffer = io.BytesIO()
+  Image.new("RGB", (300, 300), color=color).save(buffer, format="JPEG")
+  buffer.seek(0)
+  buffer.name = "photo.jpg"
+  return buffer
+
+
+@override_settings(RECIPE_IMAGE_WORKERS=0)
+class ImageBlobTests(TestCase):
+  """ Probar la deduplicacion y el conteo de referencias de imagenes """
+
+  def setUp(self):
+    self.media_root = tempfile.TemporaryDirectory()
+    self.addCleanup(self.media_root.cleanup)
+    override = override_settings(MEDIA_ROOT=self.media_root.name)
+    override.enable()
+    self.addCleanup(override.disable)
+
+    self.client = APIClient()
+    self.user = get_user_model().objects.create_user("test@gmail.com", "pass")
+    self.other = get_user_model().objects.create_user("other@gmail.com", "pass")
+    self.recipe = self.sample_recipe(self.user)
+    self.other_recipe = self.sample_recipe(self.other)
+
+  def sample_recipe(self, user):
+    return Recipe.objects.create(
+      user=user,
+      title="Sample recipe",
+      time_minutes=10,
+      price=5.00
+    )
+
+  def upload(self, recipe, content):
+    self.client.force_authenticate(recipe.user)
+    with self.captureOnCommitCallbacks(execute=True):
+      res = self.client.post(
+        image_upload_url(recipe.id),
+        {"image": content},
+        format="multipart"
+      )
+    self.assertEqual(res.status_code, status.HTTP_200_OK)
+    recipe.refresh_from_db()
+    return recipe.image.name
+
+  def files(self):
+    _, files = images.get_storage().listdir("uploads/recipe")
+    return sorted(files)
+
+  def test_same_image_stored_once(self):
+    """ Prueba que la misma imagen de dos usuarios ocupa un solo archivo """
+
+    first = self.upload(self.recipe, jpeg("red"))
+    second = self.upload(self.other_recipe, jpeg("red"))
+
+    self.assertEqual(first, second)
+    self.assertEqual(ImageBlob.objects.get(name=first).refcount, 2)
+    # Original + 3 versiones compartidas
+    self.assertEqual(len(self.files()), 1 + len(images.RENDITIONS))
+
+  def test_replaced_image_kept_while_referenced(self):
+    """ Prueba que cambiar la imagen no borra un blob aun en uso """
+
+    shared = self.upload(self.recipe, jpeg("red"))
+    self.upload(self.other_recipe, jpeg("red"))
+
+    self.upload(self.recipe, jpeg("blue"))
+
+    self.assertEqual(ImageBlob.objects.get(name=shared).refcount, 1)
+    self.assertTrue(images.get_storage().exists(shared))
+
+  def test_replaced_image_deleted_when_unreferenced(self):
+    """ Prueba que el blob anterior y sus versiones se borran """
+
+    old = self.upload(self.recipe, jpeg("red"))
+    new = self.upload(self.recipe, jpeg("blue"))
+
+    self.assertFalse(ImageBlob.objects.filter(name=old).exists())
+    self.assertFalse(images.get_storage().exists(old))
+    self.assertFalse(
+      images.get_storage().exists(images.rendition_name(old, "thumbnail"))
+    )
+    self.assertTrue(images.get_storage().exists(new))
+
+  def test_recipe_delete_releases_blob(self):
+    """ Prueba que borrar la ultima receta borra el archivo """
+
+    name = self.upload(self.recipe, jpeg("red"))
+    self.upload(self.other_recipe, jpeg("red"))
+
+    with self.captureOnCommitCallbacks(execute=True):
+      self.recipe.delete()
+    self.assertTrue(images.get_storage().exists(name))
+
+    with self.captureOnCommitCallbacks(execute=True):
+      self.other_recipe.delete()
+    self.assertFalse(images.get_storage().exists(name))
+    self.assertEqual(self.files(), [])
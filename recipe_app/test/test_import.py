@@ -0,0 +1,172 @@
+import json
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.urls import reverse
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from app_core.models import Ingredient, Recipe, Tag
+from recipe_app import imports
+
+
+IMPORT_URL = reverse("recipe_app:recipe-import")
+EXPORT_URL = reverse("recipe_app:recipe-export")
+
+
+def ndjson_file(items, name="recipes.ndjson"):
+  body = b"".join(
+    (item if isinstance(item, bytes) else json.dumps(item).encode()) + b"\n"
+    for item in items
+  )
+  return SimpleUploadedFile(name, body, content_type="application/x-ndjson")
+
+
+class RecipeImportTests(TestCase):
+  """ Probar el import en streaming de recetas """
+
+  def setUp(self):
+    self.client = APIClient()
+    self.user = get_user_model().objects.create_user(
+      "test@gmail.com",
+      "testpass"
+    )
+    self.client.force_authenticate(self.user)
+
+  def _import(self, upload):
+    res = self.client.post(IMPORT_URL, {"file": upload}, format="multipart")
+    self.assertEqual(res.status_code, status.HTTP_200_OK)
+    self.assertEqual(res["Content-Type"], "application/x-ndjson")
+
+    return [
+      json.loads(line)
+      for line in b"".join(res.streaming_content).decode().splitlines()
+    ]
+
+  def test_import_ndjson_resolves_names(self):
+    """ Prueba crear recetas y reutilizar tags por nombre sin mayusculas """
+
+    vegan = Tag.objects.create(user=self.user, name="Vegan")
+    other = get_user_model().objects.create_user("other@gmail.com", "testpass")
+    Ingredient.objects.create(user=other, name="Tofu")
+
+    lines = self._import(ndjson_file([
+      {"title": "Curry", "time_minutes": 30, "price": "8.50",
+       "tags": ["Vegan", "Dinner"], "ingredients": ["Tofu", "Tofu"]},
+      {"title": "Salad", "time_minutes": 5, "price": "3.00",
+       "tags": ["VEGAN", "dinner"]},
+    ]))
+
+    self.assertEqual(lines[-1], {
+      "processed": 2,
+      "created": 2,
+      "failed": 0,
+      "tags_created": 1,
+      "ingredients_created": 1,
+      "done": True,
+    })
+    curry = Recipe.objects.get(user=self.user, title="Curry")
+    self.assertEqual(
+      sorted(curry.tags.values_list("name", flat=True)),
+      ["Dinner", "Vegan"]
+    )
+    self.assertIn(vegan, curry.tags.all())
+    tofu = curry.ingredients.get()
+    self.assertEqual(tofu.user, self.user)
+    self.assertEqual(
+      set(Recipe.objects.get(title="Salad").tags.all()),
+      set(curry.tags.all())
+    )
+
+  def test_import_reports_invalid_lines(self):
+    """ Prueba que las lineas invalidas se reportan y las demas se crean """
+
+    lines = self._import(ndjson_file([
+      {"title": "Curry", "time_minutes": 30, "price": "8.50"},
+      b"{not json",
+      {"title": "Soup", "time_minutes": "soon", "price": "2.00"},
+      {"title": "Salad", "time_minutes": 5, "price": "3.00"},
+    ]))
+
+    errors = lines[0]["errors"]
+    self.assertEqual([error["line"] for error in errors], [2, 3])
+    self.assertIn("time_minutes", errors[1]["errors"])
+    self.assertEqual(lines[-1]["created"], 2)
+    self.assertEqual(lines[-1]["failed"], 2)
+    self.assertEqual(
+      sorted(Recipe.objects.values_list("title", flat=True)),
+      ["Curry", "Salad"]
+    )
+
+  def test_import_progress_per_chunk(self):
+    """ Prueba una linea de progreso y un bulk_create de tags por bloque """
+
+    items = [
+      {"title": f"Recipe {index}", "time_minutes": 10, "price": "1.00",
+       "tags": [f"Tag {index}", "Common"]}
+      for index in range(5)
+    ]
+
+    with mock.patch.object(imports, "CHUNK_SIZE", 2), \
+        CaptureQueriesContext(connection) as ctx:
+      lines = self._import(ndjson_file(items))
+
+    self.assertEqual(
+      [line["processed"] for line in lines],
+      [2, 4, 5, 5]
+    )
+    tag_inserts = [
+      query for query in ctx.captured_queries
+      if query["sql"].startswith("INSERT")
+      and 'INTO "app_core_tag"' in query["sql"]
+    ]
+    self.assertEqual(len(tag_inserts), 3)
+    self.assertEqual(Tag.objects.filter(user=self.user).count(), 6)
+    self.assertEqual(Recipe.objects.filter(user=self.user).count(), 5)
+
+  def test_import_csv_round_trip(self):
+    """ Prueba importar el CSV del export con relaciones por nombre """
+
+    recipe = Recipe.objects.create(
+      user=self.user,
+      title="Curry",
+      time_minutes=30,
+      price=8.50
+    )
+    recipe.tags.add(Tag.objects.create(user=self.user, name="Vegan"))
+    recipe.ingredients.add(Ingredient.objects.create(user=self.user, name="Tofu"))
+    # Sin expand: el CSV escribe nombres aunque el JSON emita IDs
+    res = self.client.get(EXPORT_URL, {"export_format": "csv"})
+    body = b"".join(res.streaming_content)
+
+    lines = self._import(SimpleUploadedFile("recipes.csv", body))
+
+    self.assertEqual(lines[-1]["created"], 1)
+    copies = Recipe.objects.filter(user=self.user, title="Curry")
+    self.assertEqual(copies.count(), 2)
+    for copy in copies:
+      self.assertEqual(list(copy.tags.values_list("name", flat=True)), ["Vegan"])
+      self.assertEqual(
+        list(copy.ingredients.values_list("name", flat=True)),
+        ["Tofu"]
+      )
+    self.assertEqual(Tag.objects.filter(user=self.user).count(), 1)
+    self.assertEqual(Ingredient.objects.filter(user=self.user).count(), 1)
+
+  def test_import_requires_file(self):
+    """ Prueba que sin archivo o con formato invalido retorna 400 """
+
+    res = self.client.post(IMPORT_URL, {}, format="multipart")
+    self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    res = self.client.post(
+      f"{IMPORT_URL}?import_format=xml",
+      {"file": ndjson_file([])},
+      format="multipart"
+    )
+    self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
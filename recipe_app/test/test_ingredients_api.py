@@ -5,7 +5,7 @@ from django.test import TestCase
 from rest_framework import status
 from rest_framework.test import APIClient
 
-from app_core.models import Ingredient
+from app_core.models import Ingredient, Recipe
 
 from recipe_app.serializers import IngredientSerializer
 
@@ -47,7 +47,7 @@ class PrivateIngredientsApiTest(TestCase):
     serializer = IngredientSerializer(ingredients, many=True)
 
     self.assertEqual(res.status_code, status.HTTP_200_OK)
-    self.assertEqual(res.data, serializer.data)
+    self.assertEqual(res.data["results"], serializer.data)
 
   def test_ingredients_limited_to_user(self):
     """ Probar retornar ingredientes solamente autenticados por el usuario """
@@ -62,8 +62,8 @@ class PrivateIngredientsApiTest(TestCase):
     res = self.client.get(INGREDIENT_URL)
 
     self.assertEqual(res.status_code, status.HTTP_200_OK)
-    self.assertEqual(len(res.data), 1)
-    self.assertEqual(res.data[0]["name"], ingredient.name)
+    self.assertEqual(len(res.data["results"]), 1)
+    self.assertEqual(res.data["results"][0]["name"], ingredient.name)
 
   def test_create_ingredient_succesful(self):
     """ Probar crear nuevo ingrediente """
@@ -75,10 +75,46 @@ class PrivateIngredientsApiTest(TestCase):
     
     self.assertTrue(exists)
 
+  def test_create_ingredient_upsert(self):
+    """ Probar que un nombre repetido retorna el ingrediente existente """
+
+    ingredient = Ingredient.objects.create(user=self.user, name="Salt")
+
+    res = self.client.post(INGREDIENT_URL, {"name": "salt"})
+
+    self.assertEqual(res.status_code, status.HTTP_200_OK)
+    self.assertEqual(res.data["id"], ingredient.id)
+    self.assertEqual(Ingredient.objects.filter(user=self.user).count(), 1)
+
   def test_create_ingredient_invalid(self):
     """ Probar crear un ingredinete vacio """
 
     payload = {"name": ""}
     res = self.client.post(INGREDIENT_URL, payload)
 
-    self.assertEqual( res.status_code, status.HTTP_400_BAD_REQUEST)
\ No newline at end of file
+    self.assertEqual( res.status_code, status.HTTP_400_BAD_REQUEST)
+
+  def test_retrieve_ingredients_assigned_with_usage(self):
+    """ Probar filtrar ingredientes asignados con su numero de recetas """
+
+    ingredient1 = Ingredient.objects.create(user=self.user, name="Apples")
+    Ingredient.objects.create(user=self.user, name="Turkey")
+    recipe = Recipe.objects.create(
+      title="Apple crumble",
+      time_minutes=5,
+      price=10.00,
+      user=self.user
+    )
+    recipe.ingredients.add(ingredient1)
+
+    # Aggregate de validadores ETag + listado
+    with self.assertNumQueries(2):
+      res = self.client.get(
+        INGREDIENT_URL,
+        {"assigned_only": 1, "with_usage": 1}
+      )
+
+    self.assertEqual(
+      res.data["results"],
+      [{"id": ingredient1.id, "name": "Apples", "usage": 1}]
+    )
@@ -0,0 +1,146 @@
+from django.contrib.auth import get_user_model
+from django.core.files.base import ContentFile
+from django.test import TestCase, override_settings
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from app_core.models import Recipe
+from recipe_app import images
+
+
+CONTENT = bytes(range(256)) * 4
+
+
+def media_url(name):
+  return f"/media/{name}"
+
+
+class RecipeMediaTests(TestCase):
+  """ Probar el servido de imagenes con control de propietario """
+
+  def setUp(self):
+    self.client = APIClient()
+    self.user = get_user_model().objects.create_user(
+      "test@gmail.com",
+      "testpass"
+    )
+    self.client.force_authenticate(self.user)
+    self.recipe = Recipe.objects.create(
+      user=self.user,
+      title="Pancakes",
+      time_minutes=10,
+      price=5.00
+    )
+    self.recipe.image.save("photo.jpg", ContentFile(CONTENT))
+    self.name = self.recipe.image.name
+
+  def tearDown(self):
+    storage = images.get_storage()
+    for name in self.recipe.image_renditions.values():
+      storage.delete(name)
+    self.recipe.image.delete()
+
+  def test_owner_gets_file(self):
+    """ Prueba que el propietario recibe el archivo con cache largo """
+
+    res = self.client.get(media_url(self.name))
+
+    self.assertEqual(res.status_code, status.HTTP_200_OK)
+    self.assertEqual(b"".join(res.streaming_content), CONTENT)
+    self.assertEqual(res["Content-Type"], "image/jpeg")
+    self.assertEqual(res["Accept-Ranges"], "bytes")
+    self.assertIn("immutable", res["Cache-Control"])
+
+  def test_other_user_gets_404(self):
+    """ Prueba que otro usuario no puede ver la imagen """
+
+    other = get_user_model().objects.create_user("other@gmail.com", "pass")
+    self.client.force_authenticate(other)
+
+    res = self.client.get(media_url(self.name))
+
+    self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+  def test_unauthenticated_rejected(self):
+    """ Prueba que se requiere autenticacion """
+
+    res = APIClient().get(media_url(self.name))
+
+    self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+  def test_rendition_served_to_owner(self):
+    """ Prueba que las versiones derivadas tambien se sirven """
+
+    name = images.get_storage().save_as(
+      images.rendition_name(self.name, "thumbnail"),
+      ContentFile(b"thumb")
+    )
+    self.recipe.image_renditions = {"thumbnail": name}
+    self.recipe.save()
+
+    res = self.client.get(media_url(name))
+
+    self.assertEqual(res.status_code, status.HTTP_200_OK)
+    self.assertEqual(b"".join(res.streaming_content), b"thumb")
+
+  def test_unknown_rendition_404(self):
+    """ Prueba que un nombre parecido a una version no registrada da 404 """
+
+    name = images.rendition_name(self.name, "medium")
+
+    res = self.client.get(media_url(name))
+
+    self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+  def test_range_request(self):
+    """ Prueba una peticion parcial con Range """
+
+    res = self.client.get(media_url(self.name), HTTP_RANGE="bytes=10-19")
+
+    self.assertEqual(res.status_code, status.HTTP_206_PARTIAL_CONTENT)
+    self.assertEqual(b"".join(res.streaming_content), CONTENT[10:20])
+    self.assertEqual(res["Content-Range"], f"bytes 10-19/{len(CONTENT)}")
+    self.assertEqual(res["Content-Length"], "10")
+
+  def test_suffix_range_request(self):
+    """ Prueba un rango de sufijo (ultimos N bytes) """
+
+    res = self.client.get(media_url(self.name), HTTP_RANGE="bytes=-5")
+
+    self.assertEqual(res.status_code, status.HTTP_206_PARTIAL_CONTENT)
+    self.assertEqual(b"".join(res.streaming_content), CONTENT[-5:])
+
+  def test_unsatisfiable_range(self):
+    """ Prueba 416 con un rango fuera del archivo """
+
+    res = self.client.get(
+      media_url(self.name),
+      HTTP_RANGE=f"bytes={len(CONTENT)}-"
+    )
+
+    self.assertEqual(res.status_code, 416)
+    self.assertEqual(res["Content-Range"], f"bytes */{len(CONTENT)}")
+
+  @override_settings(
+    MEDIA_SENDFILE_BACKEND="x-accel-redirect",
+    MEDIA_ACCEL_REDIRECT_PREFIX="/protected-media/"
+  )
+  def test_x_accel_redirect(self):
+    """ Prueba que con nginx solo se envia la cabecera interna """
+
+    res = self.client.get(media_url(self.name))
+
+    self.assertEqual(res.status_code, status.HTTP_200_OK)
+    self.assertEqual(res["X-Accel-Redirect"], f"/protected-media/{self.name}")
+    self.assertEqual(res.content, b"")
+    self.assertIn("immutable", res["Cache-Control"])
+
+  @override_settings(MEDIA_SENDFILE_BACKEND="x-sendfile")
+  def test_x_sendfile(self):
+    """ Prueba que con X-Sendfile se envia la ruta absoluta """
+
+    res = self.client.get(media_url(self.name))
+
+    self.assertEqual(res["X-Sendfile"], self.recipe.image.path)
+    self.assertEqual(res.content, b"")
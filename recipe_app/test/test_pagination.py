@@ -0,0 +1,143 @@
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.urls import reverse
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from app_core.models import Recipe, Tag
+
+
+TAG_URL = reverse("recipe_app:tag-list")
+RECIPE_URL = reverse("recipe_app:recipe-list")
+
+
+def sample_recipe(user, **params):
+  """ Crear y retornar Receta """
+
+  defaults = {
+    "title": "Sample recipe",
+    "time_minutes": 10,
+    "price": 5.00
+  }
+  defaults.update(params)
+
+  return Recipe.objects.create(user=user, **defaults)
+
+
+class PaginationApiTests(TestCase):
+  """ Probar la paginacion keyset y offset de recipe_app """
+
+  def setUp(self):
+    self.client = APIClient()
+    self.user = get_user_model().objects.create_user(
+      "test@gmail.com",
+      "testpass"
+    )
+    self.client.force_authenticate(self.user)
+
+  def _walk(self, url, params):
+    """ Recorrer todas las paginas siguiendo los enlaces next """
+
+    seen = []
+    res = self.client.get(url, params)
+    while True:
+      self.assertEqual(res.status_code, status.HTTP_200_OK)
+      seen.extend(item["id"] for item in res.data["results"])
+      if not res.data["next"]:
+        return seen
+      res = self.client.get(res.data["next"])
+
+  def test_keyset_walks_tags_without_duplicates(self):
+    """ Prueba recorrer tags por cursor sin repetir ni saltar ninguno """
+
+    for name in ["Lunch", "Dinner", "Supper", "Brunch", "Tea", "Snack"]:
+      Tag.objects.create(user=self.user, name=name)
+
+    seen = self._walk(TAG_URL, {"page_size": 2})
+
+    expected = list(
+      Tag.objects.order_by("-name", "id").values_list("id", flat=True)
+    )
+    self.assertEqual(seen, expected)
+
+  def test_keyset_previous_link(self):
+    """ Prueba que el enlace previous retorna la pagina anterior """
+
+    recipes = [sample_recipe(self.user, title=f"R{i}") for i in range(5)]
+
+    first = self.client.get(RECIPE_URL, {"page_size": 2})
+    second = self.client.get(first.data["next"])
+    back = self.client.get(second.data["previous"])
+
+    self.assertIsNone(first.data["previous"])
+    self.assertEqual(
+      [item["id"] for item in second.data["results"]],
+      [recipes[2].id, recipes[3].id]
+    )
+    self.assertEqual(back.data["results"], first.data["results"])
+
+  def test_keyset_deep_page_does_not_use_offset(self):
+    """ Prueba que una pagina profunda filtra por posicion y no por OFFSET """
+
+    for i in range(6):
+      sample_recipe(self.user, title=f"R{i}")
+
+    first = self.client.get(RECIPE_URL, {"page_size": 3})
+    with CaptureQueriesContext(connection) as ctx:
+      res = self.client.get(first.data["next"])
+
+    self.assertEqual(len(res.data["results"]), 3)
+    self.assertIsNone(res.data["next"])
+    self.assertFalse(
+      any("OFFSET" in query["sql"] for query in ctx.captured_queries)
+    )
+
+  def test_offset_mode_with_page_number(self):
+    """ Prueba paginacion por numero de pagina """
+
+    for i in range(3):
+      sample_recipe(self.user, title=f"R{i}")
+
+    res = self.client.get(RECIPE_URL, {"page": 2, "page_size": 2})
+
+    self.assertEqual(res.status_code, status.HTTP_200_OK)
+    self.assertEqual(res.data["count"], 3)
+    self.assertEqual(len(res.data["results"]), 1)
+    self.assertIsNone(res.data["next"])
+
+  def test_invalid_cursor(self):
+    """ Prueba que un cursor invalido retorna 404 """
+
+    res = self.client.get(RECIPE_URL, {"cursor": "not-a-cursor"})
+
+    self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+  def test_keyset_walks_recipes_by_price(self):
+    """ Prueba recorrer recetas por precio con empates y en ambos sentidos """
+
+    for i, price in enumerate(["3.50", "1.00", "3.50", "2.25", "1.00", "9.99"]):
+      sample_recipe(self.user, title=f"R{i}", price=price)
+
+    ascending = self._walk(RECIPE_URL, {"ordering": "price", "page_size": 2})
+    descending = self._walk(RECIPE_URL, {"ordering": "-price", "page_size": 2})
+
+    self.assertEqual(
+      ascending,
+      list(Recipe.objects.order_by("price", "id").values_list("id", flat=True))
+    )
+    self.assertEqual(descending, list(reversed(ascending)))
+
+  def test_keyset_previous_link_with_ordering(self):
+    """ Prueba volver atras recorriendo por tiempo """
+
+    for i in range(5):
+      sample_recipe(self.user, title=f"R{i}", time_minutes=50 - i)
+
+    first = self.client.get(RECIPE_URL, {"ordering": "time_minutes", "page_size": 2})
+    second = self.client.get(first.data["next"])
+    back = self.client.get(second.data["previous"])
+
+    self.assertEqual(back.data["results"], first.data["results"])
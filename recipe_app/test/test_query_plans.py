@@ -0,0 +1,127 @@
+from unittest import skipUnless
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.urls import reverse
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from app_core.models import Ingredient, Recipe, Tag
+
+
+TAG_URL = reverse("recipe_app:tag-list")
+INGREDIENT_URL = reverse("recipe_app:ingredient-list")
+RECIPE_URL = reverse("recipe_app:recipe-list")
+
+
+@skipUnless(connection.vendor == "sqlite", "EXPLAIN QUERY PLAN de SQLite")
+class ListQueryPlanTests(TestCase):
+  """ Probar que los listados usan indices y no recorren tablas completas """
+
+  def setUp(self):
+    self.client = APIClient()
+    self.user = get_user_model().objects.create_user(
+      "test@gmail.com",
+      "testpass"
+    )
+    self.client.force_authenticate(self.user)
+
+    self.tag = Tag.objects.create(user=self.user, name="Vegan")
+    self.ingredient = Ingredient.objects.create(user=self.user, name="Tofu")
+    recipe = Recipe.objects.create(
+      user=self.user,
+      title="Tofu curry",
+      time_minutes=30,
+      price=8.00
+    )
+    recipe.tags.add(self.tag)
+    recipe.ingredients.add(self.ingredient)
+
+  def _plans(self, url, params=None):
+    """ Retornar el plan de cada query ejecutada por un GET """
+
+    with CaptureQueriesContext(connection) as ctx:
+      res = self.client.get(url, params)
+    self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    plans = []
+    with connection.cursor() as cursor:
+      for query in ctx.captured_queries:
+        cursor.execute(f"EXPLAIN QUERY PLAN {query['sql']}")
+        plans.append([row[3] for row in cursor.fetchall()])
+
+    return plans
+
+  def _page_plan(self, url, params=None):
+    """ Plan de la query que lee la pagina de recetas (con LIMIT) """
+
+    with CaptureQueriesContext(connection) as ctx:
+      res = self.client.get(url, params)
+    self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    query = next(
+      query["sql"] for query in ctx.captured_queries
+      if query["sql"].startswith('SELECT "app_core_recipe"."id"')
+      and "LIMIT" in query["sql"]
+    )
+    with connection.cursor() as cursor:
+      cursor.execute(f"EXPLAIN QUERY PLAN {query}")
+      return " ".join(row[3] for row in cursor.fetchall())
+
+  def assertNoFullScan(self, url, params=None):
+    for plan in self._plans(url, params):
+      scans = [step for step in plan if step.startswith("SCAN")]
+      self.assertEqual(scans, [], plan)
+
+  def test_tag_list_uses_index(self):
+    """ Prueba que el listado de tags usa el indice (user, -name, id) """
+
+    plans = self._plans(TAG_URL)
+
+    self.assertIn("tag_user_name_idx", " ".join(plans[-1]))
+    self.assertNotIn("TEMP B-TREE", " ".join(plans[-1]))
+
+  def test_tag_and_ingredient_lists_no_full_scan(self):
+    """ Prueba los listados de tags e ingredientes con filtros """
+
+    self.assertNoFullScan(TAG_URL, {"assigned_only": 1, "with_usage": 1})
+    self.assertNoFullScan(INGREDIENT_URL, {"assigned_only": 1})
+
+  def test_recipe_list_no_full_scan(self):
+    """ Prueba el listado de recetas con y sin filtros """
+
+    self.assertNoFullScan(RECIPE_URL)
+    self.assertNoFullScan(RECIPE_URL, {
+      "tags": str(self.tag.id),
+      "ingredients": str(self.ingredient.id),
+      "match": "all",
+    })
+
+  def test_recipe_ordering_uses_range_index(self):
+    """ Prueba que ordering y los rangos usan los indices (user, campo, id) """
+
+    for ordering, index in (
+      ("price", "recipe_user_price_idx"),
+      ("-time_minutes", "recipe_user_time_idx"),
+    ):
+      plan = self._page_plan(RECIPE_URL, {
+        "ordering": ordering,
+        "max_time": 60,
+        "max_price": "10.00",
+      })
+      self.assertIn(index, plan)
+      self.assertNotIn("TEMP B-TREE", plan)
+      self.assertNoFullScan(RECIPE_URL, {"ordering": ordering})
+
+  def test_recipe_ordering_cursor_seeks_index(self):
+    """ Prueba que la pagina siguiente empieza en la posicion del cursor """
+
+    Recipe.objects.create(user=self.user, title="B", time_minutes=5, price=9)
+    first = self.client.get(RECIPE_URL, {"ordering": "price", "page_size": 1})
+
+    plan = self._page_plan(first.data["next"])
+
+    self.assertIn("recipe_user_price_idx (user_id=? AND price>?)", plan)
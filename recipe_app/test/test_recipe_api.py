@@ -1,6 +1,8 @@
 from django.contrib.auth import get_user_model
 from django.urls import reverse
-from django.test import TestCase
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.db import connection
 
 from rest_framework import status
 from rest_framework.test import APIClient
@@ -8,6 +10,7 @@ from rest_framework.test import APIClient
 from app_core.models import Recipe, Tag, Ingredient
 
 from recipe_app.serializers import RecipeSerializer, RecipeDetailSerializer
+from recipe_app import images
 
 import tempfile
 import os
@@ -85,7 +88,7 @@ class PrivateRecipeApiTests(TestCase):
     recipes = Recipe.objects.all().order_by("id")
     serializer = RecipeSerializer(recipes, many=True)
     self.assertEqual(res.status_code, status.HTTP_200_OK)
-    self.assertEqual(res.data, serializer.data)
+    self.assertEqual(res.data["results"], serializer.data)
 
   def test_recipes_limited_to_user(self):
     """ Probar obtener receta para un usuario """
@@ -104,8 +107,8 @@ class PrivateRecipeApiTests(TestCase):
     serializer = RecipeSerializer(recipes, many=True)
 
     self.assertEqual(res.status_code, status.HTTP_200_OK)
-    self.assertEqual(len(res.data), 1)
-    self.assertEqual(res.data, serializer.data)
+    self.assertEqual(len(res.data["results"]), 1)
+    self.assertEqual(res.data["results"], serializer.data)
   
 
   def test_view_recipe_detail(self):
@@ -121,6 +124,230 @@ class PrivateRecipeApiTests(TestCase):
     self.assertEqual(res.data, serializer.data)
 
 
+  def _count_queries(self, url):
+    """ Contar queries ejecutadas por un GET """
+
+    with CaptureQueriesContext(connection) as ctx:
+      res = self.client.get(url)
+
+    self.assertEqual(res.status_code, status.HTTP_200_OK)
+    return len(ctx.captured_queries)
+
+  def _sample_recipe_with_relations(self, index):
+    """ Crear receta con un tag y un ingrediente """
+
+    recipe = sample_recipe(user=self.user, title=f"Recipe {index}")
+    recipe.tags.add(sample_tag(user=self.user, name=f"Tag {index}"))
+    recipe.ingredients.add(
+      sample_ingredient(user=self.user, name=f"Ingredient {index}")
+    )
+    return recipe
+
+  def test_list_recipes_query_count_constant(self):
+    """ Prueba que el listado no hace N+1 queries """
+
+    for index in range(2):
+      self._sample_recipe_with_relations(index)
+    queries_small = self._count_queries(RECIPE_URL)
+
+    for index in range(2, 12):
+      self._sample_recipe_with_relations(index)
+    queries_large = self._count_queries(RECIPE_URL)
+
+    self.assertEqual(queries_small, queries_large)
+
+  def test_view_recipe_detail_query_count(self):
+    """ Prueba que el detalle usa un numero fijo de queries """
+
+    recipe = self._sample_recipe_with_relations(0)
+    for index in range(1, 6):
+      recipe.tags.add(sample_tag(user=self.user, name=f"Extra {index}"))
+      recipe.ingredients.add(
+        sample_ingredient(user=self.user, name=f"Extra {index}")
+      )
+
+    # Validadores ETag, receta, tags e ingredientes
+    with self.assertNumQueries(4):
+      res = self.client.get(detail_url(recipe.id))
+
+    self.assertEqual(res.data, RecipeDetailSerializer(recipe).data)
+
+  def test_filter_recipes_no_duplicates(self):
+    """ Prueba que filtrar por varios tags no duplica recetas """
+
+    recipe = sample_recipe(user=self.user)
+    tag1 = sample_tag(user=self.user, name="Vegan")
+    tag2 = sample_tag(user=self.user, name="Dessert")
+    recipe.tags.add(tag1, tag2)
+
+    res = self.client.get(RECIPE_URL, {"tags": f"{tag1.id},{tag2.id}"})
+
+    self.assertEqual(len(res.data["results"]), 1)
+
+  def test_filter_recipes_match_all_tags(self):
+    """ Prueba filtrar recetas que tienen todos los tags """
+
+    tag1 = sample_tag(user=self.user, name="Vegan")
+    tag2 = sample_tag(user=self.user, name="Dessert")
+    recipe1 = sample_recipe(user=self.user, title="Vegan brownie")
+    recipe1.tags.add(tag1, tag2)
+    recipe2 = sample_recipe(user=self.user, title="Vegan curry")
+    recipe2.tags.add(tag1)
+
+    res = self.client.get(
+      RECIPE_URL,
+      {"tags": f"{tag1.id},{tag2.id}", "match": "all"}
+    )
+
+    ids = [item["id"] for item in res.data["results"]]
+    self.assertEqual(ids, [recipe1.id])
+
+  def test_filter_recipes_invalid_params(self):
+    """ Prueba que filtros invalidos retornan 400 """
+
+    res = self.client.get(RECIPE_URL, {"tags": "1,abc"})
+    self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    for ids in ("99999999999999999999999", str(2 ** 63), "0", "-1"):
+      res = self.client.get(RECIPE_URL, {"tags": ids})
+      self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST, ids)
+      res = self.client.get(RECIPE_URL, {"ingredients": ids})
+      self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST, ids)
+
+    res = self.client.get(RECIPE_URL, {"tags": "1", "match": "some"})
+    self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+  def test_filter_recipes_by_time_and_price(self):
+    """ Prueba filtrar recetas rapidas y baratas """
+
+    quick_cheap = sample_recipe(user=self.user, time_minutes=15, price=4.00)
+    sample_recipe(user=self.user, time_minutes=90, price=4.00)
+    sample_recipe(user=self.user, time_minutes=15, price=25.00)
+    sample_recipe(user=self.user, time_minutes=15, price=1.00)
+
+    res = self.client.get(RECIPE_URL, {
+      "max_time": 20,
+      "min_price": "2",
+      "max_price": "5.50",
+    })
+
+    ids = [item["id"] for item in res.data["results"]]
+    self.assertEqual(ids, [quick_cheap.id])
+
+  def test_filter_recipes_rounds_bounds_to_field(self):
+    """ Prueba limites con mas decimales que el campo y en forma exponencial """
+
+    recipe1 = sample_recipe(user=self.user, time_minutes=20, price=2.00)
+    recipe2 = sample_recipe(user=self.user, time_minutes=20, price=5.50)
+
+    res = self.client.get(RECIPE_URL, {"min_price": "2.001", "max_time": "2e1"})
+    self.assertEqual([item["id"] for item in res.data["results"]], [recipe2.id])
+
+    res = self.client.get(RECIPE_URL, {"max_price": "5.499", "max_time": "20.9"})
+    self.assertEqual([item["id"] for item in res.data["results"]], [recipe1.id])
+
+  def test_order_recipes(self):
+    """ Prueba ordenar recetas por precio y tiempo """
+
+    recipe1 = sample_recipe(user=self.user, time_minutes=30, price=9.00)
+    recipe2 = sample_recipe(user=self.user, time_minutes=10, price=3.00)
+    recipe3 = sample_recipe(user=self.user, time_minutes=20, price=3.00)
+
+    res = self.client.get(RECIPE_URL, {"ordering": "price"})
+    self.assertEqual(
+      [item["id"] for item in res.data["results"]],
+      [recipe2.id, recipe3.id, recipe1.id]
+    )
+
+    res = self.client.get(RECIPE_URL, {"ordering": "-time_minutes"})
+    self.assertEqual(
+      [item["id"] for item in res.data["results"]],
+      [recipe1.id, recipe3.id, recipe2.id]
+    )
+
+  def test_range_and_ordering_invalid_params(self):
+    """ Prueba que rangos u ordenes invalidos retornan 400 """
+
+    for params in (
+      {"max_time": "soon"},
+      {"min_price": "-1"},
+      {"max_price": "nan"},
+      {"max_time": "99999999999999999999999"},
+      {"max_time": "1e30"},
+      {"max_time": str(2 ** 31)},
+      {"min_price": "1e30"},
+      {"max_price": "1000"},
+      {"ordering": "title"},
+    ):
+      res = self.client.get(RECIPE_URL, params)
+      self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST, params)
+
+  def test_sparse_fields_list(self):
+    """ Prueba que ``fields`` limita campos, columnas y prefetch """
+
+    self._sample_recipe_with_relations(0)
+
+    with CaptureQueriesContext(connection) as ctx:
+      res = self.client.get(RECIPE_URL, {"fields": "title,price"})
+
+    self.assertEqual(res.status_code, status.HTTP_200_OK)
+    self.assertEqual(set(res.data["results"][0]), {"id", "title", "price"})
+
+    sql = " ".join(query["sql"] for query in ctx.captured_queries)
+    self.assertNotIn('"app_core_recipe"."link"', sql)
+    self.assertNotIn("app_core_recipe_tags", sql)
+    self.assertNotIn("app_core_recipe_ingredients", sql)
+
+  def test_sparse_fields_keep_ordering_cursor(self):
+    """ Prueba que el cursor funciona aunque no se pida el campo del orden """
+
+    sample_recipe(user=self.user, price=3.00)
+    sample_recipe(user=self.user, price=1.00)
+
+    res = self.client.get(
+      RECIPE_URL,
+      {"fields": "title", "ordering": "price", "page_size": 1}
+    )
+    res = self.client.get(res.data["next"])
+
+    self.assertEqual(res.status_code, status.HTTP_200_OK)
+    self.assertEqual(set(res.data["results"][0]), {"id", "title"})
+
+  def test_expand_relations(self):
+    """ Prueba anidar tags en el listado y quitarlos del detalle """
+
+    recipe = self._sample_recipe_with_relations(0)
+    tag = recipe.tags.get()
+
+    res = self.client.get(RECIPE_URL, {"expand": "tags"})
+    item = res.data["results"][0]
+    self.assertEqual(item["tags"], [{"id": tag.id, "name": tag.name}])
+    self.assertEqual(item["ingredients"], [recipe.ingredients.get().id])
+
+    # Validadores ETag, receta e ingredientes (sin expandir: solo IDs)
+    with self.assertNumQueries(3):
+      res = self.client.get(
+        detail_url(recipe.id),
+        {"fields": "title,ingredients", "expand": ""}
+      )
+    self.assertEqual(
+      res.data,
+      {"id": recipe.id, "title": recipe.title, "ingredients": [
+        recipe.ingredients.get().id
+      ]}
+    )
+
+  def test_sparse_fields_invalid_names(self):
+    """ Prueba que campos o relaciones desconocidos retornan 400 """
+
+    for params in (
+      {"fields": "title,user"},
+      {"expand": "title"},
+      {"expand": "owner"},
+    ):
+      res = self.client.get(RECIPE_URL, params)
+      self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST, params)
+
   def test_create_basic_recipe(self):
     """ Probar crear recetas """
 
@@ -185,6 +412,62 @@ class PrivateRecipeApiTests(TestCase):
     self.assertIn(ingredient2, ingredients)
 
 
+  def test_create_recipe_validation_queries_constant(self):
+    """ Prueba que validar los ingredientes no hace una query por ID """
+
+    def count(size, offset):
+      ingredients = [
+        sample_ingredient(user=self.user, name=f"Ingredient {offset + i}")
+        for i in range(size)
+      ]
+      payload = {
+        "title": "Many ingredients",
+        "ingredients": [ingredient.id for ingredient in ingredients],
+        "tags": [],
+        "time_minutes": 30,
+        "price": 10.00
+      }
+      with CaptureQueriesContext(connection) as ctx:
+        res = self.client.post(RECIPE_URL, payload, format="json")
+      self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+      return len(ctx.captured_queries)
+
+    self.assertEqual(count(2, 0), count(50, 100))
+
+  def test_create_recipe_with_other_user_tag(self):
+    """ Prueba que no se pueden usar tags de otro usuario """
+
+    user2 = get_user_model().objects.create_user("other@gmail.com", "pass")
+    tag = sample_tag(user=user2)
+    payload = {
+      "title": "Stolen tag",
+      "tags": [tag.id],
+      "time_minutes": 30,
+      "price": 10.00
+    }
+
+    res = self.client.post(RECIPE_URL, payload, format="json")
+
+    self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+    self.assertFalse(Recipe.objects.exists())
+
+  def test_create_recipe_reports_all_missing_ids(self):
+    """ Prueba que se reportan todos los IDs invalidos a la vez """
+
+    ingredient = sample_ingredient(user=self.user)
+    payload = {
+      "title": "Missing ingredients",
+      "ingredients": [ingredient.id, 9998, 9999],
+      "time_minutes": 30,
+      "price": 10.00
+    }
+
+    res = self.client.post(RECIPE_URL, payload, format="json")
+
+    self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+    self.assertEqual(len(res.data["ingredients"]), 2)
+
+
 class RecipeImageUploadTests(TestCase):
   """  """
 
@@ -243,9 +526,9 @@ class RecipeImageUploadTests(TestCase):
     serializer2 = RecipeSerializer(recipe2)
     serializer3 = RecipeSerializer(recipe3)
 
-    self.assertIn(serializer1.data, res.data)
-    self.assertIn(serializer2.data, res.data)
-    self.assertNotIn(serializer3.data, res.data)
+    self.assertIn(serializer1.data, res.data["results"])
+    self.assertIn(serializer2.data, res.data["results"])
+    self.assertNotIn(serializer3.data, res.data["results"])
 
   def test_filter_recipes_by_ingredients(self):
     """ Test filtrar recetas por ingredientes """
@@ -269,6 +552,103 @@ class RecipeImageUploadTests(TestCase):
     serializer2 = RecipeSerializer(recipe2)
     serializer3 = RecipeSerializer(recipe3)
 
-    self.assertIn(serializer1.data, res.data)
-    self.assertIn(serializer2.data, res.data)
-    self.assertNotIn(serializer3.data, res.data)
\ No newline at end of file
+    self.assertIn(serializer1.data, res.data["results"])
+    self.assertIn(serializer2.data, res.data["results"])
+    self.assertNotIn(serializer3.data, res.data["results"])
+
+
+@override_settings(RECIPE_IMAGE_WORKERS=0)
+class RecipeImageProcessingTests(TestCase):
+  """ Probar el procesado de versiones de imagen """
+
+  def setUp(self):
+    self.client = APIClient()
+    self.user = get_user_model().objects.create_user("user", "testpass")
+    self.client.force_authenticate(self.user)
+    self.recipe = sample_recipe(user=self.user)
+
+  def tearDown(self):
+    self.recipe.refresh_from_db()
+    storage = images.get_storage()
+    for name in self.recipe.image_renditions.values():
+      storage.delete(name)
+    self.recipe.image.delete()
+
+  def _upload(self, size=(1200, 900)):
+    """ Subir un JPEG con metadatos EXIF """
+
+    with tempfile.NamedTemporaryFile(suffix=".jpg") as ntf:
+      img = Image.new("RGB", size, color="red")
+      exif = Image.Exif()
+      exif[0x010f] = "Test camera"
+      img.save(ntf, format="JPEG", exif=exif.tobytes())
+      ntf.seek(0)
+      with self.captureOnCommitCallbacks(execute=True) as callbacks:
+        res = self.client.post(
+          image_upload_url(self.recipe.id),
+          {"image": ntf},
+          format="multipart"
+        )
+
+    return res, callbacks
+
+  def test_upload_returns_before_processing(self):
+    """ Prueba que la subida no espera a las versiones """
+
+    res, callbacks = self._upload()
+
+    self.assertEqual(res.status_code, status.HTTP_200_OK)
+    self.assertEqual(res.data["image_renditions"], {})
+    # Ademas de las rotaciones de version del cache al confirmar
+    scheduled = [
+      callback for callback in callbacks
+      if callback.__qualname__.startswith("schedule_renditions")
+    ]
+    self.assertEqual(len(scheduled), 1)
+
+  def test_renditions_generated(self):
+    """ Prueba que se generan miniatura, mediana y WebP sin EXIF """
+
+    self._upload()
+    self.recipe.refresh_from_db()
+    storage = images.get_storage()
+
+    self.assertEqual(
+      set(self.recipe.image_renditions),
+      {"thumbnail", "medium", "webp"}
+    )
+    with storage.open(self.recipe.image_renditions["thumbnail"]) as f:
+      thumbnail = Image.open(f)
+      self.assertLessEqual(max(thumbnail.size), 200)
+      self.assertEqual(len(thumbnail.getexif()), 0)
+    with storage.open(self.recipe.image_renditions["webp"]) as f:
+      self.assertEqual(Image.open(f).format, "WEBP")
+
+  def test_detail_exposes_rendition_urls(self):
+    """ Prueba que el detalle incluye las URLs de las versiones """
+
+    self._upload()
+
+    res = self.client.get(detail_url(self.recipe.id))
+
+    self.assertTrue(
+      res.data["image_renditions"]["thumbnail"].startswith("http://")
+    )
+
+  def test_clear_image(self):
+    """ Prueba que quitar la imagen no encola el procesado """
+
+    self._upload()
+    self.recipe.refresh_from_db()
+    name = self.recipe.image.name
+
+    with self.captureOnCommitCallbacks(execute=True):
+      res = self.client.post(
+        image_upload_url(self.recipe.id),
+        {"image": None},
+        format="json"
+      )
+
+    self.assertEqual(res.status_code, status.HTTP_200_OK)
+    self.assertIsNone(res.data["image"])
+    self.assertFalse(images.get_storage().exists(name))
@@ -0,0 +1,120 @@
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.db.models import Prefetch
+from django.test import TestCase
+
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from app_core.models import Ingredient, Recipe, Tag
+from recipe_app import serializers
+from recipe_app.views import RECIPE_DETAIL_FIELDS, RECIPE_LIST_FIELDS
+
+
+class RowSerializerTests(TestCase):
+  """ Probar que los serializadores de filas emiten el mismo JSON """
+
+  def setUp(self):
+    self.user = get_user_model().objects.create_user(
+      "test@gmail.com",
+      "testpass"
+    )
+    tags = [Tag.objects.create(user=self.user, name=f"Tag {i}") for i in range(3)]
+    ingredients = [
+      Ingredient.objects.create(user=self.user, name=f"Ingrediente {i}")
+      for i in range(3)
+    ]
+
+    for index in range(4):
+      recipe = Recipe.objects.create(
+        user=self.user,
+        title=f"Receta {index}",
+        time_minutes=10 * index,
+        price=Decimal("4.5") + index,
+        link="https://example.com" if index % 2 else "",
+        image_renditions={"thumb": f"uploads/recipe/r{index}-thumb.webp"}
+        if index else {}
+      )
+      # Enlaces en desorden: ambos caminos ordenan por id
+      recipe.tags.add(*tags[index % 3:][::-1])
+      recipe.ingredients.add(*ingredients[:index])
+
+  def _request(self, params=None):
+    return Request(APIRequestFactory().get("/", params or {}))
+
+  def _render(self, data):
+    return JSONRenderer().render(data)
+
+  def _model_data(self, serializer_class, request, many=True):
+    queryset = Recipe.objects.order_by("id").prefetch_related(
+      Prefetch("tags", queryset=Tag.objects.order_by("id")),
+      Prefetch("ingredients", queryset=Ingredient.objects.order_by("id")),
+    )
+    instance = queryset if many else queryset.first()
+    return serializer_class(
+      instance,
+      many=many,
+      context={"request": request}
+    ).data
+
+  def _row_data(self, serializer_class, columns, request, many=True):
+    rows = Recipe.objects.order_by("id").values(*columns)
+    instance = rows if many else rows.first()
+    return serializer_class(
+      instance,
+      many=many,
+      context={"request": request}
+    ).data
+
+  def test_list_json_identical(self):
+    """ Prueba el listado con y sin ``fields`` / ``expand`` """
+
+    for params in (
+      {},
+      {"expand": "tags,ingredients"},
+      {"fields": "title,tags,price", "expand": "tags"},
+      {"fields": "link"},
+    ):
+      request = self._request(params)
+      self.assertEqual(
+        self._render(self._row_data(
+          serializers.RecipeRowSerializer, RECIPE_LIST_FIELDS, request
+        )),
+        self._render(self._model_data(serializers.RecipeSerializer, request)),
+        params
+      )
+
+  def test_detail_json_identical(self):
+    """ Prueba el detalle, con relaciones anidadas y URLs de imagenes """
+
+    for params in ({}, {"expand": ""}, {"fields": "image_renditions"}):
+      request = self._request(params)
+      self.assertEqual(
+        self._render(self._row_data(
+          serializers.RecipeDetailRowSerializer,
+          RECIPE_DETAIL_FIELDS,
+          request,
+          many=False
+        )),
+        self._render(self._model_data(
+          serializers.RecipeDetailSerializer,
+          request,
+          many=False
+        )),
+        params
+      )
+
+  def test_list_relations_single_query(self):
+    """ Prueba una query por relacion para toda la pagina """
+
+    request = self._request()
+    rows = list(Recipe.objects.order_by("id").values(*RECIPE_LIST_FIELDS))
+
+    with self.assertNumQueries(2):
+      serializers.RecipeRowSerializer(
+        rows,
+        many=True,
+        context={"request": request}
+      ).data
@@ -0,0 +1,141 @@
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from django.test import TestCase
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from app_core.models import Ingredient, Recipe, Tag
+
+
+RECIPE_URL = reverse("recipe_app:recipe-list")
+BULK_URL = reverse("recipe_app:recipe-bulk")
+
+
+def sample_recipe(user, **params):
+  """ Crear y retornar Receta """
+
+  defaults = {
+    "title": "Sample recipe",
+    "time_minutes": 10,
+    "price": 5.00
+  }
+  defaults.update(params)
+
+  return Recipe.objects.create(user=user, **defaults)
+
+
+class RecipeSearchTests(TestCase):
+  """ Probar la busqueda de texto completo de recetas """
+
+  def setUp(self):
+    self.client = APIClient()
+    self.user = get_user_model().objects.create_user(
+      "test@gmail.com",
+      "testpass"
+    )
+    self.client.force_authenticate(self.user)
+
+  def search(self, query):
+    res = self.client.get(RECIPE_URL, {"search": query})
+    self.assertEqual(res.status_code, status.HTTP_200_OK)
+    return [item["title"] for item in res.data["results"]]
+
+  def test_search_title_tags_and_ingredients(self):
+    """ Prueba buscar por titulo, nombre de tag y de ingrediente """
+
+    curry = sample_recipe(self.user, title="Thai curry")
+    curry.tags.add(Tag.objects.create(user=self.user, name="Spicy"))
+    curry.ingredients.add(
+      Ingredient.objects.create(user=self.user, name="Coconut")
+    )
+    sample_recipe(self.user, title="Pancakes")
+
+    self.assertEqual(self.search("curry"), ["Thai curry"])
+    self.assertEqual(self.search("spicy"), ["Thai curry"])
+    self.assertEqual(self.search("coco"), ["Thai curry"])
+    self.assertEqual(self.search("thai coconut"), ["Thai curry"])
+    self.assertEqual(self.search("thai pancakes"), [])
+
+  def test_title_match_ranked_first(self):
+    """ Prueba que coincidir en el titulo puntua mas que en un ingrediente """
+
+    lemon = Ingredient.objects.create(user=self.user, name="Lemon")
+    sample_recipe(self.user, title="Fish tacos").ingredients.add(lemon)
+    sample_recipe(self.user, title="Lemon pie")
+
+    self.assertEqual(self.search("lemon"), ["Lemon pie", "Fish tacos"])
+
+  def test_search_limited_to_user(self):
+    """ Prueba que no se encuentran recetas de otros usuarios """
+
+    other = get_user_model().objects.create_user("other@gmail.com", "pass")
+    sample_recipe(other, title="Secret curry")
+
+    self.assertEqual(self.search("curry"), [])
+
+  def test_search_uses_offset_pagination(self):
+    """ Prueba que la busqueda pagina por numero de pagina """
+
+    sample_recipe(self.user, title="Curry")
+
+    res = self.client.get(RECIPE_URL, {"search": "curry"})
+
+    self.assertEqual(res.data["count"], 1)
+
+  def test_query_syntax_is_ignored(self):
+    """ Prueba que la sintaxis del motor no provoca errores """
+
+    sample_recipe(self.user, title="Curry")
+
+    self.assertEqual(self.search('cur* "(curry)'), ["Curry"])
+    self.assertEqual(self.search("***"), [])
+
+  def test_index_follows_updates(self):
+    """ Prueba que renombrar y borrar actualiza el indice """
+
+    recipe = sample_recipe(self.user, title="Curry")
+    tag = Tag.objects.create(user=self.user, name="Spicy")
+    recipe.tags.add(tag)
+
+    recipe.title = "Stew"
+    recipe.save()
+    self.assertEqual(self.search("curry"), [])
+    self.assertEqual(self.search("stew"), ["Stew"])
+
+    tag.name = "Mild"
+    tag.save()
+    self.assertEqual(self.search("spicy"), [])
+    self.assertEqual(self.search("mild"), ["Stew"])
+
+    tag.delete()
+    self.assertEqual(self.search("mild"), [])
+
+    recipe.delete()
+    self.assertEqual(self.search("stew"), [])
+
+  def test_index_follows_link_changes(self):
+    """ Prueba enlazar y desenlazar desde ambos lados de la relacion """
+
+    recipe = sample_recipe(self.user, title="Curry")
+    ingredient = Ingredient.objects.create(user=self.user, name="Rice")
+
+    ingredient.recipe_set.add(recipe)
+    self.assertEqual(self.search("rice"), ["Curry"])
+
+    ingredient.recipe_set.clear()
+    self.assertEqual(self.search("rice"), [])
+
+    recipe.ingredients.add(ingredient)
+    recipe.ingredients.clear()
+    self.assertEqual(self.search("rice"), [])
+
+  def test_bulk_create_indexed(self):
+    """ Prueba que las recetas creadas en bloque se pueden buscar """
+
+    self.client.post(BULK_URL, [
+      {"title": f"Bulk curry {i}", "time_minutes": 5, "price": "1.00"}
+      for i in range(3)
+    ], format="json")
+
+    self.assertEqual(len(self.search("curry")), 3)
@@ -1,6 +1,8 @@
 from django.contrib.auth import get_user_model
 from django.urls import reverse
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.db import connection
 
 from rest_framework import status
 from rest_framework.test import APIClient
@@ -49,7 +51,7 @@ class PrivateTagsApiTests(TestCase):
     serializer = TagSerializer(tags, many=True)
 
     self.assertEqual(res.status_code, status.HTTP_200_OK)
-    self.assertEqual(res.data, serializer.data)
+    self.assertEqual(res.data["results"], serializer.data)
 
   def test_tags_limited_to_user(self):
     """ Probar que los tags que retornamos sean del usuario """
@@ -65,8 +67,8 @@ class PrivateTagsApiTests(TestCase):
     res = self.client.get(TAG_URL)
 
     self.assertEqual(res.status_code, status.HTTP_200_OK)
-    self.assertEqual(len(res.data), 1)
-    self.assertEqual(res.data[0]["name"], tag.name)
+    self.assertEqual(len(res.data["results"]), 1)
+    self.assertEqual(res.data["results"][0]["name"], tag.name)
 
 
   def test_create_tag_successful(self):
@@ -82,6 +84,50 @@ class PrivateTagsApiTests(TestCase):
     
     self.assertTrue(exists)
   
+  def test_create_tag_upsert(self):
+    """ Prueba que crear un nombre repetido retorna el tag existente """
+
+    res = self.client.post(TAG_URL, {"name": "Salt"})
+    self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+
+    with self.assertNumQueries(1):
+      again = self.client.post(TAG_URL, {"name": "SALT"})
+
+    self.assertEqual(again.status_code, status.HTTP_200_OK)
+    self.assertEqual(again.data, {"id": res.data["id"], "name": "Salt"})
+    self.assertEqual(Tag.objects.filter(user=self.user).count(), 1)
+
+    other = get_user_model().objects.create_user("other@gmail.com", "testpass")
+    self.client.force_authenticate(other)
+    res = self.client.post(TAG_URL, {"name": "salt"})
+    self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+
+  def test_create_tag_upsert_non_ascii(self):
+    """ Prueba mayusculas no ASCII: LOWER de SQLite solo convierte ASCII """
+
+    res = self.client.post(TAG_URL, {"name": "Émile"})
+    again = self.client.post(TAG_URL, {"name": "émile"})
+    repeated = self.client.post(TAG_URL, {"name": "ÉMILE"})
+
+    self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+    self.assertEqual(repeated.status_code, status.HTTP_200_OK)
+    self.assertEqual(repeated.data["id"], res.data["id"])
+    if connection.vendor == "sqlite":
+      self.assertEqual(again.status_code, status.HTTP_201_CREATED)
+      self.assertEqual(Tag.objects.filter(user=self.user).count(), 2)
+    else:
+      self.assertEqual(again.status_code, status.HTTP_200_OK)
+
+  def test_create_tag_invalidates_list(self):
+    """ Prueba que un tag nuevo aparece en el listado ya cacheado """
+
+    self.client.get(TAG_URL)
+    self.client.post(TAG_URL, {"name": "Salt"})
+
+    res = self.client.get(TAG_URL)
+
+    self.assertEqual([tag["name"] for tag in res.data["results"]], ["Salt"])
+
   def test_create_tag_invalid(self):
     """ Prueba creando nuevo tag con payload invalido """
 
@@ -110,8 +156,8 @@ class PrivateTagsApiTests(TestCase):
     serializer1 =  TagSerializer(tag1)
     serializer2 =  TagSerializer(tag2)
 
-    self.assertIn(serializer1.data, res.data)
-    self.assertNotIn(serializer2.data, res.data)
+    self.assertIn(serializer1.data, res.data["results"])
+    self.assertNotIn(serializer2.data, res.data["results"])
 
   def test_retrieve_tags_assigned_unique(self):
     """ Prueba filtro tags asignado por items unicos """
@@ -136,4 +182,52 @@ class PrivateTagsApiTests(TestCase):
 
     res = self.client.get(TAG_URL, {"assigned_only":1})
 
-    self.assertEqual(len(res.data), 1)
\ No newline at end of file
+    self.assertEqual(len(res.data["results"]), 1)
+
+  def test_retrieve_tags_assigned_without_distinct(self):
+    """ Prueba que assigned_only usa EXISTS y no DISTINCT """
+
+    tag = Tag.objects.create(user=self.user, name="Breakfast")
+    recipe = Recipe.objects.create(
+      title="Pancakes",
+      time_minutes=5,
+      price=3.00,
+      user=self.user
+    )
+    recipe.tags.add(tag)
+
+    with CaptureQueriesContext(connection) as ctx:
+      res = self.client.get(TAG_URL, {"assigned_only": 1})
+
+    sql = " ".join(query["sql"] for query in ctx.captured_queries)
+    self.assertEqual(len(res.data["results"]), 1)
+    self.assertIn("EXISTS", sql)
+    self.assertNotIn("DISTINCT", sql)
+
+  def test_retrieve_tags_with_usage(self):
+    """ Prueba retornar el numero de recetas de cada tag """
+
+    tag1 = Tag.objects.create(user=self.user, name="Breakfast")
+    tag2 = Tag.objects.create(user=self.user, name="Lunch")
+    for title in ("Pancakes", "Porridge"):
+      recipe = Recipe.objects.create(
+        title=title,
+        time_minutes=5,
+        price=3.00,
+        user=self.user
+      )
+      recipe.tags.add(tag1)
+
+    res = self.client.get(TAG_URL, {"with_usage": 1})
+
+    usage = {item["id"]: item["usage"] for item in res.data["results"]}
+    self.assertEqual(usage, {tag1.id: 2, tag2.id: 0})
+
+  def test_retrieve_tags_without_usage(self):
+    """ Prueba que usage solo se incluye cuando se pide """
+
+    Tag.objects.create(user=self.user, name="Breakfast")
+
+    res = self.client.get(TAG_URL)
+
+    self.assertNotIn("usage", res.data["results"][0])
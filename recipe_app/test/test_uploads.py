@@ -0,0 +1,175 @@
+import io
+import os
+import struct
+import tracemalloc
+import zlib
+
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.urls import reverse
+from django.test import TestCase, override_settings
+
+from rest_framework import status
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from app_core.models import Recipe
+from recipe_app.views import RecipeViewSet
+
+from PIL import Image
+
+
+def image_upload_url(recipe_id):
+  """ Url de retorno para imagen subida """
+  return reverse("recipe_app:recipe-upload-image", args=[recipe_id])
+
+
+def png_chunk(kind, data):
+  return (
+    struct.pack(">I", len(data)) + kind + data
+    + struct.pack(">I", zlib.crc32(kind + data) & 0xffffffff)
+  )
+
+
+def fake_png(width, height, padding=0):
+  """ PNG con cabecera valida de ``width`` x ``height`` y datos de relleno
+
+  Solo la cabecera es real: basta para probar que se rechaza sin decodificar.
+  """
+
+  header = b"\x89PNG\r\n\x1a\n" + png_chunk(
+    b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)
+  )
+  return header + png_chunk(b"IDAT", b"\x00" * padding)
+
+
+def noise_png(size):
+  """ PNG real de ruido aleatorio: casi no se comprime """
+
+  image = Image.frombytes("RGB", size, os.urandom(size[0] * size[1] * 3))
+  buffer = io.BytesIO()
+  image.save(buffer, format="PNG", compress_level=1)
+  return buffer.getvalue()
+
+
+@override_settings(RECIPE_IMAGE_WORKERS=0)
+class StreamingUploadTests(TestCase):
+  """ Probar limites de memoria y rechazo temprano en subidas de imagenes """
+
+  def setUp(self):
+    self.factory = APIRequestFactory()
+    self.view = RecipeViewSet.as_view({"post": "upload_image"})
+    self.user = get_user_model().objects.create_user("user", "testpass")
+    self.recipe = Recipe.objects.create(
+      user=self.user,
+      title="Sample recipe",
+      time_minutes=10,
+      price=5.00
+    )
+
+  def tearDown(self):
+    self.recipe.refresh_from_db()
+    if self.recipe.image:
+      self.recipe.image.delete()
+
+  def upload(self, content, name="image.png", recipe=None):
+    """ Subir ``content`` y retornar la respuesta y el pico de memoria """
+
+    recipe = recipe or self.recipe
+    # El cuerpo se construye antes de medir: solo cuenta su procesado
+    request = self.factory.post(
+      image_upload_url(recipe.id),
+      {"image": SimpleUploadedFile(name, content)},
+      format="multipart"
+    )
+    force_authenticate(request, user=self.user)
+
+    tracemalloc.start()
+    try:
+      res = self.view(request, pk=recipe.id)
+      _, peak = tracemalloc.get_traced_memory()
+    finally:
+      tracemalloc.stop()
+      # Como al terminar una peticion real: cerrar los archivos temporales
+      request.close()
+
+    return res, peak
+
+  def test_large_image_streams_with_bounded_memory(self):
+    """ Prueba que una imagen grande se guarda sin cargarla en memoria """
+
+    content = noise_png((1600, 1600))
+
+    res, peak = self.upload(content)
+
+    self.assertEqual(res.status_code, status.HTTP_200_OK)
+    self.recipe.refresh_from_db()
+    self.assertEqual(self.recipe.image_bytes, len(content))
+    self.assertLess(peak, len(content) // 4)
+
+  def test_decompression_bomb_rejected_from_header(self):
+    """ Prueba que unas dimensiones enormes se rechazan sin decodificar """
+
+    content = fake_png(50000, 50000, padding=8 * 1024 * 1024)
+
+    res, peak = self.upload(content)
+
+    self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+    self.assertIn("dimensions", res.data["image"][0])
+    self.assertLess(peak, len(content) // 4)
+
+  @override_settings(RECIPE_IMAGE_MAX_BYTES=1024 * 1024)
+  def test_oversize_upload_rejected_while_streaming(self):
+    """ Prueba que un archivo demasiado grande se corta al llegar al limite """
+
+    content = fake_png(100, 100, padding=8 * 1024 * 1024)
+
+    res, peak = self.upload(content)
+
+    self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+    self.assertIn("size", res.data["image"][0])
+    self.assertLess(peak, len(content) // 4)
+
+  def test_unsupported_format_rejected(self):
+    """ Prueba que un formato no permitido se rechaza por la cabecera """
+
+    buffer = io.BytesIO()
+    Image.new("RGB", (10, 10)).save(buffer, format="BMP")
+
+    res, _ = self.upload(buffer.getvalue(), name="image.bmp")
+
+    self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+    self.assertIn("format", res.data["image"][0])
+
+  def test_quota_exceeded(self):
+    """ Prueba que se respeta la cuota de bytes por usuario """
+
+    content = noise_png((100, 100))
+    Recipe.objects.create(
+      user=self.user,
+      title="Other",
+      time_minutes=5,
+      price=1,
+      image_bytes=1000
+    )
+
+    with override_settings(RECIPE_IMAGE_QUOTA_BYTES=1000 + len(content) - 1):
+      res, _ = self.upload(content)
+
+    self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+    self.recipe.refresh_from_db()
+    self.assertFalse(self.recipe.image)
+
+  def test_replacing_image_does_not_count_against_quota(self):
+    """ Prueba que la imagen reemplazada no cuenta para la cuota """
+
+    content = noise_png((100, 100))
+
+    with override_settings(RECIPE_IMAGE_QUOTA_BYTES=len(content)):
+      first, _ = self.upload(content)
+      self.recipe.refresh_from_db()
+      old_image = self.recipe.image
+      second, _ = self.upload(content)
+
+    old_image.delete(save=False)
+    self.assertEqual(first.status_code, status.HTTP_200_OK)
+    self.assertEqual(second.status_code, status.HTTP_200_OK)
@@ -0,0 +1,85 @@
+from django.conf import settings
+from django.core.files.uploadhandler import SkipFile, TemporaryFileUploadHandler
+
+from PIL import Image, ImageFile
+
+from app_core.validators import image_header_error
+
+
+class RecipeImageUploadHandler(TemporaryFileUploadHandler):
+  """ Recibir imagenes a un archivo temporal con limites de memoria
+
+  Escribe cada bloque al disco, asi que la memoria no crece con el tamaño
+  del archivo. Mientras llega la cabecera la pasa a un ``ImageFile.Parser``
+  de Pillow, que identifica formato y dimensiones sin decodificar pixeles:
+  formatos no permitidos, dimensiones excesivas (bombas de descompresion) o
+  archivos que superan ``max_bytes`` se descartan sin terminar de leerlos.
+  Los motivos quedan en ``errors`` por nombre de campo.
+  """
+
+  chunk_size = 64 * 1024
+  header_limit = 256 * 1024
+
+  def __init__(self, request=None, max_bytes=None):
+    super().__init__(request)
+    if max_bytes is None:
+      max_bytes = getattr(settings, "RECIPE_IMAGE_MAX_BYTES", 15 * 1024 * 1024)
+    self.max_bytes = max_bytes
+    self.errors = {}
+
+  def new_file(self, *args, **kwargs):
+    super().new_file(*args, **kwargs)
+    self.parser = ImageFile.Parser()
+    self.header_checked = False
+
+  def receive_data_chunk(self, raw_data, start):
+    if start + len(raw_data) > self.max_bytes:
+      self.reject(f"Image exceeds the allowed size of {self.max_bytes} bytes.")
+
+    if not self.header_checked:
+      self.check_header(raw_data, start)
+
+    super().receive_data_chunk(raw_data, start)
+
+  def file_complete(self, file_size):
+    if not self.header_checked:
+      # Aqui SkipFile no se captura: descartar y no devolver archivo
+      self.discard("Upload a valid image.")
+      return None
+
+    return super().file_complete(file_size)
+
+  def check_header(self, raw_data, start):
+    try:
+      self.parser.feed(raw_data)
+    except Image.DecompressionBombError:
+      self.reject("Image dimensions exceed the allowed limits.")
+    except (OSError, SyntaxError, ValueError):
+      self.reject("Upload a valid image.")
+
+    image = self.parser.image
+    if image is None:
+      if start + len(raw_data) >= self.header_limit:
+        self.reject("Upload a valid image.")
+      return
+
+    error = image_header_error(image.format, image.size)
+    if error:
+      self.reject(error)
+
+    # No seguir alimentando el parser: decodificaria los pixeles
+    self.header_checked = True
+    self.parser = None
+
+  def discard(self, message):
+    """ Borrar el archivo temporal en curso y registrar el motivo """
+
+    self.errors[self.field_name] = [message]
+    self.parser = None
+    self.upload_interrupted()
+
+  def reject(self, message):
+    """ Descartar el archivo y saltar el resto de su contenido """
+
+    self.discard(message)
+    raise SkipFile()
@@ -1,42 +1,89 @@
 from rest_framework import viewsets, mixins, status
-from rest_framework.authentication import   TokenAuthentication
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.permissions import IsAdminUser, IsAuthenticated
+from rest_framework.views import APIView
 
 from rest_framework.decorators import action
 from rest_framework.response import Response
 
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Prefetch
+from django.http import StreamingHttpResponse
+
+from app_core.async_views import (
+  AsyncListModelMixin, AsyncRetrieveModelMixin, AsyncViewMixin
+)
+from app_core.authentication import CachedTokenAuthentication
 from app_core.models import Tag, Ingredient, Recipe
-from recipe_app import serializers
+from app_core.throttling import RecipeThrottle
+from recipe_app import (
+  bulk, export, filters, images, imports, media, search, serializers
+)
+from recipe_app.cache import CachedResponseMixin, get_stats
+from recipe_app.conditional import ConditionalGetMixin
+from recipe_app.pagination import RecipeAppPagination
+from recipe_app.uploads import RecipeImageUploadHandler
 
 
 
 # Create your views here.
 
-class BaseRecipeAttrViewSet(viewsets.GenericViewSet, mixins.ListModelMixin, mixins.CreateModelMixin):
+RECIPE_LIST_FIELDS = ("id", "title", "time_minutes", "price", "link")
+RECIPE_DETAIL_FIELDS = RECIPE_LIST_FIELDS + ("image_renditions", )
+
+class BaseRecipeAttrViewSet(AsyncViewMixin, CachedResponseMixin, ConditionalGetMixin, AsyncListModelMixin, viewsets.GenericViewSet, mixins.ListModelMixin, mixins.CreateModelMixin):
   """ ViewSet Base """
 
-  authentication_classes = (TokenAuthentication, )
+  authentication_classes = (CachedTokenAuthentication, )
   permission_classes = (IsAuthenticated, )
+  throttle_classes = (RecipeThrottle, )
+  pagination_class = RecipeAppPagination
+  keyset_ordering = ("-name", "id")
+  cached_actions = ("list", )
+  conditional_actions = ("list", )
+  async_actions = ("list", )
+
+  def get_conditional_queryset(self):
+    """ Objetos del usuario filtrados, sin anotaciones """
+
+    queryset = self.queryset.filter(user=self.request.user)
+
+    if filters.parse_flag(self.request.query_params, "assigned_only"):
+      queryset = filters.filter_assigned(queryset, self.recipe_relation)
+
+    return queryset
 
   def get_queryset(self):
     """ Retornar objetos para el usuario autenticado """
-    assigned_only = bool(
-      int(self.request.query_params.get("assigned_only", 0))
-    )
-    queryset = self.queryset
 
-    if assigned_only:
-      queryset = queryset.filter(recipe__isnull= False)
+    queryset = self.get_conditional_queryset()
+
+    if filters.parse_flag(self.request.query_params, "with_usage"):
+      queryset = filters.annotate_usage(queryset, self.recipe_relation)
+
+    return queryset.order_by(*self.keyset_ordering)
 
-    return queryset.filter(
-      user=self.request.user
-    ).order_by("-name").distinct()
+  def create(self, request, *args, **kwargs):
+    """ Crear, o retornar el existente con el mismo nombre (200 en vez de 201) """
 
+    serializer = self.get_serializer(data=request.data)
+    serializer.is_valid(raise_exception=True)
+    created = self.perform_create(serializer)
+
+    if not created:
+      return Response(serializer.data, status=status.HTTP_200_OK)
+
+    headers = self.get_success_headers(serializer.data)
+    return Response(serializer.data, status=status.HTTP_201_CREATED, headers=headers)
 
   def perform_create(self, serializer):
-    """ Crear nuevo tag """
+    """ Upsert por nombre del usuario; retorna si el objeto es nuevo """
 
-    serializer.save(user=self.request.user)
+    serializer.instance, created = self.queryset.model.objects.upsert(
+      self.request.user,
+      serializer.validated_data["name"]
+    )
+    return created
 
 
 class TagViewSet(BaseRecipeAttrViewSet):
@@ -45,6 +92,7 @@ class TagViewSet(BaseRecipeAttrViewSet):
  
   queryset = Tag.objects.all()
   serializer_class = serializers.TagSerializer
+  recipe_relation = "tags"
 
 
 class IngredientViewSet(BaseRecipeAttrViewSet):
@@ -52,30 +100,43 @@ class IngredientViewSet(BaseRecipeAttrViewSet):
 
   queryset = Ingredient.objects.all()
   serializer_class = serializers.IngredientSerializer
+  recipe_relation = "ingredients"
 
 
-class RecipeViewSet(viewsets.ModelViewSet):
+class RecipeViewSet(AsyncViewMixin, CachedResponseMixin, ConditionalGetMixin, AsyncListModelMixin, AsyncRetrieveModelMixin, viewsets.ModelViewSet):
   """ Manejar las recetas en la base de datos """
 
   serializer_class = serializers.RecipeSerializer
   queryset = Recipe.objects.all()
-  authentication_classes = (TokenAuthentication, )
+  authentication_classes = (CachedTokenAuthentication, )
   permission_classes = (IsAuthenticated, )
-
-  def get_queryset(self):
-    """ Retornar objetos para el usuario autenticado """
-    
-    return self.queryset.filter(user=self.request.user)
+  throttle_classes = (RecipeThrottle, )
+  pagination_class = RecipeAppPagination
+  keyset_ordering = ("id", )
+  cached_actions = ("list", "retrieve")
+  conditional_actions = ("list", "retrieve")
+  async_actions = ("list", "retrieve")
 
   def get_serializer_class(self):
     """ Retorna clases de serializador apropiado """
 
-    if self.action == "retrieve":
-      return serializers.RecipeDetailSerializer
+    if self.action in ("list", "export"):
+      return serializers.RecipeRowSerializer
+
+    elif self.action == "retrieve":
+      return serializers.RecipeDetailRowSerializer
 
     elif self.action == "upload_image":
       return serializers.RecipeImageSerializer
-      
+
+    elif self.action == "import_recipes":
+      return serializers.RecipeImportSerializer
+
+    elif self.action == "bulk":
+      if self.request.method == "DELETE":
+        return serializers.RecipeBulkDeleteSerializer
+      return serializers.RecipeBulkSerializer
+
     return self.serializer_class
 
   def perform_create(self, serializer):
@@ -88,7 +149,22 @@ class RecipeViewSet(viewsets.ModelViewSet):
     """ Subir imagen a receta """
 
     recipe = self.get_object()
-    serializer = self.get_serializer(recipe, data=request.data)
+
+    # Antes de leer request.data: el cuerpo se procesa con este handler
+    handler = RecipeImageUploadHandler(
+      request,
+      max_bytes=min(
+        getattr(settings, "RECIPE_IMAGE_MAX_BYTES", 15 * 1024 * 1024),
+        images.remaining_quota(request.user, exclude=recipe)
+      )
+    )
+    request.upload_handlers = [handler]
+    data = request.data
+
+    if handler.errors:
+      return Response(handler.errors, status=status.HTTP_400_BAD_REQUEST)
+
+    serializer = self.get_serializer(recipe, data=data)
 
     if serializer.is_valid():
       serializer.save()
@@ -97,24 +173,203 @@ class RecipeViewSet(viewsets.ModelViewSet):
     return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
-  def _params_to_ints(self, qs):
-    """ Convertir lista string IDs a lista de integers """
+  @action(methods=["POST", "PATCH", "DELETE"], detail=False, url_path="bulk")
+  def bulk(self, request):
+    """ Crear, actualizar o borrar recetas en bloque """
+
+    if request.method == "DELETE":
+      return self._bulk_delete(request)
+
+    instance = None
+    if request.method == "PATCH":
+      instance = Recipe.objects.filter(user=request.user)
+
+    serializer = self.get_serializer(
+      instance,
+      data=request.data,
+      many=True,
+      partial=instance is not None
+    )
+    serializer.is_valid(raise_exception=True)
+    recipes = serializer.save()
+
+    queryset = Recipe.objects.filter(
+      id__in=[recipe.id for recipe in recipes]
+    ).only(*RECIPE_LIST_FIELDS).prefetch_related(
+      *self._relation_prefetches("id")
+    ).order_by("id")
+    data = serializers.RecipeSerializer(queryset, many=True).data
+
+    if instance is None:
+      return Response(data, status=status.HTTP_201_CREATED)
+    return Response(data, status=status.HTTP_200_OK)
+
+  @action(methods=["GET"], detail=False, url_path="export")
+  def export(self, request):
+    """ Exportar todas las recetas filtradas como NDJSON o CSV en streaming """
+
+    name = export.get_format(request.query_params)
+    content_type, filename = export.FORMATS[name]
+    fields, _ = self.get_serializer_class().get_selection(request)
+
+    response = StreamingHttpResponse(
+      export.stream(
+        name,
+        self.get_queryset(),
+        fields,
+        self.get_serializer_context()
+      ),
+      content_type=content_type
+    )
+    response["Content-Disposition"] = f'attachment; filename="{filename}"'
+    return response
+
+  @action(methods=["POST"], detail=False, url_path="import", url_name="import")
+  def import_recipes(self, request):
+    """ Importar recetas de un archivo NDJSON o CSV con progreso en streaming
+
+    Tags e ingredientes vienen por nombre y se crean si no existen. Cada
+    bloque se guarda en su propia transaccion y responde una linea NDJSON con
+    los totales y los errores por linea; las filas invalidas se saltan.
+    """
+
+    upload = request.FILES.get("file")
+    if upload is None:
+      return Response(
+        {"file": ["No file was submitted."]},
+        status=status.HTTP_400_BAD_REQUEST
+      )
+
+    rows = imports.read_items(
+      upload,
+      imports.get_format(request.query_params, upload)
+    )
+    return StreamingHttpResponse(
+      export.ndjson(
+        imports.run(request.user, rows, self.get_serializer_context())
+      ),
+      content_type="application/x-ndjson"
+    )
+
+  def _bulk_delete(self, request):
+    """ Borrar en bloque; si falta algun ID no se borra nada """
 
-    return [int(str_id) for str_id in qs.split(",")]
+    serializer = self.get_serializer(data=request.data)
+    serializer.is_valid(raise_exception=True)
+    ids = set(serializer.validated_data["ids"])
+
+    found = set(
+      Recipe.objects.filter(user=request.user, id__in=ids).values_list(
+        "id",
+        flat=True
+      )
+    )
+    missing = sorted(ids - found)
+    if missing:
+      return Response(
+        {"ids": [f'Invalid pk "{pk}" - object does not exist.' for pk in missing]},
+        status=status.HTTP_400_BAD_REQUEST
+      )
+
+    with transaction.atomic():
+      bulk.delete_recipes(request.user, list(found))
+
+    return Response(status=status.HTTP_204_NO_CONTENT)
 
   def get_queryset(self):
     """ Obtener recetas para el usuario autenticado"""
 
-    tags = self.request.query_params.get("tags")
-    ingredients = self.request.query_params.get("ingredients")
-    queryset = self.queryset
-
-    if tags:
-      tag_ids = self._params_to_ints(tags)
-      queryset = queryset.filter(tags__id__in=tag_ids)
-  
-    if ingredients:
-      ingredient_ids = self._params_to_ints(ingredients)
-      queryset = queryset.filter(ingredients__id__in=ingredient_ids)
-  
-    return queryset.filter(user=self.request.user)
\ No newline at end of file
+    queryset = filters.filter_recipes(self.queryset, self.request.query_params)
+    queryset = queryset.filter(user=self.request.user)
+
+    query = self.get_search_query()
+    if query is not None:
+      queryset = search.search_recipes(queryset, query)
+
+    return self._shape_queryset(queryset)
+
+  def get_search_query(self):
+    """ Texto de ``search`` en el listado, o None """
+
+    if self.action != "list":
+      return None
+
+    return self.request.query_params.get("search") or None
+
+  def get_keyset_ordering(self):
+    """ Orden de ``ordering`` (o por id); la busqueda pagina por offset """
+
+    if self.get_search_query() is not None:
+      return None
+
+    return filters.get_ordering(self.request.query_params) or self.keyset_ordering
+
+  def _shape_queryset(self, queryset):
+    """ Leer solo las columnas pedidas, como filas ``values()``
+
+    Los serializadores de lectura arman la respuesta desde las filas y leen
+    tags e ingredientes por su cuenta, asi que no hay prefetch.
+    """
+
+    if self.action == "list":
+      ordering = (
+        self.get_keyset_ordering()
+        or filters.get_ordering(self.request.query_params)
+        or search.RANK_ORDERING
+      )
+      columns = self._selected_columns(RECIPE_LIST_FIELDS, ordering)
+      return queryset.values(*columns).order_by(*ordering)
+
+    if self.action == "retrieve":
+      return queryset.values(*self._selected_columns(RECIPE_DETAIL_FIELDS))
+
+    if self.action == "export":
+      columns = self._selected_columns(RECIPE_LIST_FIELDS)
+      return queryset.values(*columns).order_by("id")
+
+    return queryset
+
+  def _selected_columns(self, available, ordering=()):
+    """ Columnas de ``available`` pedidas en ``fields`` mas las del orden
+
+    ``id`` siempre se lee y la paginacion keyset lee las columnas del orden
+    para armar el cursor.
+    """
+
+    selected, _ = self.get_serializer_class().get_selection(self.request)
+    names = {term.lstrip("-") for term in ordering} - {"search_rank"}
+    return [
+      name for name in available if name in selected or name in names
+    ]
+
+  def _relation_prefetches(self, *fields):
+    """ Prefetch de tags e ingredientes con solo las columnas necesarias """
+
+    return (
+      Prefetch("tags", queryset=Tag.objects.only(*fields).order_by("id")),
+      Prefetch(
+        "ingredients",
+        queryset=Ingredient.objects.only(*fields).order_by("id")
+      ),
+    )
+
+
+class CacheStatsView(APIView):
+  """ Contadores de aciertos y fallos del cache de respuestas """
+
+  authentication_classes = (CachedTokenAuthentication, )
+  permission_classes = (IsAdminUser, )
+
+  def get(self, request):
+    return Response(get_stats())
+
+
+class RecipeMediaView(APIView):
+  """ Servir imagenes de recetas solo a su propietario """
+
+  authentication_classes = (CachedTokenAuthentication, )
+  permission_classes = (IsAuthenticated, )
+
+  def get(self, request, name):
+    media.owned_recipe(request.user, name)
+    return media.serve(request, name)
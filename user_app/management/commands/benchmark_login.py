@@ -0,0 +1,97 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import get_hasher
+from django.core.management.base import BaseCommand
+from django.test.utils import override_settings
+
+from rest_framework.test import APIRequestFactory
+
+from recipe_app.management.commands._benchmark import run_rolled_back, timed
+from user_app.views import CreateTokenView
+
+
+PASSWORD = "benchmark-password"
+
+
+class Command(BaseCommand):
+  """ Medir logins por segundo con cada hasher disponible """
+
+  help = "Benchmark token login throughput per password hasher."
+
+  def add_arguments(self, parser):
+    parser.add_argument("--logins", type=int, default=20)
+    parser.add_argument("--threads", type=int, default=4)
+    parser.add_argument(
+      "--hashers",
+      nargs="+",
+      default=["pbkdf2", "argon2", "bcrypt", "scrypt"]
+    )
+
+  def handle(self, *args, **options):
+    self.stdout.write(
+      f"{'hasher':<10}{'login ms':>10}{'logins/s':>10}"
+      f"{'verify/s x' + str(options['threads']):>14}"
+    )
+    for name in options["hashers"]:
+      hashers = self._hashers(settings.PASSWORD_HASHERS, name)
+      with override_settings(PASSWORD_HASHERS=hashers):
+        if not self._available():
+          self.stdout.write(f"{name:<10}{'not installed':>34}")
+          continue
+        run_rolled_back(lambda: self._run(name, options))
+
+  def _hashers(self, configured, name):
+    """ PASSWORD_HASHERS con el hasher ``name`` primero """
+
+    paths = {
+      "pbkdf2": "app_core.hashers.PBKDF2PasswordHasher",
+      "argon2": "django.contrib.auth.hashers.Argon2PasswordHasher",
+      "bcrypt": "django.contrib.auth.hashers.BCryptSHA256PasswordHasher",
+      "scrypt": "django.contrib.auth.hashers.ScryptPasswordHasher",
+    }
+    return [paths[name]] + [path for path in configured if path != paths[name]]
+
+  def _available(self):
+    # Igual que el check app_core.E001: falla si falta la libreria
+    try:
+      get_hasher().encode(PASSWORD, get_hasher().salt())
+    except ValueError:
+      return False
+    return True
+
+  def _run(self, name, options):
+    user = get_user_model().objects.create_user(
+      f"benchmark-{time.time_ns()}@example.com",
+      PASSWORD
+    )
+    # Sin throttles: las repeticiones superan el limite de login por email
+    view = CreateTokenView.as_view(throttle_classes=())
+    factory = APIRequestFactory()
+    payload = {"email": user.email, "password": PASSWORD}
+
+    # La vista sin middleware: el tiempo es el del serializador y el hasher
+    elapsed, res = timed(
+      lambda: view(factory.post("/", payload, format="json")),
+      options["logins"]
+    )
+    if res.status_code != 200:
+      self.stderr.write(f"{name}: login failed ({res.status_code})")
+      return
+
+    # Solo el hash en varios hilos: muestra si el hasher suelta el GIL
+    hasher = get_hasher()
+    encoded = user.password
+    with ThreadPoolExecutor(options["threads"]) as pool:
+      start = time.perf_counter()
+      list(pool.map(
+        lambda _: hasher.verify(PASSWORD, encoded),
+        range(options["logins"])
+      ))
+      parallel = options["logins"] / (time.perf_counter() - start)
+
+    self.stdout.write(
+      f"{name:<10}{elapsed:>10.1f}{1000 / elapsed:>10.1f}{parallel:>14.1f}"
+    )
@@ -0,0 +1,81 @@
+import asyncio
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import identify_hasher
+from django.test import AsyncClient, TestCase, override_settings
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from app_core.hashers import PBKDF2PasswordHasher
+
+
+TOKEN_URL = reverse("user_app:token")
+PAYLOAD = {"email": "test@gmail.com", "password": "testpass0000"}
+
+
+@override_settings(PASSWORD_PBKDF2_ITERATIONS=1000)
+class PasswordHashingTests(TestCase):
+  """ Probar el hasher configurable y la actualizacion de claves al login """
+
+  def setUp(self):
+    self.client = APIClient()
+
+  def _login(self):
+    res = self.client.post(TOKEN_URL, PAYLOAD)
+    self.assertEqual(res.status_code, status.HTTP_200_OK)
+    return get_user_model().objects.get(email=PAYLOAD["email"])
+
+  def test_rehash_other_algorithm_on_login(self):
+    """ Prueba que una clave de otro algoritmo se guarda con el preferido """
+
+    with override_settings(PASSWORD_HASHERS=[
+      "django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher",
+    ]):
+      user = get_user_model().objects.create_user(**PAYLOAD)
+    self.assertTrue(user.password.startswith("pbkdf2_sha1$"))
+
+    user = self._login()
+
+    self.assertEqual(identify_hasher(user.password).algorithm, "pbkdf2_sha256")
+    self.assertTrue(user.check_password(PAYLOAD["password"]))
+
+  def test_rehash_iterations_on_login(self):
+    """ Prueba que cambiar las iteraciones actualiza la clave al login """
+
+    get_user_model().objects.create_user(**PAYLOAD)
+
+    with override_settings(PASSWORD_PBKDF2_ITERATIONS=2000):
+      user = self._login()
+
+    self.assertEqual(user.password.split("$")[1], "2000")
+
+  async def test_hashing_off_event_loop_under_asgi(self):
+    """ Prueba que bajo ASGI la clave se verifica fuera del event loop """
+
+    await get_user_model().objects.acreate(
+      email=PAYLOAD["email"],
+      password=PBKDF2PasswordHasher().encode(PAYLOAD["password"], "salt")
+    )
+    on_loop = []
+    verify = PBKDF2PasswordHasher.verify
+
+    def record(hasher, password, encoded):
+      try:
+        asyncio.get_running_loop()
+        on_loop.append(True)
+      except RuntimeError:
+        on_loop.append(False)
+      return verify(hasher, password, encoded)
+
+    with mock.patch.object(PBKDF2PasswordHasher, "verify", record):
+      res = await AsyncClient().post(
+        TOKEN_URL,
+        PAYLOAD,
+        content_type="application/json"
+      )
+
+    self.assertEqual(res.status_code, status.HTTP_200_OK)
+    self.assertEqual(on_loop, [False])
@@ -0,0 +1,82 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from app_core.tests.test_throttling import throttle_rates
+from app_core.throttling import get_throttle_cache
+
+
+TOKEN_URL = reverse("user_app:token")
+CREATE_USER_URL = reverse("user_app:create")
+
+
+class LoginThrottleTests(TestCase):
+  """ Probar los throttles por IP y por email del login """
+
+  def setUp(self):
+    get_throttle_cache().clear()
+    self.client = APIClient()
+    get_user_model().objects.create_user("test@gmail.com", "testpass0000")
+
+  def _login(self, email="test@gmail.com", password="wrong", ip="10.0.0.1"):
+    return self.client.post(
+      TOKEN_URL,
+      {"email": email, "password": password},
+      REMOTE_ADDR=ip
+    )
+
+  @throttle_rates(login_ip="3/min")
+  def test_ip_throttle_rejects_before_authenticate(self):
+    """ Prueba que pasado el limite por IP no se llama a authenticate() """
+
+    for i in range(3):
+      self._login(email=f"user{i}@gmail.com")
+
+    with mock.patch("user_app.serializers.authenticate") as authenticate:
+      res = self._login()
+
+    self.assertEqual(res.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+    self.assertGreater(int(res["Retry-After"]), 0)
+    authenticate.assert_not_called()
+
+  @throttle_rates(login_email="2/min")
+  def test_email_throttle_across_ips(self):
+    """ Prueba que el limite por email aplica desde varias IPs """
+
+    responses = [
+      self._login(email=email, ip=f"10.0.0.{i}")
+      for i, email in enumerate(["test@gmail.com", "TEST@gmail.com ", "test@gmail.com"])
+    ]
+    other = self._login(email="other@gmail.com", ip="10.0.0.9")
+
+    self.assertEqual([res.status_code for res in responses], [
+      status.HTTP_400_BAD_REQUEST,
+      status.HTTP_400_BAD_REQUEST,
+      status.HTTP_429_TOO_MANY_REQUESTS,
+    ])
+    self.assertIn("Retry-After", responses[-1])
+    self.assertEqual(other.status_code, status.HTTP_400_BAD_REQUEST)
+
+  @throttle_rates(user_create="1/hour")
+  def test_user_create_throttle(self):
+    """ Prueba el limite de registros por IP """
+
+    first = self.client.post(CREATE_USER_URL, {
+      "email": "new@gmail.com",
+      "password": "testpass0000",
+      "name": "test user",
+    })
+    second = self.client.post(CREATE_USER_URL, {
+      "email": "new2@gmail.com",
+      "password": "testpass0000",
+      "name": "test user",
+    })
+
+    self.assertEqual(first.status_code, status.HTTP_201_CREATED)
+    self.assertEqual(second.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+    self.assertFalse(get_user_model().objects.filter(email="new2@gmail.com").exists())
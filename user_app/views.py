@@ -1,13 +1,21 @@
 from user_app.serializers import UserSerializer, AuthTokenSerializer
-from rest_framework import generics, permissions, authentication
+from rest_framework import generics, permissions
 from rest_framework.authtoken.views import ObtainAuthToken
+from rest_framework.response import Response
 from rest_framework.settings import api_settings
 
+from app_core.async_views import AsyncViewMixin
+from app_core.authentication import CachedTokenAuthentication
+from app_core.throttling import (
+  LoginEmailThrottle, LoginIPThrottle, UserCreateThrottle
+)
+
 # Create your views here.
 class CreateUserView(generics.CreateAPIView):
   """ Crea un nuevo usuario en el sistema """
 
   serializer_class = UserSerializer
+  throttle_classes = (UserCreateThrottle,)
 
 
 class CreateTokenView(ObtainAuthToken):
@@ -15,14 +23,22 @@ class CreateTokenView(ObtainAuthToken):
 
   serializer_class = AuthTokenSerializer
   renderer_classes = api_settings.DEFAULT_RENDERER_CLASSES
+  # Antes de validar: un intento limitado no llega al hasher
+  throttle_classes = (LoginIPThrottle, LoginEmailThrottle)
 
-class ManageUserView(generics.RetrieveUpdateAPIView):
+class ManageUserView(AsyncViewMixin, generics.RetrieveUpdateAPIView):
   """ Manejar el usuario autenticado """
 
   serializer_class = UserSerializer
-  authentication_classes = (authentication.TokenAuthentication,)
+  authentication_classes = (CachedTokenAuthentication,)
   permission_classes = (permissions.IsAuthenticated,)
+  async_actions = ("get",)
 
   def get_object(self):
     """ Obtener y retornar el usuario autenticado """
-    return self.request.user
\ No newline at end of file
+    return self.request.user
+
+  async def aget(self, request, *args, **kwargs):
+    """ El usuario ya viene de la autenticacion: sin queries """
+
+    return Response(self.get_serializer(self.get_object()).data)
\ No newline at end of file